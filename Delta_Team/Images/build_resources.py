@@ -0,0 +1,115 @@
+"""
+Compiles the Images directory into a Qt resource bundle.
+
+    python -m Delta_Team.Images.build_resources            # images_rc.py, embedded in the code
+    python -m Delta_Team.Images.build_resources --binary   # images.rcc, memory mapped at runtime
+
+The Python module is what frozen builds (Nuitka onefile) should ship:
+the images become part of the program instead of files unpacked next
+to it. The binary bundle is mapped into memory when registered, which
+suits development on slow disks. Either way get_image() then returns
+":/images/<name>" paths. Files are stored uncompressed, the images are
+already compressed and are then used straight from the mapped data.
+
+Both outputs are generated and ignored by git, rebuild after changing
+an image.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+IMAGES_DIR = Path(__file__).resolve().parent
+MODULE_PATH = IMAGES_DIR / 'images_rc.py'
+BINARY_PATH = IMAGES_DIR / 'images.rcc'
+PREFIX = '/images'
+
+_SKIPPED_SUFFIXES = ('.py', '.pyc', '.qrc', '.rcc', '.tmp')
+
+
+def bundled_files() -> list:
+    """ Returns the names of the images to bundle, sorted. """
+
+    return sorted(
+        entry.name for entry in os.scandir(IMAGES_DIR)
+        if entry.is_file() and not entry.name.endswith(_SKIPPED_SUFFIXES)
+    )
+
+
+def write_qrc(path: Path, names: list):
+    """ Writes a .qrc listing the images under the /images prefix. """
+
+    files = '\n'.join(
+        f'        <file alias="{escape(name)}">{escape(str(IMAGES_DIR / name))}</file>' for name in names
+    )
+
+    path.write_text(f'<RCC>\n    <qresource prefix="{PREFIX}">\n{files}\n    </qresource>\n</RCC>\n',
+                    encoding='utf-8')
+
+
+def find_rcc() -> list:
+    """ Returns the command running Qt's resource compiler. """
+
+    wrapper = shutil.which('pyside6-rcc')
+
+    if wrapper:
+        return [wrapper]
+
+    # The wrapper isn't on PATH in every environment, the binary ships with PySide6
+    import PySide6
+
+    for candidate in ('libexec/rcc', 'Qt/libexec/rcc', 'rcc.exe', 'rcc'):
+        path = Path(PySide6.__file__).parent / candidate
+
+        if path.is_file():
+            return [str(path), '-g', 'python']
+
+    raise FileNotFoundError('Qt resource compiler (pyside6-rcc) not found')
+
+
+def build(binary: bool = False) -> Path:
+    """
+    Compiles the bundle.
+
+    Args:
+        binary (bool): Write images.rcc instead of images_rc.py
+
+    Returns:
+        Path: The written bundle
+    """
+
+    output = BINARY_PATH if binary else MODULE_PATH
+    qrc_path = IMAGES_DIR / 'images.qrc.tmp'
+    temp_path = output.with_name(output.name + '.tmp')
+
+    write_qrc(qrc_path, bundled_files())
+
+    try:
+        command = find_rcc() + ['--no-compress', str(qrc_path), '-o', str(temp_path)]
+
+        if binary:
+            # Plain rcc output, not the generated Python
+            command = [part for part in command if part not in ('-g', 'python')] + ['--binary']
+
+        subprocess.run(command, check=True)
+        os.replace(temp_path, output)
+
+    finally:
+        qrc_path.unlink(missing_ok=True)
+
+    return output
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--binary', action='store_true', help='write images.rcc instead of images_rc.py')
+    arguments = parser.parse_args()
+
+    try:
+        print(f'Wrote {build(arguments.binary)} ({len(bundled_files())} images)')
+    except (OSError, subprocess.CalledProcessError) as error:
+        sys.exit(f'Building the resource bundle failed: {error}')
@@ -1,11 +1,433 @@
+import hashlib
+from collections import OrderedDict
 from pathlib import Path
 
+from PySide6.QtCore import Qt, QDir, QFile, QRect, QRectF, QResource, QSize, QStandardPaths
+from PySide6.QtGui import QColor, QGuiApplication, QIcon, QIconEngine, QImage, QPainter, QPixmap
+
+IMAGES_DIR = Path(__file__).resolve().parent
+RESOURCE_PREFIX = ':/images/'
+
+
+def _register_bundle() -> frozenset:
+    """
+    Registers the compiled resource bundle, if one was built.
+
+    The embedded module (images_rc.py) is preferred, otherwise the
+    binary bundle (images.rcc) is memory mapped. See build_resources.py.
+
+    Returns:
+        frozenset: Names of the bundled images, empty without a bundle
+    """
+
+    try:
+        from Delta_Team.Images import images_rc  # noqa: F401, registers itself on import
+    except ImportError:
+        binary = IMAGES_DIR / 'images.rcc'
+
+        if not binary.is_file() or not QResource.registerResource(str(binary)):
+            return frozenset()
+
+    return frozenset(QDir(RESOURCE_PREFIX).entryList())
+
+
+_bundled = _register_bundle()
+
+
 def get_image(image_name:str):
-    """ Gets the filepath for the given image. """
+    """
+    Gets the path for the given image.
+
+    Images in the resource bundle are served from it as ":/images/<name>",
+    anything else (no bundle in development, new images) from the Images
+    directory.
+    """
 
-    image_dir = Path(__file__).resolve().parent
-    image= image_dir / image_name
+    if image_name in _bundled:
+        return RESOURCE_PREFIX + image_name
+
+    image= IMAGES_DIR / image_name
     image_path = str(image.absolute())
 
     return image_path
 
+
+class PixmapCache:
+    """
+    Bounded, size-aware LRU cache for decoded pixmaps.
+
+    Entries are evicted least recently used first once the total
+    pixel memory of the cached pixmaps exceeds max_bytes.
+
+    Attributes:
+        max_bytes (int): Memory budget for all cached pixmaps
+        bytes (int): Memory currently used by cached pixmaps
+        hits (int): Number of lookups served from the cache
+        misses (int): Number of lookups that had to decode
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes (int): Memory budget for all cached pixmaps
+        """
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """ Returns the cached pixmap for key, or None on a miss. """
+
+        pixmap = self._entries.get(key)
+
+        if pixmap is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+
+        return pixmap
+
+    def put(self, key, pixmap: QPixmap):
+        """ Stores a pixmap and evicts old entries that no longer fit. """
+
+        if key in self._entries:
+            self.bytes -= self._cost(self._entries.pop(key))
+
+        cost = self._cost(pixmap)
+
+        # Never keep a single pixmap that is larger than the whole budget
+        if cost > self.max_bytes:
+            return
+
+        self._entries[key] = pixmap
+        self.bytes += cost
+
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= self._cost(evicted)
+
+    def clear(self):
+        """ Drops every cached pixmap, keeping the counters. """
+
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        """ Returns the hit/miss/bytes counters as a dictionary. """
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'bytes': self.bytes,
+            'entries': len(self._entries),
+        }
+
+    @staticmethod
+    def _cost(pixmap: QPixmap) -> int:
+        """ Estimates the memory used by a pixmap in bytes. """
+
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+# Shared by every window and view in the process
+pixmap_cache = PixmapCache()
+_icon_cache = {}
+
+
+def get_pixmap(image_name: str, size: QSize = None, dpr: float = 1.0) -> QPixmap:
+    """
+    Gets a decoded pixmap for the given image from the shared cache.
+
+    When a size is given the image is scaled once to fit it (keeping
+    the aspect ratio) at the given device pixel ratio, so later calls
+    with the same arguments cost a dictionary lookup.
+
+    Args:
+        image_name (str): File name inside the Images directory
+        size (QSize, optional): Logical size to fit the image into
+        dpr (float): Device pixel ratio of the target screen
+
+    Returns:
+        QPixmap: The pixmap, null if the image could not be loaded
+    """
+
+    key = (image_name, size.width() if size else 0, size.height() if size else 0, dpr)
+
+    pixmap = pixmap_cache.get(key)
+
+    if pixmap is not None:
+        return pixmap
+
+    if size is None:
+        pixmap = QPixmap(get_image(image_name))
+    else:
+        # Scale from the full size pixmap, which may already be cached
+        pixmap = get_pixmap(image_name)
+
+        if not pixmap.isNull():
+            pixmap = pixmap.scaled(
+                size * dpr, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+            )
+            pixmap.setDevicePixelRatio(dpr)
+
+    pixmap_cache.put(key, pixmap)
+
+    return pixmap
+
+
+def get_icon(image_name: str) -> QIcon:
+    """ Gets a shared icon for the given image. """
+
+    icon = _icon_cache.get(image_name)
+
+    if icon is None:
+        icon = QIcon(get_image(image_name))
+        _icon_cache[image_name] = icon
+
+    return icon
+
+
+class SvgIconCache:
+    """
+    Rasterised SVG icons, rendered once per size, device pixel ratio and tint.
+
+    Rendered pixmaps are kept in memory and, when a cache directory is
+    set, written as PNG files named after the SVG's content hash, so
+    later runs load them without parsing any SVG. QtSvg itself is only
+    imported when something actually has to be rendered.
+
+    Tinting replaces the colour of every painted pixel, which suits
+    the single-colour line icons in the Images directory.
+
+    Attributes:
+        cache_dir (Path): Directory of the rendered PNG files, None for memory only
+        pixmaps (PixmapCache): Rendered pixmaps in memory
+        renders (int): Number of SVG renders
+        disk_hits (int): Number of pixmaps loaded from the cache directory
+    """
+
+    def __init__(self, cache_dir=None, max_bytes: int = 8 * 1024 * 1024):
+        """
+        Initialize an empty cache.
+
+        Args:
+            cache_dir (optional): Directory for rendered PNG files, None to keep them in memory only
+            max_bytes (int): Memory budget of the rendered pixmaps
+        """
+
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.pixmaps = PixmapCache(max_bytes)
+        self.renders = 0
+        self.disk_hits = 0
+
+        self._digests = {}
+        self._renderers = {}
+
+    def pixmap(self, source: str, size: QSize, dpr: float = 1.0, tint: str = None) -> QPixmap:
+        """
+        Returns an SVG rendered to fit a size.
+
+        Args:
+            source (str): Path of the SVG, filesystem or ":/" resource
+            size (QSize): Logical size to fit the icon into
+            dpr (float): Device pixel ratio of the target screen
+            tint (str, optional): Colour such as '#ffffff' painted over the icon
+
+        Returns:
+            QPixmap: The rendered icon, null if the SVG could not be read
+        """
+
+        key = (source, size.width(), size.height(), dpr, tint)
+        pixmap = self.pixmaps.get(key)
+
+        if pixmap is not None:
+            return pixmap
+
+        pixel_size = size * dpr
+        disk_path = self._disk_path(source, pixel_size, tint)
+        image = QImage()
+
+        if disk_path is not None and disk_path.exists():
+            image = QImage(str(disk_path))
+            self.disk_hits += not image.isNull()
+
+        if image.isNull():
+            image = self._render(source, pixel_size, tint)
+
+            if not image.isNull() and disk_path is not None:
+                disk_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = disk_path.with_name(disk_path.name + '.tmp')
+
+                if image.save(str(temp_path), 'PNG'):
+                    temp_path.replace(disk_path)
+
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+        self.pixmaps.put(key, pixmap)
+
+        return pixmap
+
+    def _digest(self, source: str) -> str:
+        """ Content hash of an SVG, read once per process. """
+
+        digest = self._digests.get(source)
+
+        if digest is None:
+            file = QFile(source)
+
+            if not file.open(QFile.OpenModeFlag.ReadOnly):
+                return None
+
+            digest = self._digests[source] = hashlib.sha1(file.readAll().data()).hexdigest()[:20]
+            file.close()
+
+        return digest
+
+    def _disk_path(self, source: str, pixel_size: QSize, tint: str):
+        """ Returns the PNG file of a rendering, None without a cache directory. """
+
+        if self.cache_dir is None:
+            return None
+
+        digest = self._digest(source)
+
+        if digest is None:
+            return None
+
+        colour = tint.lstrip('#') if tint else 'none'
+
+        return self.cache_dir / f'{digest}-{pixel_size.width()}x{pixel_size.height()}-{colour}.png'
+
+    def _render(self, source: str, pixel_size: QSize, tint: str) -> QImage:
+        """ Renders an SVG into a transparent image, centred and keeping its aspect ratio. """
+
+        # Only needed on a cache miss, most runs never load QtSvg
+        from PySide6.QtSvg import QSvgRenderer
+
+        renderer = self._renderers.get(source)
+
+        if renderer is None:
+            renderer = self._renderers[source] = QSvgRenderer(source)
+
+        if not renderer.isValid():
+            return QImage()
+
+        self.renders += 1
+
+        image = QImage(pixel_size, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+
+        fitted = renderer.defaultSize().scaled(pixel_size, Qt.AspectRatioMode.KeepAspectRatio)
+        target = QRect(0, 0, fitted.width(), fitted.height())
+        target.moveCenter(image.rect().center())
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        renderer.render(painter, QRectF(target))
+
+        if tint:
+            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
+            painter.fillRect(image.rect(), QColor(tint))
+
+        painter.end()
+
+        return image
+
+
+class SvgIconEngine(QIconEngine):
+    """
+    Icon engine drawing an SVG through the shared SvgIconCache.
+
+    Qt asks the engine for every size and device pixel ratio it needs,
+    each is rendered once. Disabled icons are drawn faded.
+    """
+
+    DISABLED_OPACITY = 0.4
+
+    def __init__(self, source: str, tint: str = None, cache: 'SvgIconCache' = None):
+        super().__init__()
+
+        self.source = source
+        self.tint = tint
+        self.cache = cache or svg_icon_cache
+
+    def scaledPixmap(self, size: QSize, mode, state, scale: float) -> QPixmap:
+        pixmap = self.cache.pixmap(self.source, size, scale, self.tint)
+
+        if mode != QIcon.Mode.Disabled or pixmap.isNull():
+            return pixmap
+
+        faded = QPixmap(pixmap.size())
+        faded.setDevicePixelRatio(pixmap.devicePixelRatio())
+        faded.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(faded)
+        painter.setOpacity(self.DISABLED_OPACITY)
+        painter.drawPixmap(0, 0, pixmap)
+        painter.end()
+
+        return faded
+
+    def pixmap(self, size: QSize, mode, state) -> QPixmap:
+        return self.scaledPixmap(size, mode, state, 1.0)
+
+    def paint(self, painter: QPainter, rect: QRect, mode, state):
+        scale = painter.device().devicePixelRatioF() if painter.device() else 1.0
+        painter.drawPixmap(rect, self.scaledPixmap(rect.size(), mode, state, scale))
+
+    def actualSize(self, size: QSize, mode, state) -> QSize:
+        return size
+
+    def clone(self):
+        return SvgIconEngine(self.source, self.tint, self.cache)
+
+    def key(self) -> str:
+        return 'SvgIconEngine'
+
+
+def _icon_cache_dir() -> Path:
+    """ Directory of the rendered icons, None before the application exists. """
+
+    if QGuiApplication.instance() is None:
+        return None
+
+    cache_root = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+
+    return Path(cache_root) / 'icons'
+
+
+# Shared by every icon of the process, the cache directory is set on first use
+svg_icon_cache = SvgIconCache()
+_svg_icons = {}
+
+
+def get_svg_icon(source: str, tint: str = None) -> QIcon:
+    """
+    Gets a shared icon drawing an SVG through the raster cache.
+
+    Args:
+        source (str): Path of the SVG, as returned by get_image()
+        tint (str, optional): Colour such as '#ffffff' painted over the icon
+
+    Returns:
+        QIcon: Icon rendering each requested size once
+    """
+
+    key = (source, tint)
+    entry = _svg_icons.get(key)
+
+    if entry is None:
+        if svg_icon_cache.cache_dir is None:
+            svg_icon_cache.cache_dir = _icon_cache_dir()
+
+        # The engine is kept referenced, the icon only holds it on the C++ side
+        engine = SvgIconEngine(source, tint)
+        entry = _svg_icons[key] = (QIcon(engine), engine)
+
+    return entry[0]
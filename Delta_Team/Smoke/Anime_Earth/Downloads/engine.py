@@ -0,0 +1,577 @@
+import http.client
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+
+class DownloadError(Exception):
+    """ Raised when a download cannot be completed. """
+
+
+class ConnectionPool:
+    """
+    Pool of keep-alive HTTP connections shared by all downloads.
+
+    Connections are kept per (scheme, host, port) after a request
+    finished cleanly, so consecutive segment requests to the same
+    server skip the TCP (and TLS) handshake.
+
+    Class Attributes:
+        MAX_REDIRECTS (int): Redirects followed by request()
+
+    Attributes:
+        max_idle (int): Idle connections kept per host
+        created (int): Number of connections opened so far
+        reused (int): Number of requests served by a pooled connection
+    """
+
+    MAX_REDIRECTS = 5
+
+    def __init__(self, max_idle: int = 8, timeout: float = 30.0):
+        """
+        Initialize an empty pool.
+
+        Args:
+            max_idle (int): Idle connections kept per host
+            timeout (float): Socket timeout of new connections in seconds
+        """
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.created = 0
+        self.reused = 0
+
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        """ Returns an idle connection to the host, or a new one. """
+
+        key = (scheme, netloc)
+
+        with self._lock:
+            idle = self._idle.get(key)
+
+            if idle:
+                self.reused += 1
+                return idle.pop()
+
+            self.created += 1
+
+        return self.connect(scheme, netloc)
+
+    def connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        """ Opens a new connection outside of the pool. """
+
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def release(self, scheme: str, netloc: str, connection: http.client.HTTPConnection):
+        """ Returns a connection whose last response was fully read. """
+
+        with self._lock:
+            idle = self._idle.setdefault((scheme, netloc), [])
+
+            if len(idle) < self.max_idle:
+                idle.append(connection)
+                return
+
+        connection.close()
+
+    def request(self, url: str, headers: dict = None, method: str = 'GET'):
+        """
+        Sends a request over a pooled connection, following redirects.
+
+        The caller must read the response and hand the connection back
+        with release_response(), or close it.
+
+        Returns:
+            tuple: (response, connection, url parts)
+
+        Raises:
+            DownloadError: On an HTTP error status or too many redirects
+        """
+
+        headers = headers or {}
+
+        for _ in range(self.MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            connection = self.acquire(parts.scheme, parts.netloc)
+            path = parts.path or '/'
+
+            if parts.query:
+                path += '?' + parts.query
+
+            try:
+                connection.request(method, path, headers=headers)
+                response = connection.getresponse()
+            except (OSError, http.client.HTTPException):
+                # A pooled connection may have been closed by the server, retry once fresh
+                connection.close()
+                connection = self.connect(parts.scheme, parts.netloc)
+                connection.request(method, path, headers=headers)
+                response = connection.getresponse()
+
+            if response.status in (301, 302, 303, 307, 308) and response.getheader('Location'):
+                response.read()
+                self.release_response(parts, connection, response)
+                url = urljoin(url, response.getheader('Location'))
+                continue
+
+            if response.status >= 400:
+                response.read()
+                self.release_response(parts, connection, response)
+                raise DownloadError(f'HTTP {response.status} for {url}')
+
+            return response, connection, parts
+
+        raise DownloadError(f'Too many redirects for {url}')
+
+    def release_response(self, parts, connection, response):
+        """ Returns a connection to the pool unless the server closes it. """
+
+        if response.will_close:
+            connection.close()
+        else:
+            self.release(parts.scheme, parts.netloc, connection)
+
+    def fetch(self, url: str, headers: dict = None) -> bytes:
+        """ Returns the whole body of a small resource such as a playlist. """
+
+        response, connection, parts = self.request(url, headers)
+
+        try:
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            raise
+
+        self.release_response(parts, connection, response)
+
+        return body
+
+    def close(self):
+        """ Closes every idle connection. """
+
+        with self._lock:
+            for idle in self._idle.values():
+                for connection in idle:
+                    connection.close()
+
+            self._idle.clear()
+
+
+# Shared between downloads so connections to the same host are reused
+connection_pool = ConnectionPool()
+
+
+def write_all(file, data: bytes):
+    """ Writes all of data to an unbuffered file, whose write() may write only part of it. """
+
+    view = memoryview(data)
+
+    while view:
+        written = file.write(view)
+
+        if not written:
+            raise OSError(f'Could not write to {file.name}')
+
+        view = view[written:]
+
+
+class Segment:
+    """
+    A byte range of a download.
+
+    Attributes:
+        start (int): First byte of the range
+        end (int): Last byte of the range (inclusive)
+        received (int): Bytes of the range already written
+    """
+
+    __slots__ = ('start', 'end', 'received')
+
+    def __init__(self, start: int, end: int, received: int = 0):
+        self.start = start
+        self.end = end
+        self.received = received
+
+    def __repr__(self):
+        return f'Segment({self.start}, {self.end}, received={self.received})'
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start + 1
+
+    @property
+    def done(self) -> bool:
+        return self.received >= self.size
+
+    @property
+    def position(self) -> int:
+        """ Offset of the next byte to fetch. """
+        return self.start + self.received
+
+
+class SegmentedDownload:
+    """
+    Downloads one file as concurrent byte-range segments.
+
+    The file size is probed first. When the server supports ranges the
+    file is preallocated and split into segments fetched over several
+    pooled keep-alive connections, each worker writing its bytes at
+    their final offset, so no reassembly pass is needed. Otherwise the
+    file is streamed over a single connection.
+
+    The download can be paused and resumed; partially received
+    segments continue where they stopped. A streamed download starts
+    over, the server can't send the rest of its body alone. Resuming
+    while a pause is still winding down starts the next run as soon
+    as the current one has stopped.
+
+    Attributes:
+        url (str): Source URL
+        destination (Path): Final file path
+        size (int): Total size in bytes, None until probed
+        segments (list): Segment objects of the download
+        state (str): 'idle', 'running', 'paused', 'finished' or 'failed'
+        error (Exception): Failure reason when state is 'failed'
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    MIN_SEGMENT_SIZE = 1024 * 1024
+
+    def __init__(self, url: str, destination, segment_count: int = 8, connections: int = 4,
+                 pool: ConnectionPool = None, on_progress=None, segments=None, limiter=None, on_finished=None):
+        """
+        Initialize a download.
+
+        Args:
+            url (str): Source URL (http or https)
+            destination: Final file path, data is written to "<name>.part" first
+            segment_count (int): Number of byte ranges to split the file into
+            connections (int): Number of segments fetched concurrently
+            pool (ConnectionPool, optional): Connection pool, defaults to the shared one
+            on_progress (callable, optional): Called from worker threads with each
+                                              received byte count
+            segments (list, optional): Byte-range segments of an interrupted download
+                                       to resume, streams start over without
+            limiter (optional): Bandwidth limiter with a consume(byte_count) method
+            on_finished (callable, optional): Called with the download whenever a run
+                                              ends as finished, paused or failed
+        """
+        self.url = url
+        self.destination = Path(destination)
+        self.part_path = self.destination.with_name(self.destination.name + '.part')
+        self.segment_count = max(1, segment_count)
+        self.connections = max(1, connections)
+        self.pool = pool or connection_pool
+        self.on_progress = on_progress
+        self.limiter = limiter
+        self.on_finished = on_finished
+
+        self.segments = list(segments) if segments else []
+        self.size = self.segments[-1].end + 1 if self.segments else None
+        self.state = 'idle'
+        self.error = None
+
+        self._ranged = bool(segments)
+        self._paused = threading.Event()
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        # Resumed before the paused run stopped
+        self._resume_pending = False
+
+        self._active_time = 0.0
+        self._started_at = None
+
+    @property
+    def received(self) -> int:
+        """ Bytes written so far. """
+        return sum(segment.received for segment in self.segments)
+
+    @property
+    def ranged(self) -> bool:
+        """ Whether the file is fetched as byte ranges, known once probed. """
+        return self._ranged
+
+    def throughput(self) -> float:
+        """ Average bytes per second while running (paused time excluded). """
+
+        active = self._active_time
+
+        if self._started_at is not None:
+            active += time.perf_counter() - self._started_at
+
+        return self.received / active if active > 0 else 0.0
+
+    def start(self):
+        """ Starts (or resumes) the download in background threads. """
+
+        with self._lock:
+            if self.state == 'running':
+                # Still winding down from a pause, _set_state() starts the next run
+                if self._paused.is_set():
+                    self._resume_pending = True
+                return
+
+            if self.state == 'finished':
+                return
+
+            self._begin()
+
+        self._spawn()
+
+    def _begin(self):
+        """ Marks a new run as started, called with the lock held. """
+
+        self.state = 'running'
+        self.error = None
+        self._paused.clear()
+        self._finished.clear()
+        self._started_at = time.perf_counter()
+
+    def _spawn(self):
+        threading.Thread(target=self._run, name=f'download:{self.destination.name}', daemon=True).start()
+
+    def pause(self):
+        """ Stops fetching after the current chunk of every segment. """
+
+        with self._lock:
+            self._resume_pending = False
+            self._paused.set()
+
+    def resume(self):
+        """ Continues a paused download. """
+
+        self.start()
+
+    def wait(self, timeout: float = None) -> bool:
+        """ Blocks until the download finished, failed or paused. """
+
+        return self._finished.wait(timeout)
+
+    def _run(self):
+        """ Runs one transfer and records how it ended, whatever happened. """
+
+        state = 'failed'
+
+        try:
+            state = self._transfer()
+
+        except (OSError, ValueError, http.client.HTTPException, DownloadError) as error:
+            self.error = error
+
+        except Exception as error:
+            # A bug, reported by the thread, the run must still end
+            self.error = error
+            raise
+
+        finally:
+            self._set_state(state)
+
+    def _transfer(self) -> str:
+        """
+        Probes, splits and fetches the download, then finalises it.
+
+        Returns:
+            str: 'finished', or 'paused' if paused before all bytes arrived
+        """
+
+        if not self.segments:
+            self._probe()
+            self._prepare_file()
+
+        elif not self.part_path.exists():
+            # Resuming without the partial file, fetch everything again
+            for segment in self.segments:
+                segment.received = 0
+
+            self._allocate()
+
+        pending = queue.Queue()
+
+        for segment in self.segments:
+            if not segment.done:
+                pending.put(segment)
+
+        errors = []
+        worker_count = self.connections if self._ranged else 1
+        workers = [
+            threading.Thread(target=self._work, args=(pending, errors), daemon=True)
+            for _ in range(min(worker_count, max(1, pending.qsize())))
+        ]
+
+        for worker in workers:
+            worker.start()
+
+        for worker in workers:
+            worker.join()
+
+        if errors:
+            raise errors[0]
+
+        if not all(segment.done for segment in self.segments):
+            if self._paused.is_set():
+                return 'paused'
+
+            raise DownloadError(f'Download of {self.url} stopped before the end')
+
+        os.replace(self.part_path, self.destination)
+
+        return 'finished'
+
+    def _set_state(self, state: str):
+        """
+        Records the final state of a run and wakes up waiters.
+
+        A run paused while a resume was pending starts over at once
+        instead, without waking anybody.
+        """
+
+        with self._lock:
+            if self._started_at is not None:
+                self._active_time += time.perf_counter() - self._started_at
+                self._started_at = None
+
+            restart = state == 'paused' and self._resume_pending
+            self._resume_pending = False
+
+            if restart:
+                self._begin()
+            else:
+                self.state = state
+
+        if restart:
+            self._spawn()
+            return
+
+        self._finished.set()
+
+        if self.on_finished is not None:
+            self.on_finished(self)
+
+    def _probe(self):
+        """ Finds the size of the file and whether ranges are supported. """
+
+        response, connection, parts = self.pool.request(self.url, {'Range': 'bytes=0-0'})
+
+        if response.status == 206:
+            response.read()
+            self.pool.release_response(parts, connection, response)
+        else:
+            # Range ignored, don't pull the whole body just to probe
+            connection.close()
+
+        content_range = response.getheader('Content-Range', '')
+
+        if response.status == 206 and '/' in content_range and not content_range.endswith('/*'):
+            self.size = int(content_range.rsplit('/', 1)[1])
+            self._ranged = True
+        else:
+            length = response.getheader('Content-Length')
+            self.size = int(length) if length and response.status == 200 else None
+            self._ranged = False
+
+    def _allocate(self):
+        """ Creates the part file at its final size. """
+
+        self.destination.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(self.part_path, 'wb') as file:
+            if self.size:
+                file.truncate(self.size)
+
+    def _prepare_file(self):
+        """ Preallocates the part file and splits it into segments. """
+
+        self._allocate()
+
+        if not self._ranged or not self.size:
+            # Unknown size, one open ended segment
+            self.segments = [Segment(0, (self.size or 1 << 62) - 1)]
+            return
+
+        segment_size = max(self.MIN_SEGMENT_SIZE, -(-self.size // self.segment_count))
+
+        self.segments = [
+            Segment(start, min(start + segment_size, self.size) - 1)
+            for start in range(0, self.size, segment_size)
+        ]
+
+    def _work(self, pending: queue.Queue, errors: list):
+        """ Worker loop fetching segments until none is left or paused. """
+
+        # Unbuffered, a counted byte has reached the OS and survives a crash of the app
+        with open(self.part_path, 'r+b', buffering=0) as file:
+            while not self._paused.is_set() and not errors:
+                try:
+                    segment = pending.get_nowait()
+                except queue.Empty:
+                    return
+
+                try:
+                    self._fetch_segment(segment, file)
+                except (OSError, ValueError, http.client.HTTPException, DownloadError) as error:
+                    errors.append(error)
+                    self._paused.set()
+
+    def _fetch_segment(self, segment: Segment, file):
+        """ Fetches the missing part of a segment and writes it in place. """
+
+        if not self._ranged:
+            # The body starts at byte 0 again, so does the file
+            segment.received = 0
+
+        headers = {'Range': f'bytes={segment.position}-{segment.end}'} if self._ranged else {}
+        response, connection, parts = self.pool.request(self.url, headers)
+
+        expected = 206 if self._ranged else 200
+
+        if response.status != expected:
+            connection.close()
+            raise DownloadError(f'Unexpected HTTP status {response.status} for {self.url}')
+
+        file.seek(segment.position)
+
+        try:
+            while not segment.done:
+                if self._paused.is_set():
+                    # Leaving mid-response, the connection can't be reused
+                    connection.close()
+                    return
+
+                chunk = response.read(min(self.CHUNK_SIZE, segment.size - segment.received))
+
+                if not chunk:
+                    break
+
+                write_all(file, chunk)
+                segment.received += len(chunk)
+
+                if self.limiter is not None:
+                    self.limiter.consume(len(chunk))
+
+                if self.on_progress is not None:
+                    self.on_progress(len(chunk))
+
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            raise
+
+        if self.size is None:
+            # Streamed download of unknown size ends with the response
+            segment.end = segment.position - 1
+            self.size = segment.position
+            file.truncate(self.size)
+
+        elif not segment.done:
+            # http.client ends a body cut short without raising, the size tells
+            connection.close()
+            raise DownloadError(f'Connection closed early for {self.url}')
+
+        self.pool.release_response(parts, connection, response)
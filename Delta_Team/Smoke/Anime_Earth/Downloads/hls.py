@@ -0,0 +1,428 @@
+import http.client
+import os
+import re
+import threading
+from typing import NamedTuple
+from urllib.parse import urljoin
+
+from Delta_Team.Smoke.Anime_Earth.Downloads.engine import ConnectionPool, DownloadError, SegmentedDownload
+from Delta_Team.Smoke.Anime_Earth.Downloads.options import QUALITIES
+
+
+class Variant(NamedTuple):
+    """ One rendition listed in a master playlist. """
+
+    bandwidth: int
+    height: int
+    url: str
+
+
+class MediaSegment(NamedTuple):
+    """ One media segment of a media playlist. """
+
+    url: str
+    duration: float
+    byte_range: tuple
+
+
+class MediaPlaylist(NamedTuple):
+    """ Parsed media playlist. """
+
+    segments: list
+    init_url: str
+    init_range: tuple
+    target_duration: float
+
+
+_ATTRIBUTE = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+
+
+def _attributes(text: str) -> dict:
+    """ Parses an attribute list such as 'BANDWIDTH=1280000,RESOLUTION=1280x720'. """
+
+    return {name: value.strip('"') for name, value in _ATTRIBUTE.findall(text)}
+
+
+def _byte_range(text: str, previous_end: int) -> tuple:
+    """ Parses "<length>[@<offset>]" into an inclusive (start, end) range. """
+
+    length, _, offset = text.partition('@')
+    start = int(offset) if offset else previous_end
+
+    return start, start + int(length) - 1
+
+
+def is_master_playlist(text: str) -> bool:
+    """ Whether a playlist lists variants rather than media segments. """
+
+    return '#EXT-X-STREAM-INF' in text
+
+
+def parse_master_playlist(text: str, base_url: str) -> list:
+    """
+    Parse the variants of a master playlist.
+
+    Args:
+        text (str): Playlist content
+        base_url (str): URL of the playlist, relative URIs are resolved against it
+
+    Returns:
+        list: Variant objects in playlist order
+    """
+
+    variants = []
+    pending = None
+
+    for line in text.splitlines():
+        line = line.strip()
+
+        if line.startswith('#EXT-X-STREAM-INF:'):
+            pending = _attributes(line[len('#EXT-X-STREAM-INF:'):])
+
+        elif line and not line.startswith('#') and pending is not None:
+            resolution = pending.get('RESOLUTION', '')
+            height = int(resolution.partition('x')[2]) if 'x' in resolution else 0
+            variants.append(Variant(int(pending.get('BANDWIDTH', 0)), height, urljoin(base_url, line)))
+            pending = None
+
+    return variants
+
+
+def parse_media_playlist(text: str, base_url: str) -> MediaPlaylist:
+    """
+    Parse the segments of a media playlist.
+
+    Plain and byte-range segments are supported, as well as the
+    EXT-X-MAP initialisation section of fragmented MP4 streams.
+
+    Raises:
+        DownloadError: For encrypted or live (not yet ended) playlists
+    """
+
+    segments = []
+    init_url = init_range = None
+    target_duration = 0.0
+    duration = 0.0
+    byte_range = None
+    range_end = 0
+    ended = False
+
+    for line in text.splitlines():
+        line = line.strip()
+
+        if line.startswith('#EXTINF:'):
+            duration = float(line[len('#EXTINF:'):].split(',', 1)[0] or 0)
+
+        elif line.startswith('#EXT-X-BYTERANGE:'):
+            byte_range = _byte_range(line[len('#EXT-X-BYTERANGE:'):], range_end)
+            range_end = byte_range[1] + 1
+
+        elif line.startswith('#EXT-X-TARGETDURATION:'):
+            target_duration = float(line[len('#EXT-X-TARGETDURATION:'):])
+
+        elif line.startswith('#EXT-X-MAP:'):
+            attributes = _attributes(line[len('#EXT-X-MAP:'):])
+            init_url = urljoin(base_url, attributes['URI'])
+
+            if 'BYTERANGE' in attributes:
+                init_range = _byte_range(attributes['BYTERANGE'], 0)
+
+        elif line.startswith('#EXT-X-KEY:'):
+            if _attributes(line[len('#EXT-X-KEY:'):]).get('METHOD', 'NONE') != 'NONE':
+                raise DownloadError('Encrypted HLS streams are not supported')
+
+        elif line.startswith('#EXT-X-ENDLIST'):
+            ended = True
+
+        elif line and not line.startswith('#'):
+            segments.append(MediaSegment(urljoin(base_url, line), duration, byte_range))
+            duration = 0.0
+            byte_range = None
+
+    if not ended:
+        raise DownloadError('Live HLS playlists are not supported')
+
+    return MediaPlaylist(segments, init_url, init_range, target_duration)
+
+
+def pick_variant(variants: list, quality: str) -> Variant:
+    """
+    Choose the variant matching a quality such as '720p'.
+
+    The tallest variant not above the wanted height is taken, or the
+    smallest one if all are taller. Variants without a resolution are
+    ranked by bandwidth and mapped onto the quality list.
+    """
+
+    height = int(quality.rstrip('p')) if quality.rstrip('p').isdigit() else 720
+
+    if all(variant.height for variant in variants):
+        fitting = [variant for variant in variants if variant.height <= height]
+
+        if fitting:
+            return max(fitting, key=lambda variant: (variant.height, variant.bandwidth))
+
+        return min(variants, key=lambda variant: (variant.height, variant.bandwidth))
+
+    ranked = sorted(variants, key=lambda variant: variant.bandwidth, reverse=True)
+    position = QUALITIES.index(quality) if quality in QUALITIES else 1
+
+    return ranked[min(position, len(ranked) - 1)]
+
+
+class HlsDownload(SegmentedDownload):
+    """
+    Downloads an HLS stream into a single file.
+
+    The master playlist is resolved to the variant of the selected
+    quality. Media segments are then fetched by several workers over
+    pooled keep-alive connections, which hides the per-request latency
+    that makes sequential HLS downloads slow. Workers may only run
+    `window` segments ahead of the writer, so at most that many segments
+    are held in memory; the writer appends every segment as soon as all
+    earlier ones are written.
+
+    Starting, pausing, waiting and throughput work as in
+    SegmentedDownload, so the scheduler and the progress hub treat both
+    alike. A resumed download continues after the last written segment.
+
+    Attributes:
+        quality (str): Wanted quality such as '720p'
+        window (int): Media segments allowed in flight ahead of the writer
+        variant (Variant): Chosen variant, None for a plain media playlist
+        playlist (MediaPlaylist): Media playlist once loaded
+        size (int): Estimated total size, exact once finished
+    """
+
+    def __init__(self, url: str, destination, segment_count: int = 8, connections: int = 4,
+                 pool: ConnectionPool = None, on_progress=None, segments=None, limiter=None,
+                 on_finished=None, quality: str = '720p', window: int = None):
+        """
+        Initialize a download.
+
+        Args:
+            url (str): Master or media playlist URL
+            destination: Final file path, data is written to "<name>.part" first
+            segment_count (int): Unused, byte ranges don't apply to HLS
+            connections (int): Number of media segments fetched concurrently
+            pool (ConnectionPool, optional): Connection pool, defaults to the shared one
+            on_progress (callable, optional): Called from worker threads with each
+                                              received byte count
+            segments: Unused, HLS downloads resume by media segment
+            limiter (optional): Bandwidth limiter with a consume(byte_count) method
+            on_finished (callable, optional): Called with the download whenever a run ends
+            quality (str): Wanted quality such as '720p'
+            window (int, optional): Defaults to twice the connections
+        """
+        super().__init__(url, destination, segment_count, connections, pool, on_progress,
+                         limiter=limiter, on_finished=on_finished)
+
+        self.quality = quality
+        self.window = max(self.connections, window or 2 * self.connections)
+
+        self.variant = None
+        self.playlist = None
+
+        self._written_bytes = 0
+        self._next_write = 0
+        self._next_fetch = 0
+        self._completed = {}
+        self._progress = threading.Condition(threading.Lock())
+
+    @property
+    def received(self) -> int:
+        """ Bytes written to the file so far. """
+        return self._written_bytes
+
+    def _transfer(self) -> str:
+        """ Loads the playlists, then fetches and writes the segments. """
+
+        if self.playlist is None:
+            self._load_playlist()
+            self.destination.parent.mkdir(parents=True, exist_ok=True)
+            open(self.part_path, 'wb').close()
+
+        # Resume after the last segment fully written
+        self._next_fetch = self._next_write
+        self._completed.clear()
+
+        with open(self.part_path, 'r+b') as file:
+            file.truncate(self._written_bytes)
+            file.seek(self._written_bytes)
+
+            errors = []
+            workers = [
+                threading.Thread(target=self._work, args=(file, errors), daemon=True)
+                for _ in range(self.connections)
+            ]
+
+            for worker in workers:
+                worker.start()
+
+            for worker in workers:
+                worker.join()
+
+        if errors:
+            raise errors[0]
+
+        if self._next_write < len(self.playlist.segments):
+            if self._paused.is_set():
+                return 'paused'
+
+            raise DownloadError(f'Download of {self.url} stopped before the end')
+
+        os.replace(self.part_path, self.destination)
+        self.size = self._written_bytes
+
+        return 'finished'
+
+    def _load_playlist(self):
+        """ Resolves the master playlist to a variant and loads its media playlist. """
+
+        url = self.url
+        text = self.pool.fetch(url).decode('utf-8', 'replace')
+
+        if is_master_playlist(text):
+            variants = parse_master_playlist(text, url)
+
+            if not variants:
+                raise DownloadError(f'No variants in {url}')
+
+            self.variant = pick_variant(variants, self.quality)
+            url = self.variant.url
+            text = self.pool.fetch(url).decode('utf-8', 'replace')
+
+        playlist = parse_media_playlist(text, url)
+
+        if playlist.init_url is not None:
+            # The fMP4 initialisation section goes first, as segment -1
+            init = MediaSegment(playlist.init_url, 0.0, playlist.init_range)
+            playlist = playlist._replace(segments=[init] + playlist.segments)
+
+        self.playlist = playlist
+
+    def _work(self, file, errors: list):
+        """ Worker loop claiming the next segment inside the window. """
+
+        segments = self.playlist.segments
+
+        while True:
+            with self._progress:
+                while (self._next_fetch >= self._next_write + self.window
+                       and not self._paused.is_set() and not errors):
+                    self._progress.wait()
+
+                if self._paused.is_set() or errors or self._next_fetch >= len(segments):
+                    self._progress.notify_all()
+                    return
+
+                index = self._next_fetch
+                self._next_fetch += 1
+
+            try:
+                data = self._fetch(segments[index])
+            except (OSError, ValueError, http.client.HTTPException, DownloadError) as error:
+                with self._progress:
+                    errors.append(error)
+                    self._paused.set()
+                    self._progress.notify_all()
+                return
+
+            if data is None:
+                # Paused mid-segment, it is fetched again on resume
+                with self._progress:
+                    self._progress.notify_all()
+                return
+
+            with self._progress:
+                self._completed[index] = data
+                self._write_ready(file)
+                self._progress.notify_all()
+
+    def _write_ready(self, file):
+        """ Appends every completed segment that directly follows the written ones. """
+
+        while self._next_write in self._completed:
+            data = self._completed.pop(self._next_write)
+            file.write(data)
+
+            self._written_bytes += len(data)
+            self._next_write += 1
+
+        # Estimate the total from the average segment so far
+        if self._next_write:
+            self.size = max(self._written_bytes,
+                            self._written_bytes * len(self.playlist.segments) // self._next_write)
+
+    def _fetch(self, segment: MediaSegment):
+        """ Fetches one media segment, returning None if paused meanwhile. """
+
+        headers = {}
+
+        if segment.byte_range is not None:
+            headers['Range'] = 'bytes=%d-%d' % segment.byte_range
+
+        response, connection, parts = self.pool.request(segment.url, headers)
+
+        if headers and response.status != 206:
+            # The server ignored the range and sends the whole resource
+            connection.close()
+            raise DownloadError(f'Byte range of {segment.url} not honoured (HTTP {response.status})')
+
+        chunks = []
+
+        try:
+            while True:
+                if self._paused.is_set():
+                    connection.close()
+                    return None
+
+                chunk = response.read(self.CHUNK_SIZE)
+
+                if not chunk:
+                    break
+
+                chunks.append(chunk)
+
+                if self.on_progress is not None:
+                    self.on_progress(len(chunk))
+
+                if self.limiter is not None:
+                    self.limiter.consume(len(chunk))
+
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            raise
+
+        data = b''.join(chunks)
+
+        if headers:
+            expected = segment.byte_range[1] - segment.byte_range[0] + 1
+        else:
+            # A chunked body has no length, it can't end early unnoticed
+            length = response.getheader('Content-Length')
+            expected = int(length) if length else len(data)
+
+        if len(data) != expected:
+            # http.client ends a body cut short without raising
+            connection.close()
+            raise DownloadError(f'{segment.url} came back with {len(data)} of {expected} bytes')
+
+        self.pool.release_response(parts, connection, response)
+
+        return data
+
+
+def create_download(url: str, destination, segment_count: int = 8, connections: int = 4,
+                    quality: str = None, **kwargs):
+    """
+    Creates the right transfer for a URL.
+
+    Playlists (".m3u8") become an HlsDownload for the wanted quality,
+    anything else a SegmentedDownload.
+    """
+
+    if url.partition('?')[0].lower().endswith('.m3u8'):
+        return HlsDownload(url, destination, segment_count, connections, quality=quality or '720p', **kwargs)
+
+    return SegmentedDownload(url, destination, segment_count, connections, **kwargs)
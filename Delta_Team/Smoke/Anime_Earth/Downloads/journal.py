@@ -0,0 +1,381 @@
+import json
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import NamedTuple
+
+from PySide6.QtCore import QCoreApplication, QStandardPaths
+
+from Delta_Team.Smoke.Anime_Earth.Downloads.engine import Segment
+
+
+class ResumeState(NamedTuple):
+    """ An interrupted download recovered from the journal. """
+
+    key: str
+    url: str
+    destination: str
+    series: str
+    segments: list
+    quality: str = None
+    size: int = None
+
+    @property
+    def missing(self) -> int:
+        """ Bytes still to fetch, None when the size is unknown. """
+
+        if not self.segments:
+            return self.size
+
+        return sum(segment.size - segment.received for segment in self.segments)
+
+
+class DownloadJournal:
+    """
+    Append-only journal of download progress, safe against crashes.
+
+    Workers never touch the journal. A flusher thread wakes up every
+    FLUSH_INTERVAL seconds, compares the byte counter of every segment
+    of the tracked downloads with what it recorded last, and commits
+    the differences as one group:
+
+        1. fsync the part files that received data, so the journal never
+           claims bytes that are not on disk
+        2. append one record per changed segment
+        3. fsync the journal once
+
+    Two fsyncs per interval cover any number of transfers and chunks, so
+    the journal stays off the critical path at high throughput.
+
+    Every line is "<crc32> <json>". A line torn by a crash fails its
+    checksum and ends the replay. The journal is compacted to a single
+    job record per live download when it is opened and whenever it grew
+    COMPACT_RATIO times past that.
+
+    Records:
+        {"op": "job", "key", "url", "dest", "series", "segments": [[start, end], ...],
+         "quality": playlist quality or null, "ranged": server supports ranges,
+         "sized": size known (the end of an unknown size is a placeholder),
+         "received": [bytes per segment] (only in compacted journals)}
+        {"op": "seg", "key", "i": segment index, "r": bytes received}
+        {"op": "done", "key"} (finished, failed or cancelled)
+
+    Attributes:
+        path (Path): Journal file
+        commits (int): Number of group commits
+        records_written (int): Number of records appended
+    """
+
+    FLUSH_INTERVAL = 0.5
+    COMPACT_RATIO = 4
+    COMPACT_MIN_RECORDS = 1000
+
+    def __init__(self, path=None):
+        """
+        Open the journal, replaying and compacting what it contains.
+
+        Args:
+            path (optional): Journal file, defaults to downloads.journal in the app data folder
+        """
+
+        if path is None:
+            data_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+            path = Path(data_dir) / 'downloads.journal'
+
+        self.path = Path(path)
+        self.commits = 0
+        self.records_written = 0
+
+        self._states = {}
+        self._tracked = {}
+        self._recorded = {}
+        self._record_count = 0
+
+        self._lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._replay()
+        self._compact()
+
+    def recover(self) -> list:
+        """
+        Returns the downloads interrupted by the last exit.
+
+        Downloads whose part file is gone or has the wrong size start
+        over with all of their segments empty. Streams from servers
+        without range support and playlists have no segments to resume,
+        they start over from the first byte, playlists at the quality
+        they were started with.
+
+        Returns:
+            list: ResumeState per unfinished download
+        """
+
+        states = []
+
+        for key, job in self._states.items():
+            ranges = job['segments']
+            # Journals without the flags only held ranged downloads
+            size = ranges[-1][1] + 1 if ranges and job.get('sized', True) else None
+            segments = []
+
+            if job.get('ranged', True):
+                segments = [Segment(start, end, done) for (start, end), done in zip(ranges, job['received'])]
+
+                try:
+                    intact = os.path.getsize(job['dest'] + '.part') == size
+                except OSError:
+                    intact = False
+
+                if not intact:
+                    for segment in segments:
+                        segment.received = 0
+
+            states.append(ResumeState(key, job['url'], job['dest'], job['series'], segments, job['quality'], size))
+
+        return states
+
+    def track(self, key: str, download, series: str = ''):
+        """
+        Journal the progress of a download until it finishes.
+
+        Args:
+            key (str): Stable identifier of the download, usually its destination
+            download (SegmentedDownload): Transfer to follow
+            series (str): Series of the download, kept for resuming
+        """
+
+        self._tracked[key] = (download, series)
+        self._ensure_thread()
+
+    def forget(self, key: str):
+        """ Drops a download that won't be resumed, such as a cancelled one. """
+
+        self._tracked.pop(key, None)
+
+        with self._lock:
+            self._recorded.pop(key, None)
+
+            if key in self._states:
+                self._append([{'op': 'done', 'key': key}])
+
+    def flush(self):
+        """ Commits the current progress of every tracked download now. """
+
+        with self._lock:
+            records = []
+            dirty_parts = set()
+
+            # Snapshot, track() may add downloads meanwhile
+            for key, (download, series) in list(self._tracked.items()):
+                if download.state == 'failed':
+                    # Not resumed at the next launch, only if retried now
+                    if key in self._states:
+                        records.append({'op': 'done', 'key': key})
+
+                    self._recorded.pop(key, None)
+                    continue
+
+                segments = list(download.segments)
+                quality = getattr(download, 'quality', None)
+
+                # Playlists never get byte segments, they are journaled for their quality
+                if not segments and quality is None:
+                    continue
+
+                recorded = self._recorded.get(key)
+
+                if recorded is None:
+                    records.append({
+                        'op': 'job', 'key': key, 'url': download.url, 'dest': str(download.destination),
+                        'series': series, 'segments': [[segment.start, segment.end] for segment in segments],
+                        'quality': quality, 'ranged': download.ranged, 'sized': download.size is not None,
+                    })
+                    recorded = self._recorded[key] = [0] * len(segments)
+
+                for index, segment in enumerate(segments):
+                    received = segment.received
+
+                    if received != recorded[index]:
+                        records.append({'op': 'seg', 'key': key, 'i': index, 'r': received})
+                        recorded[index] = received
+                        dirty_parts.add(download.part_path)
+
+                if download.state == 'finished':
+                    records.append({'op': 'done', 'key': key})
+                    self._tracked.pop(key, None)
+                    del self._recorded[key]
+
+            if not records:
+                return
+
+            try:
+                for part_path in dirty_parts:
+                    self._fsync_path(part_path)
+
+                self._append(records)
+
+            except OSError:
+                # Nothing was committed, write full snapshots next time
+                self._recorded.clear()
+                raise
+
+            if self._record_count > max(self.COMPACT_MIN_RECORDS, self.COMPACT_RATIO * self._live_records()):
+                self._compact()
+
+    def close(self):
+        """ Stops the flusher thread after a last commit. """
+
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.flush()
+
+    def _ensure_thread(self):
+        """ Starts the flusher thread on first use. """
+
+        with self._thread_lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._flush_loop, name='download-journal', daemon=True)
+                self._thread.start()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.FLUSH_INTERVAL):
+            try:
+                self.flush()
+            except OSError:
+                # Retried next interval, downloads must not stop over the journal
+                pass
+
+    @staticmethod
+    def _fsync_path(path):
+        """ Flushes a file written through other descriptors to disk. """
+
+        try:
+            fd = os.open(path, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+        except OSError:
+            return
+
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _encode(record: dict) -> bytes:
+        payload = json.dumps(record, separators=(',', ':')).encode()
+        return b'%08x %s\n' % (zlib.crc32(payload), payload)
+
+    def _append(self, records: list):
+        """ Appends records and fsyncs the journal, one commit. """
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(self.path, 'ab') as file:
+            file.write(b''.join(self._encode(record) for record in records))
+            file.flush()
+            os.fsync(file.fileno())
+
+        for record in records:
+            self._apply(record)
+
+        self._record_count += len(records)
+        self.records_written += len(records)
+        self.commits += 1
+
+    def _replay(self):
+        """ Rebuilds the download states from the journal file. """
+
+        try:
+            with open(self.path, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return
+
+        for line in data.split(b'\n'):
+            checksum, _, payload = line.partition(b' ')
+
+            try:
+                if int(checksum, 16) != zlib.crc32(payload):
+                    break
+
+                self._apply(json.loads(payload))
+
+            except ValueError:
+                # Torn tail of a crash, nothing after it was committed
+                break
+
+            self._record_count += 1
+
+    def _apply(self, record: dict):
+        """ Applies one record to the in-memory download states. """
+
+        op = record['op']
+        key = record['key']
+
+        if op == 'job':
+            # Kept as the snapshot compaction writes back
+            self._states[key] = dict(
+                record, series=record.get('series', ''), quality=record.get('quality'),
+                received=record.get('received') or [0] * len(record['segments']),
+            )
+
+        elif op == 'seg':
+            state = self._states.get(key)
+
+            if state is not None:
+                state['received'][record['i']] = record['r']
+
+        elif op == 'done':
+            self._states.pop(key, None)
+
+    def _live_records(self) -> int:
+        """ Number of records a compacted journal would have. """
+
+        return len(self._states)
+
+    def _compact(self):
+        """ Rewrites the journal atomically with one snapshot per live download. """
+
+        if not self._record_count or self._record_count == self._live_records():
+            return
+
+        records = list(self._states.values())
+
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+
+        with open(temp_path, 'wb') as file:
+            file.write(b''.join(self._encode(record) for record in records))
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp_path, self.path)
+        self._record_count = len(records)
+
+
+_journal = None
+
+
+def get_journal() -> DownloadJournal:
+    """
+    Returns the process-wide download journal, opening it on first use.
+
+    The journal commits a last time when the application quits.
+    """
+    global _journal
+
+    if _journal is None:
+        _journal = DownloadJournal()
+        app = QCoreApplication.instance()
+
+        if app is not None:
+            app.aboutToQuit.connect(_journal.close)
+
+    return _journal
@@ -0,0 +1,425 @@
+import hashlib
+import os
+import pickle
+import stat
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+from PySide6.QtCore import QStandardPaths
+
+from Delta_Team.Smoke.Anime_Earth.settings import get_settings
+
+LIBRARY_VERSION = 1
+
+
+class LibraryFile(NamedTuple):
+    """ A file known to the library index. """
+
+    size: int
+    mtime_ns: int
+    digest: str
+
+
+class _Folder:
+    """ Cached listing of one directory. """
+
+    __slots__ = ('mtime_ns', 'files', 'folders')
+
+    def __init__(self, mtime_ns: int, files: dict, folders: list):
+        self.mtime_ns = mtime_ns
+        self.files = files
+        self.folders = folders
+
+    def __getstate__(self):
+        return self.mtime_ns, self.files, self.folders
+
+    def __setstate__(self, state):
+        self.mtime_ns, self.files, self.folders = state
+
+
+class ScanStats(NamedTuple):
+    """ What a scan had to do. """
+
+    folders: int
+    folders_listed: int
+    files: int
+
+
+def content_digest(path, size: int, sample: int = 64 * 1024) -> str:
+    """
+    Fingerprint of a file's content from its size and its first and last bytes.
+
+    Episodes are large, reading them whole would take minutes on a
+    big library; the samples tell apart files of equal size in practice,
+    files they can't tell apart are compared with file_hash().
+    """
+
+    digest = hashlib.sha1(str(size).encode())
+
+    with open(path, 'rb') as file:
+        digest.update(file.read(sample))
+
+        if size > 2 * sample:
+            file.seek(size - sample)
+            digest.update(file.read(sample))
+
+    return digest.hexdigest()
+
+
+def file_hash(path, chunk_size: int = 1024 * 1024) -> str:
+    """ Hash of a file's whole content, read in chunks. """
+
+    digest = hashlib.sha1()
+
+    with open(path, 'rb') as file:
+        while True:
+            chunk = file.read(chunk_size)
+
+            if not chunk:
+                break
+
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class LibraryIndex:
+    """
+    Persistent index of the files under the download root.
+
+    Every folder is cached with its modification time. Adding, removing
+    or renaming an entry changes the mtime of its folder, and finished
+    downloads are moved into place with a rename, so a rescan lists only
+    the folders whose mtime changed; unchanged folders cost a single
+    stat. File sizes and mtimes come from os.scandir, which on Windows
+    needs no extra system call per file.
+
+    Content digests are computed lazily, only for files whose size
+    matches another file's, and kept while size and mtime don't change.
+    Files with equal digests are read whole before being reported as
+    duplicates.
+
+    Attributes:
+        root (Path): Download root the index covers
+        folders (dict): _Folder per path relative to the root ('' is the root)
+    """
+
+    def __init__(self, root):
+        """
+        Initialize an empty index.
+
+        Args:
+            root: Download root directory
+        """
+        self.root = Path(root)
+        self.folders = {}
+
+        self._lock = threading.Lock()
+
+    def scan(self) -> ScanStats:
+        """
+        Bring the index up to date with the disk.
+
+        Returns:
+            ScanStats: Folders visited, folders listed again and files indexed
+        """
+
+        with self._lock:
+            folders = {}
+            listed = 0
+            pending = ['']
+
+            while pending:
+                relative = pending.pop()
+                path = os.path.join(self.root, relative) if relative else os.fspath(self.root)
+
+                try:
+                    mtime_ns = os.stat(path).st_mtime_ns
+                except OSError:
+                    continue
+
+                cached = self.folders.get(relative)
+
+                if cached is None or cached.mtime_ns != mtime_ns:
+                    cached = self._list(path, mtime_ns, cached)
+                    listed += 1
+
+                folders[relative] = cached
+                pending.extend(
+                    os.path.join(relative, name) if relative else name for name in cached.folders
+                )
+
+            self.folders = folders
+
+            return ScanStats(len(folders), listed, sum(len(folder.files) for folder in folders.values()))
+
+    @staticmethod
+    def _list(path: str, mtime_ns: int, previous: _Folder) -> _Folder:
+        """ Lists a folder, keeping digests of files that didn't change. """
+
+        old_files = previous.files if previous is not None else {}
+        files = {}
+        folders = []
+
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        info = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+
+                    if stat.S_ISDIR(info.st_mode):
+                        folders.append(entry.name)
+                    elif stat.S_ISREG(info.st_mode) and not entry.name.endswith(('.part', '.tmp')):
+                        old = old_files.get(entry.name)
+                        digest = old.digest if old and old[:2] == (info.st_size, info.st_mtime_ns) else None
+                        files[entry.name] = LibraryFile(info.st_size, info.st_mtime_ns, digest)
+        except OSError:
+            pass
+
+        return _Folder(mtime_ns, files, folders)
+
+    def _split(self, path) -> tuple:
+        """ Returns (folder relative to the root, file name) of a path. """
+
+        relative = os.path.relpath(os.path.abspath(path), os.path.abspath(self.root))
+        folder, name = os.path.split(relative)
+
+        return ('' if folder == '.' else folder), name
+
+    def names(self, folder) -> set:
+        """
+        Names of the files in an indexed folder.
+
+        The folder is listed again if its mtime changed since the last
+        scan, so the answer is current for the cost of one stat.
+
+        Returns:
+            set: File names, None if the folder isn't indexed
+        """
+
+        relative = os.path.relpath(os.path.abspath(folder), os.path.abspath(self.root))
+        relative = '' if relative == '.' else relative
+
+        with self._lock:
+            cached = self.folders.get(relative)
+
+            if cached is None:
+                return None
+
+            try:
+                mtime_ns = os.stat(folder).st_mtime_ns
+            except OSError:
+                return None
+
+            if mtime_ns != cached.mtime_ns:
+                cached = self.folders[relative] = self._list(os.fspath(folder), mtime_ns, cached)
+
+            return set(cached.files)
+
+    def get(self, path) -> LibraryFile:
+        """ Returns the indexed file at a path, None if unknown. """
+
+        folder, name = self._split(path)
+
+        with self._lock:
+            cached = self.folders.get(folder)
+
+            return cached.files.get(name) if cached is not None else None
+
+    def __contains__(self, path) -> bool:
+        return self.get(path) is not None
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(folder.files) for folder in self.folders.values())
+
+    def digest(self, path) -> str:
+        """ Returns the content digest of an indexed file, computing it if needed. """
+
+        folder, name = self._split(path)
+
+        with self._lock:
+            cached = self.folders.get(folder)
+            entry = cached.files.get(name) if cached is not None else None
+
+            if entry is None:
+                return None
+
+            if entry.digest is None:
+                entry = entry._replace(digest=content_digest(path, entry.size))
+                cached.files[name] = entry
+
+            return entry.digest
+
+    def find_duplicates(self) -> list:
+        """
+        Group files with the same content.
+
+        Only files sharing their size with another file are sampled, and
+        only those whose samples match too are read whole.
+
+        Returns:
+            list: Lists of paths relative to the root, one list per duplicate group
+        """
+
+        candidate_groups = []
+
+        with self._lock:
+            by_size = {}
+
+            for relative, folder in self.folders.items():
+                for name, entry in folder.files.items():
+                    if entry.size:
+                        by_size.setdefault(entry.size, []).append((folder, relative, name))
+
+            for size, candidates in by_size.items():
+                if len(candidates) < 2:
+                    continue
+
+                by_digest = {}
+
+                for folder, relative, name in candidates:
+                    entry = folder.files[name]
+                    path = os.path.join(relative, name)
+
+                    if entry.digest is None:
+                        try:
+                            entry = folder.files[name] = entry._replace(
+                                digest=content_digest(os.path.join(self.root, path), size)
+                            )
+                        except OSError:
+                            continue
+
+                    by_digest.setdefault(entry.digest, []).append(path)
+
+                candidate_groups.extend(group for group in by_digest.values() if len(group) > 1)
+
+        # Reading whole files takes long, the index stays usable meanwhile
+        groups = []
+
+        for candidates in candidate_groups:
+            by_hash = {}
+
+            for path in candidates:
+                try:
+                    by_hash.setdefault(file_hash(os.path.join(self.root, path)), []).append(path)
+                except OSError:
+                    continue
+
+            groups.extend(group for group in by_hash.values() if len(group) > 1)
+
+        return groups
+
+    def save(self, path):
+        """ Persist the index to a file, replacing it atomically. """
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_path = path.with_name(path.name + '.tmp')
+
+        with open(temp_path, 'wb') as file:
+            pickle.dump((LIBRARY_VERSION, os.fspath(self.root), self.folders), file,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path, root):
+        """
+        Load an index saved with save().
+
+        Returns:
+            LibraryIndex: The index, or None if the file is missing, outdated
+                          or for another root
+        """
+
+        try:
+            with open(path, 'rb') as file:
+                version, saved_root, folders = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError):
+            return None
+
+        if version != LIBRARY_VERSION or saved_root != os.fspath(root):
+            return None
+
+        index = cls(root)
+        index.folders = folders
+
+        return index
+
+
+def get_download_root() -> Path:
+    """
+    Returns the download root.
+
+    ANIME_EARTH_DOWNLOADS overrides the folder chosen in the settings,
+    which defaults to "Anime Earth" in the user's videos folder.
+    """
+
+    path = os.environ.get('ANIME_EARTH_DOWNLOADS') or get_settings()['downloads.folder']
+
+    if path:
+        return Path(path)
+
+    movies_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.MoviesLocation)
+
+    return Path(movies_dir) / 'Anime Earth'
+
+
+def get_library_path() -> Path:
+    """ Returns where the library index is persisted. """
+
+    data_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+
+    return Path(data_dir) / 'library.idx'
+
+
+def load_library(root=None, index_path=None) -> LibraryIndex:
+    """
+    Load the persisted library index and bring it up to date.
+
+    Args:
+        root (optional): Download root, defaults to get_download_root()
+        index_path (optional): Index file, defaults to get_library_path()
+
+    Returns:
+        LibraryIndex: The scanned index
+    """
+
+    root = Path(root or get_download_root())
+    index_path = Path(index_path or get_library_path())
+
+    library = LibraryIndex.load(index_path, root) or LibraryIndex(root)
+    stats = library.scan()
+
+    if stats.folders_listed:
+        library.save(index_path)
+
+    return library
+
+
+_library = None
+_library_lock = threading.Lock()
+
+
+def get_library() -> LibraryIndex:
+    """
+    Returns the process-wide library index, loading and scanning it on
+    first use and again whenever the download root changed.
+
+    The first scan of a large library touches the disk, call this from
+    a worker (such as the asyncio bridge) rather than the GUI thread.
+    """
+    global _library
+
+    with _library_lock:
+        root = get_download_root()
+
+        if _library is None or _library.root != root:
+            _library = load_library(root)
+
+    return _library
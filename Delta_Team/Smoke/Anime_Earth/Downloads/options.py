@@ -0,0 +1,71 @@
+from pathlib import Path
+from typing import NamedTuple
+
+from Delta_Team.Smoke.Anime_Earth.Downloads.ranges import EpisodeSelection, parse_episode_ranges
+
+QUALITIES = ('1080p', '720p', '480p', '360p')
+
+
+class DownloadOptions(NamedTuple):
+    """ Download preferences collected by OptionsWidget.get_download_options(). """
+
+    quality: str = '720p'
+    language: str = 'subbed'
+    episode_mode: str = 'all'
+    default_folder_name: bool = True
+    episode_ranges: str = ''
+
+    def episode_selection(self) -> EpisodeSelection:
+        """
+        Returns the selected episodes.
+
+        Raises:
+            RangeSyntaxError: If the range mode is used with a malformed specification
+        """
+
+        if self.episode_mode == 'range':
+            return parse_episode_ranges(self.episode_ranges)
+
+        return EpisodeSelection.everything()
+
+    def pick_source(self, sources: dict) -> str:
+        """
+        Chooses the URL matching the selected quality and language.
+
+        When the exact quality is not offered the closest lower one is
+        taken, then the closest higher one.
+
+        Args:
+            sources (dict): URLs keyed by (quality, language)
+
+        Returns:
+            str: URL of the chosen source, None if the language isn't offered
+        """
+
+        position = QUALITIES.index(self.quality) if self.quality in QUALITIES else 1
+        preference = QUALITIES[position:] + QUALITIES[:position][::-1]
+
+        for quality in preference:
+            url = sources.get((quality, self.language))
+
+            if url is not None:
+                return url
+
+        return None
+
+    def folder(self, root, series: str, custom_folder: str = None) -> Path:
+        """
+        Returns the folder the files of a series are saved in.
+
+        Args:
+            root: Download root directory
+            series (str): Series name as shown on the website
+            custom_folder (str, optional): Folder name used when default naming is off
+        """
+
+        return Path(root) / (series if self.default_folder_name or not custom_folder else custom_folder)
+
+    def destination(self, root, series: str, file_name: str, custom_folder: str = None) -> Path:
+        """ Returns where a file of a series is saved. """
+
+        return self.folder(root, series, custom_folder) / file_name
@@ -0,0 +1,147 @@
+import os
+from typing import NamedTuple
+
+from Delta_Team.Smoke.Anime_Earth.Downloads.options import DownloadOptions
+from Delta_Team.Smoke.Anime_Earth.Downloads.ranges import EpisodeSelection
+
+
+class Episode(NamedTuple):
+    """ One episode offered by a source site. """
+
+    season: int
+    number: int
+    sources: dict
+
+
+class PlannedJob(NamedTuple):
+    """ A download the planner decided to queue. """
+
+    season: int
+    number: int
+    url: str
+    destination: str
+    priority: int
+    quality: str
+
+
+class BatchPlan(NamedTuple):
+    """
+    Result of planning a batch.
+
+    Attributes:
+        jobs (list): PlannedJob objects, earliest episodes first
+        skipped_existing (int): Selected episodes already on disk (counted up to the limit)
+        missing_source (int): Selected episodes without a source for the language
+    """
+
+    jobs: list
+    skipped_existing: int
+    missing_source: int
+
+
+def episode_file_name(series: str, season: int, number: int, url: str) -> str:
+    """ Returns the file name of an episode, keeping the extension of its source. """
+
+    # Plain string splitting, urlsplit's cache doesn't help with thousands of unique URLs
+    path = url.partition('?')[0].partition('#')[0]
+    name = path.rsplit('/', 1)[-1]
+    extension = name[name.rfind('.'):] if '.' in name else '.mp4'
+    stem = f'{series} - S{season:02d}E{number:03d}' if season is not None else f'{series} - {number:03d}'
+
+    return stem + extension
+
+
+def _existing_files(folder) -> set:
+    """ Names of the files in a folder, read with one directory scan. """
+
+    try:
+        with os.scandir(folder) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except OSError:
+        return set()
+
+
+def plan_batch(series: str, episodes, selection: EpisodeSelection, options: DownloadOptions,
+               root, custom_folder: str = None, limit: int = None, library=None) -> BatchPlan:
+    """
+    Turn a range selection into the downloads of a batch.
+
+    Episodes are streamed from the iterable and tested against the
+    interval set, only matches are kept as small tuples and file names
+    are built just for the episodes that end up planned. Existing files
+    come from the library index when given, otherwise the destination
+    folder is scanned once instead of checking every file. Jobs are
+    ordered by season and episode and get decreasing priorities, so
+    with several downloads running the first episodes finish first
+    and can be watched while the rest arrive.
+
+    Args:
+        series (str): Series name as shown on the website
+        episodes: Iterable of Episode, in any order
+        selection (EpisodeSelection): Parsed range specification
+        options (DownloadOptions): Quality, language and folder choices
+        root: Download root directory
+        custom_folder (str, optional): Folder name used when default naming is off
+        limit (int, optional): Plan at most this many downloads
+        library (LibraryIndex, optional): Index of the download root
+
+    Returns:
+        BatchPlan: Jobs to queue and the counts of skipped episodes
+    """
+
+    folder = options.folder(root, series, custom_folder)
+    existing = library.names(folder) if library is not None else None
+
+    if existing is None:
+        existing = _existing_files(folder)
+
+    prefix = os.path.join(folder, '')
+
+    selected = []
+    missing_source = 0
+
+    for episode in episodes:
+        if not selection.contains(episode.season, episode.number):
+            continue
+
+        url = options.pick_source(episode.sources)
+
+        if url is None:
+            missing_source += 1
+            continue
+
+        selected.append((episode.season or 0, episode.number, episode.season, url))
+
+    selected.sort()
+
+    jobs = []
+    skipped_existing = 0
+
+    # File names are only built for episodes that may still be planned
+    for _, number, season, url in selected:
+        if limit is not None and len(jobs) >= limit:
+            break
+
+        file_name = episode_file_name(series, season, number, url)
+
+        if file_name in existing:
+            skipped_existing += 1
+            continue
+
+        jobs.append(PlannedJob(season, number, url, prefix + file_name, -len(jobs), options.quality))
+
+    return BatchPlan(jobs, skipped_existing, missing_source)
+
+
+def submit_plan(scheduler, series: str, plan: BatchPlan) -> list:
+    """
+    Queue the jobs of a plan on a DownloadScheduler.
+
+    Returns:
+        list: The queued DownloadJob objects
+    """
+
+    return [
+        scheduler.submit(job.url, job.destination, series, job.priority, quality=job.quality)
+        for job in plan.jobs
+    ]
@@ -0,0 +1,183 @@
+import time
+from typing import NamedTuple
+
+from PySide6.QtCore import QEvent, QObject, QTimer, Qt, Signal, Slot
+
+
+class ProgressUpdate(NamedTuple):
+    """ Progress of one transfer at the time of a tick. """
+
+    job_id: int
+    received: int
+    total: int
+    rate: float
+    state: str
+
+
+class ProgressHub(QObject):
+    """
+    Publishes the progress of all transfers as one batched signal.
+
+    Workers never signal the GUI: each segment only bumps its own byte
+    counter, written by a single thread, so no lock is needed. A timer
+    in the GUI thread reads those counters at a fixed cadence and emits
+    one progress_batch per tick with the transfers that changed, which
+    keeps the cost on the GUI thread independent of the chunk rate.
+
+    The cadence drops to IDLE_INTERVAL_MS while every watched widget is
+    hidden or minimised, and while nothing is running.
+
+    Signals:
+        progress_batch (object): Emitted at most once per tick
+                                 Args: (list of ProgressUpdate)
+
+    Attributes:
+        sources (dict): Registered transfers by job id
+        ticks (int): Number of timer ticks
+        batches (int): Number of progress_batch emissions
+    """
+
+    progress_batch = Signal(object)
+
+    ACTIVE_INTERVAL_MS = 40
+    IDLE_INTERVAL_MS = 1000
+
+    # Smoothing factor of the exponential moving average of the rate
+    RATE_SMOOTHING = 0.3
+
+    def __init__(self, scheduler=None, parent=None):
+        """
+        Initialize the hub and start its timer.
+
+        Args:
+            scheduler (DownloadScheduler, optional): Scheduler whose running
+                                                     jobs are tracked automatically
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+
+        self.scheduler = scheduler
+        self.sources = {}
+        self.ticks = 0
+        self.batches = 0
+
+        self._watched = []
+        self._last = {}
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self._timer.timeout.connect(self._tick)
+        self._timer.start(self.IDLE_INTERVAL_MS)
+
+    def register(self, job_id, source):
+        """
+        Track a transfer that isn't run by the scheduler.
+
+        Args:
+            job_id: Identifier reported in the updates
+            source: Object with "received", "size" and "state" attributes,
+                    such as a SegmentedDownload
+        """
+
+        self.sources[job_id] = source
+        self._update_interval()
+
+    def unregister(self, job_id):
+        """ Stops tracking a transfer after publishing its last state. """
+
+        source = self.sources.pop(job_id, None)
+
+        if source is not None:
+            self._publish({job_id: source})
+            self._last.pop(job_id, None)
+
+    def watch(self, widget):
+        """
+        Lower the cadence while the widget is hidden or minimised.
+
+        Several widgets can be watched, the fast cadence is used while
+        any of them is visible.
+        """
+
+        self._watched.append(widget)
+        widget.installEventFilter(self)
+        self._update_interval()
+
+    def eventFilter(self, watched, event):
+        if event.type() in (QEvent.Type.Show, QEvent.Type.Hide, QEvent.Type.WindowStateChange):
+            self._update_interval()
+
+        return False
+
+    def _is_seen(self) -> bool:
+        """ Whether a watched widget is on screen, True when none is watched. """
+
+        if not self._watched:
+            return True
+
+        return any(
+            widget.isVisible() and not widget.window().isMinimized()
+            for widget in self._watched
+        )
+
+    def _update_interval(self):
+        """ Picks the cadence for the current visibility and workload. """
+
+        busy = bool(self.sources) or bool(self.scheduler and self.scheduler.active_count())
+        interval = self.ACTIVE_INTERVAL_MS if busy and self._is_seen() else self.IDLE_INTERVAL_MS
+
+        if self._timer.interval() != interval:
+            self._timer.start(interval)
+
+    @Slot()
+    def _tick(self):
+        """ Reads every counter once and publishes what changed. """
+
+        self.ticks += 1
+
+        sources = dict(self.sources)
+
+        if self.scheduler is not None:
+            for job in self.scheduler.running_jobs():
+                sources[job.job_id] = job.download
+
+        # Jobs seen last tick but no longer running get a final update
+        gone = self._last.keys() - sources.keys()
+
+        for job_id in gone:
+            if self.scheduler is not None and job_id in self.scheduler.jobs:
+                sources[job_id] = self.scheduler.jobs[job_id].download
+
+        self._publish(sources)
+
+        for job_id in gone:
+            self._last.pop(job_id, None)
+
+        self._update_interval()
+
+    def _publish(self, sources: dict):
+        """ Emits one batch with the sources whose progress or state changed. """
+
+        now = time.monotonic()
+        updates = []
+
+        for job_id, source in sources.items():
+            received = source.received
+            state = source.state
+            last = self._last.get(job_id)
+
+            if last is not None and last[1] == received and last[3] == state:
+                continue
+
+            rate = 0.0
+
+            if last is not None and now > last[0]:
+                instant = (received - last[1]) / (now - last[0])
+                rate = last[2] + self.RATE_SMOOTHING * (instant - last[2])
+
+            self._last[job_id] = (now, received, rate, state)
+            updates.append(ProgressUpdate(job_id, received, source.size or 0, rate, state))
+
+        if updates:
+            self.batches += 1
+            self.progress_batch.emit(updates)
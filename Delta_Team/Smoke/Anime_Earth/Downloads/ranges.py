@@ -0,0 +1,262 @@
+import re
+from bisect import bisect_right
+
+# End of an open range such as "20-"
+OPEN_END = float('inf')
+
+
+class RangeSyntaxError(ValueError):
+    """
+    Raised for an episode range specification that can't be parsed.
+
+    Attributes:
+        position (int): Offset of the offending part in the text
+    """
+
+    def __init__(self, message: str, position: int):
+        super().__init__(f'{message} (at character {position + 1})')
+        self.position = position
+
+
+class IntervalSet:
+    """
+    Set of episode numbers stored as sorted, disjoint, inclusive intervals.
+
+    A selection like "1-5000" costs one interval instead of 5000
+    numbers. Adjacent and overlapping intervals are merged on insert,
+    membership is a binary search.
+    """
+
+    __slots__ = ('_starts', '_ends')
+
+    def __init__(self, intervals=()):
+        self._starts = []
+        self._ends = []
+
+        for start, end in intervals:
+            self.add(start, end)
+
+    def add(self, start: int, end=OPEN_END):
+        """ Adds the inclusive interval [start, end], merging neighbours. """
+
+        if end < start:
+            start, end = end, start
+
+        # First interval that could touch the new one
+        low = bisect_right(self._ends, start - 1)
+        if low > 0 and self._ends[low - 1] >= start - 1:
+            low -= 1
+
+        # Intervals starting at or before end + 1 are merged
+        high = bisect_right(self._starts, end + 1)
+
+        if low < high:
+            start = min(start, self._starts[low])
+            end = max(end, self._ends[high - 1])
+
+        self._starts[low:high] = [start]
+        self._ends[low:high] = [end]
+
+    def __contains__(self, number) -> bool:
+        position = bisect_right(self._starts, number) - 1
+        return position >= 0 and number <= self._ends[position]
+
+    def __iter__(self):
+        """ Yields the (start, end) intervals in order. """
+        return iter(zip(self._starts, self._ends))
+
+    def __bool__(self):
+        return bool(self._starts)
+
+    def __eq__(self, other):
+        return isinstance(other, IntervalSet) and list(self) == list(other)
+
+    def __repr__(self):
+        return f'IntervalSet({list(self)!r})'
+
+    def __str__(self):
+        parts = []
+
+        for start, end in self:
+            if end == OPEN_END:
+                parts.append(f'{start}-')
+            elif start == end:
+                parts.append(str(start))
+            else:
+                parts.append(f'{start}-{end}')
+
+        return ', '.join(parts)
+
+    @property
+    def is_bounded(self) -> bool:
+        """ Whether the set has a last episode. """
+        return not self._ends or self._ends[-1] != OPEN_END
+
+    def count(self, last: int = None) -> int:
+        """ Number of episodes, open ranges cut at last. """
+
+        total = 0
+
+        for start, end in self:
+            end = min(end, last) if last is not None else end
+
+            if end == OPEN_END:
+                raise ValueError('An open range needs the last episode to be counted')
+
+            total += max(0, int(end) - start + 1)
+
+        return total
+
+    def numbers(self, last: int = None):
+        """ Yields the episode numbers in order, open ranges cut at last. """
+
+        for start, end in self:
+            end = min(end, last) if last is not None else end
+
+            if end == OPEN_END:
+                raise ValueError('An open range needs the last episode to be enumerated')
+
+            yield from range(start, int(end) + 1)
+
+
+class EpisodeSelection:
+    """
+    Parsed episode range specification.
+
+    Ranges written after a season prefix ("S2: 1-5" or "S2E1-5") only
+    apply to that season. Ranges without a prefix apply to every season
+    that has no prefixed ranges of its own, or to the absolute episode
+    number when the series isn't split into seasons.
+
+    Attributes:
+        seasons (dict): IntervalSet per season number, None for unprefixed ranges
+        text (str): Specification the selection was parsed from
+    """
+
+    def __init__(self, text: str = ''):
+        self.text = text
+        self.seasons = {}
+
+    @classmethod
+    def everything(cls) -> 'EpisodeSelection':
+        """ Selection of all episodes of every season. """
+
+        selection = cls('all')
+        selection.add(None, 1, OPEN_END)
+        return selection
+
+    def add(self, season, start: int, end=OPEN_END):
+        """ Adds a range of episodes of a season (None for unprefixed). """
+
+        self.seasons.setdefault(season, IntervalSet()).add(start, end)
+
+    def contains(self, season, number: int) -> bool:
+        """ Whether an episode of a season is selected. """
+
+        intervals = self.seasons.get(season)
+
+        if intervals is None:
+            intervals = self.seasons.get(None)
+
+        return intervals is not None and number in intervals
+
+    def __bool__(self):
+        return any(self.seasons.values())
+
+    def __str__(self):
+        parts = []
+
+        for season, intervals in sorted(self.seasons.items(), key=lambda item: (item[0] is not None, item[0] or 0)):
+            text = str(intervals)
+            parts.append(text if season is None else f'S{season}: {text}')
+
+        return '; '.join(parts)
+
+
+_SEASON_PREFIX = re.compile(r'\s*(?:s|season\s*)(\d+)\s*(?::|e|$)', re.IGNORECASE)
+_RANGE = re.compile(r'\s*(\d*)\s*(-?)\s*(\d*)\s*$')
+_ALL = {'all', '*'}
+
+
+def parse_episode_ranges(text: str) -> EpisodeSelection:
+    """
+    Parse an episode range specification.
+
+    Grammar, parts separated by "," or ";":
+        part    := [season] [range]
+        season  := "S" number ":" | "S" number "E" | "Season " number ":"
+        range   := number | number "-" number | number "-" | "-" number
+                 | "all" | "*"
+
+    A season prefix sticks to the following parts until the next
+    prefix, so "S1: 1-12, 15, S2: 1-3" selects 1-12 and 15 of season 1.
+    A prefix on its own ("S3") selects the whole season.
+
+    Examples:
+        "1-12, 15, 20-"   episodes 1 to 12, 15 and 20 onwards
+        "S2E5-8"          episodes 5 to 8 of season 2
+
+    Args:
+        text (str): Specification typed by the user
+
+    Returns:
+        EpisodeSelection: The parsed selection
+
+    Raises:
+        RangeSyntaxError: If a part is malformed or empty
+    """
+
+    selection = EpisodeSelection(text)
+    season = None
+    position = 0
+
+    for part in re.split(r'[,;]', text):
+        offset = position
+        position += len(part) + 1
+
+        if not part.strip():
+            if text.strip():
+                raise RangeSyntaxError('Empty range', offset)
+            continue
+
+        prefix = _SEASON_PREFIX.match(part)
+
+        if prefix:
+            season = int(prefix.group(1))
+            part = part[prefix.end():]
+
+            if not part.strip():
+                selection.add(season, 1, OPEN_END)
+                continue
+
+        if part.strip().lower() in _ALL:
+            selection.add(season, 1, OPEN_END)
+            continue
+
+        match = _RANGE.match(part)
+
+        if match is None or not (match.group(1) or match.group(3)):
+            raise RangeSyntaxError(f'Invalid range "{part.strip()}"', offset)
+
+        first, dash, last = match.groups()
+
+        if not dash:
+            if not first or last:
+                raise RangeSyntaxError(f'Invalid range "{part.strip()}"', offset)
+            start = end = int(first)
+        else:
+            start = int(first) if first else 1
+            end = int(last) if last else OPEN_END
+
+        if start < 1:
+            raise RangeSyntaxError('Episodes are numbered from 1', offset)
+
+        if end < start:
+            raise RangeSyntaxError(f'Range "{part.strip()}" ends before it starts', offset)
+
+        selection.add(season, start, end)
+
+    if not selection:
+        raise RangeSyntaxError('No episodes selected', 0)
+
+    return selection
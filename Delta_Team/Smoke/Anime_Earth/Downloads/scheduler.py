@@ -0,0 +1,564 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from Delta_Team.Smoke.Anime_Earth.Downloads.hls import create_download
+from Delta_Team.Smoke.Anime_Earth.Downloads.journal import get_journal
+from Delta_Team.Smoke.Anime_Earth.settings import get_settings
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket capping the aggregate bandwidth.
+
+    Workers consume tokens after receiving a chunk. The bucket may go
+    into debt; the caller then sleeps until the debt is repaid, which
+    keeps the average rate at the cap without any timer thread.
+
+    Attributes:
+        rate (float): Bytes per second, 0 for unlimited
+        burst (float): Maximum tokens saved up while idle
+    """
+
+    def __init__(self, rate: float = 0, burst: float = None):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate (float): Bytes per second, 0 for unlimited
+            burst (float, optional): Bucket size, defaults to one second of traffic
+        """
+        self._lock = threading.Lock()
+        self.set_rate(rate, burst)
+
+    def set_rate(self, rate: float, burst: float = None):
+        """ Changes the cap, also while downloads are running. """
+
+        with self._lock:
+            self.rate = rate
+            self.burst = burst if burst is not None else rate
+            self._tokens = self.burst
+            self._updated = time.monotonic()
+
+    def consume(self, amount: int):
+        """ Takes tokens for a received chunk, sleeping if over the cap. """
+
+        with self._lock:
+            if not self.rate:
+                return
+
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if delay:
+            time.sleep(delay)
+
+
+class DownloadJob:
+    """
+    One queued file of the scheduler.
+
+    Attributes:
+        job_id (int): Unique id of the job
+        url (str): Source URL
+        destination: Final file path
+        series (str): Series the file belongs to, used for fair sharing
+        priority (int): Higher runs first
+        state (str): 'queued', 'running', 'paused', 'finished', 'failed' or 'cancelled'
+        queued_at (float): Time the job last entered the queue
+        started_at (float): Time the job last started
+        download (SegmentedDownload): Transfer of the job once started
+        segments (list): Segments of an interrupted transfer to resume, or None
+        quality (str): Wanted quality of a playlist source, or None
+        resume_pending (bool): Resumed while its transfer was still stopping
+    """
+
+    def __init__(self, job_id: int, url: str, destination, series: str, priority: int,
+                 segments=None, quality: str = None):
+        self.job_id = job_id
+        self.url = url
+        self.destination = destination
+        self.series = series
+        self.priority = priority
+        self.host = urlsplit(url).netloc
+        self.state = 'queued'
+        self.queued_at = time.monotonic()
+        self.started_at = None
+        self.download = None
+        self.segments = segments
+        self.quality = quality
+        self.resume_pending = False
+
+    def __repr__(self):
+        return f'DownloadJob({self.job_id}, {self.series!r}, priority={self.priority}, state={self.state!r})'
+
+
+class SchedulerMetrics:
+    """
+    Counters of the download scheduler.
+
+    Attributes:
+        started (int): Number of job starts
+        finished (int): Number of jobs finished
+        failed (int): Number of jobs failed
+        total_wait (float): Seconds jobs spent queued before starting
+        max_wait (float): Longest queue wait in seconds
+    """
+
+    def __init__(self):
+        self.started = 0
+        self.finished = 0
+        self.failed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_start(self, wait: float):
+        """ Adds one job start after waiting in the queue. """
+
+        self.started += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    @property
+    def mean_wait(self) -> float:
+        """ Average queue wait in seconds. """
+
+        return self.total_wait / self.started if self.started else 0.0
+
+
+class DownloadScheduler:
+    """
+    Priority queue running downloads within concurrency and bandwidth limits.
+
+    Jobs are kept in one heap per series. Whenever a slot frees up the
+    scheduler looks at the head of every series and starts the job with
+    the highest priority; among equal priorities the series with the
+    fewest running jobs, then the one served least recently, wins, so a
+    long series can't starve a short one queued after it. Jobs whose
+    host is at its connection limit are skipped until a slot of that
+    host frees up. All transfers share one token bucket.
+
+    Reordering uses lazy deletion: a changed job is pushed again with a
+    new sequence number and stale heap entries are dropped when popped.
+
+    Attributes:
+        max_active (int): Global limit of running jobs
+        max_per_host (int): Limit of running jobs per host
+        bandwidth (TokenBucket): Shared bandwidth limiter
+        metrics (SchedulerMetrics): Scheduling counters
+    """
+
+    def __init__(self, max_active: int = 4, max_per_host: int = 2, bandwidth: int = 0,
+                 segment_count: int = 8, connections: int = 4, download_factory=create_download,
+                 journal=None):
+        """
+        Initialize an empty scheduler.
+
+        Args:
+            max_active (int): Global limit of running jobs
+            max_per_host (int): Limit of running jobs per host
+            bandwidth (int): Aggregate bytes per second, 0 for unlimited
+            segment_count (int): Segments per download
+            connections (int): Connections per download
+            download_factory (callable): Creates the transfer of a job, same
+                                         signature as hls.create_download
+            journal (DownloadJournal, optional): Journal recording progress for resuming
+        """
+        self.max_active = max_active
+        self.max_per_host = max_per_host
+        self.bandwidth = TokenBucket(bandwidth)
+        self.segment_count = segment_count
+        self.connections = connections
+        self.download_factory = download_factory
+        self.journal = journal
+        self.metrics = SchedulerMetrics()
+
+        self.jobs = {}
+
+        self._queues = {}
+        self._entries = {}
+        self._active = {}
+        self._active_hosts = Counter()
+        self._active_series = Counter()
+        self._last_served = {}
+        self._paused = False
+
+        self._ids = itertools.count(1)
+        self._sequence = itertools.count()
+        self._lock = threading.RLock()
+
+    def submit(self, url: str, destination, series: str = '', priority: int = 0,
+               segments=None, quality: str = None) -> DownloadJob:
+        """
+        Queue a file and start it if a slot is free.
+
+        Args:
+            url (str): Source URL
+            destination: Final file path
+            series (str): Series the file belongs to
+            priority (int): Higher runs first
+            segments (list, optional): Segments of an interrupted transfer to resume
+            quality (str, optional): Wanted quality when the URL is an HLS playlist
+
+        Returns:
+            DownloadJob: The queued job
+        """
+
+        with self._lock:
+            job = DownloadJob(next(self._ids), url, destination, series, priority, segments, quality)
+            self.jobs[job.job_id] = job
+            self._push(job)
+            self._dispatch()
+
+        return job
+
+    def restore(self) -> list:
+        """
+        Queue the downloads interrupted by the last exit, as recorded by the journal.
+
+        Only the byte ranges still missing are fetched again, playlists
+        start over at the quality they were started with.
+
+        Returns:
+            list: The queued DownloadJob objects
+        """
+
+        if self.journal is None:
+            return []
+
+        return [
+            self.submit(state.url, state.destination, state.series, segments=state.segments or None,
+                        quality=state.quality)
+            for state in self.journal.recover()
+        ]
+
+    def set_priority(self, job_id: int, priority: int):
+        """ Changes the priority of a job, reordering the queue. """
+
+        with self._lock:
+            job = self.jobs[job_id]
+            job.priority = priority
+
+            if job.state == 'queued':
+                self._push(job)
+                self._dispatch()
+
+    def move_to_front(self, job_id: int):
+        """ Gives a job a priority above every other queued job. """
+
+        with self._lock:
+            queued = [job.priority for job in self.jobs.values() if job.state == 'queued']
+            self.set_priority(job_id, max(queued, default=0) + 1)
+
+    def pause(self, job_id: int):
+        """ Holds a queued job back, or pauses a running one. """
+
+        with self._lock:
+            job = self.jobs[job_id]
+
+            if job.state == 'queued':
+                job.state = 'paused'
+                self._entries.pop(job_id, None)
+
+            elif job.state == 'running':
+                job.resume_pending = False
+                job.download.pause()
+
+    def resume(self, job_id: int):
+        """
+        Puts a paused or failed job back in the queue.
+
+        A job paused a moment ago may still be running until its
+        transfer stops, it is queued again as soon as it did.
+        """
+
+        with self._lock:
+            job = self.jobs[job_id]
+
+            if job.state in ('paused', 'failed'):
+                self._requeue(job)
+                self._dispatch()
+
+            elif job.state == 'running':
+                job.resume_pending = True
+
+    def cancel(self, job_id: int):
+        """
+        Removes a job from the queue, pausing it first if running.
+
+        The part file is deleted, that of a running job once its
+        transfer has stopped.
+        """
+
+        with self._lock:
+            job = self.jobs[job_id]
+            running = job.state == 'running'
+
+            if running:
+                job.download.pause()
+
+            job.state = 'cancelled'
+            job.resume_pending = False
+            self._entries.pop(job_id, None)
+
+            if self.journal is not None:
+                self.journal.forget(str(job.destination))
+
+            if not running:
+                self._remove_part_file(job)
+
+    def pause_all(self):
+        """ Stops starting new jobs and pauses the running ones. """
+
+        with self._lock:
+            self._paused = True
+
+            for job_id in list(self._active):
+                job = self.jobs[job_id]
+                job.resume_pending = False
+                job.download.pause()
+
+    def resume_all(self):
+        """ Starts scheduling again, including jobs paused by pause_all(). """
+
+        with self._lock:
+            self._paused = False
+
+            for job in self.jobs.values():
+                if job.state in ('paused', 'running'):
+                    self.resume(job.job_id)
+
+            self._dispatch()
+
+    def set_bandwidth(self, rate: int):
+        """ Changes the aggregate bandwidth cap in bytes per second. """
+
+        self.bandwidth.set_rate(rate)
+
+    def set_limits(self, max_active: int = None, max_per_host: int = None):
+        """
+        Changes the job limits, starting queued jobs if they were raised.
+
+        Running jobs are never stopped, lowered limits apply as they finish.
+        """
+
+        with self._lock:
+            if max_active is not None:
+                self.max_active = max_active
+
+            if max_per_host is not None:
+                self.max_per_host = max_per_host
+
+            self._dispatch()
+
+    def queue_depth(self) -> int:
+        """ Returns the number of jobs waiting to start. """
+
+        with self._lock:
+            return len(self._entries)
+
+    def active_count(self) -> int:
+        """ Returns the number of running jobs. """
+
+        with self._lock:
+            return len(self._active)
+
+    def running_jobs(self) -> list:
+        """ Returns the running jobs. """
+
+        with self._lock:
+            return list(self._active.values())
+
+    def metrics_snapshot(self) -> dict:
+        """ Returns queue depth, active jobs and wait times, times in milliseconds. """
+
+        with self._lock:
+            now = time.monotonic()
+            waiting = [now - self.jobs[job_id].queued_at for job_id in self._entries]
+
+            return {
+                'queue_depth': len(self._entries),
+                'active': len(self._active),
+                'active_hosts': dict(self._active_hosts),
+                'started': self.metrics.started,
+                'finished': self.metrics.finished,
+                'failed': self.metrics.failed,
+                'mean_wait_ms': self.metrics.mean_wait * 1000,
+                'max_wait_ms': self.metrics.max_wait * 1000,
+                'oldest_queued_ms': max(waiting, default=0.0) * 1000,
+            }
+
+    def _requeue(self, job: DownloadJob):
+        """ Queues a stopped job again. """
+
+        job.state = 'queued'
+        job.queued_at = time.monotonic()
+        self._push(job)
+
+    @staticmethod
+    def _remove_part_file(job: DownloadJob):
+        """ Deletes the partial data of a cancelled job. """
+
+        destination = Path(job.destination)
+
+        try:
+            destination.with_name(destination.name + '.part').unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def _push(self, job: DownloadJob):
+        """ Adds a heap entry for the job, superseding any older one. """
+
+        sequence = next(self._sequence)
+        self._entries[job.job_id] = sequence
+        heapq.heappush(self._queues.setdefault(job.series, []), (-job.priority, sequence, job.job_id))
+
+    def _head(self, series: str):
+        """ Returns the first valid heap entry of a series, dropping stale ones. """
+
+        heap = self._queues[series]
+
+        while heap:
+            _, sequence, job_id = heap[0]
+
+            if self._entries.get(job_id) == sequence:
+                return heap[0]
+
+            heapq.heappop(heap)
+
+        return None
+
+    def _dispatch(self):
+        """ Starts queued jobs while there are free slots. """
+
+        while not self._paused and len(self._active) < self.max_active:
+            best = None
+
+            for series in list(self._queues):
+                head = self._head(series)
+
+                if head is None:
+                    del self._queues[series]
+                    continue
+
+                job = self.jobs[head[2]]
+
+                if self._active_hosts[job.host] >= self.max_per_host:
+                    # Another job of the series may use a free host, but
+                    # series are usually served by a single host
+                    continue
+
+                rank = (head[0], self._active_series[series], self._last_served.get(series, -1), head[1])
+
+                if best is None or rank < best[0]:
+                    best = (rank, series)
+
+            if best is None:
+                return
+
+            _, _, job_id = heapq.heappop(self._queues[best[1]])
+            del self._entries[job_id]
+            self._start(self.jobs[job_id])
+
+    def _start(self, job: DownloadJob):
+        """ Starts the transfer of a job. """
+
+        now = time.monotonic()
+        self.metrics.record_start(now - job.queued_at)
+
+        job.state = 'running'
+        job.started_at = now
+
+        self._active[job.job_id] = job
+        self._active_hosts[job.host] += 1
+        self._active_series[job.series] += 1
+        self._last_served[job.series] = next(self._sequence)
+
+        if job.download is None:
+            job.download = self.download_factory(
+                job.url, job.destination, self.segment_count, self.connections, quality=job.quality,
+                limiter=self.bandwidth, on_finished=lambda download, job=job: self._on_finished(job, download),
+                segments=job.segments
+            )
+
+            if self.journal is not None:
+                self.journal.track(str(job.destination), job.download, job.series)
+
+        job.download.start()
+
+    def _on_finished(self, job: DownloadJob, download):
+        """ Frees the slot of a job whose run ended, called from its thread. """
+
+        with self._lock:
+            if self._active.pop(job.job_id, None) is None:
+                return
+
+            self._active_hosts[job.host] -= 1
+            self._active_series[job.series] -= 1
+
+            if job.state == 'running':
+                job.state = download.state
+
+                if download.state == 'finished':
+                    self.metrics.finished += 1
+                elif download.state == 'failed':
+                    self.metrics.failed += 1
+
+            if job.resume_pending and job.state == 'paused':
+                self._requeue(job)
+
+            elif job.state == 'cancelled':
+                self._remove_part_file(job)
+
+            job.resume_pending = False
+            self._dispatch()
+
+
+_scheduler = None
+
+
+def get_scheduler() -> DownloadScheduler:
+    """
+    Returns the process-wide download scheduler, creating it on first use.
+
+    Limits come from the settings and follow their changes. Downloads
+    interrupted by the last exit are queued again right away.
+    """
+    global _scheduler
+
+    if _scheduler is None:
+        settings = get_settings()
+
+        _scheduler = DownloadScheduler(
+            max_active=settings['downloads.max_active'],
+            max_per_host=settings['downloads.max_per_host'],
+            bandwidth=settings['downloads.bandwidth'] * 1024,
+            connections=settings['downloads.connections'],
+            journal=get_journal(),
+        )
+        settings.changed.connect(_apply_setting)
+        _scheduler.restore()
+
+    return _scheduler
+
+
+def _apply_setting(key: str, value):
+    """ Applies a changed download setting to the running scheduler. """
+
+    if key == 'downloads.max_active':
+        _scheduler.set_limits(max_active=value)
+    elif key == 'downloads.max_per_host':
+        _scheduler.set_limits(max_per_host=value)
+    elif key == 'downloads.bandwidth':
+        _scheduler.set_bandwidth(value * 1024)
+    elif key == 'downloads.connections':
+        # Used by the next downloads to start
+        _scheduler.connections = value
@@ -0,0 +1,209 @@
+"""
+Local HTTP stand-in for the download servers.
+
+Serves a directory over HTTP/1.1 with keep-alive and byte-range
+support, optionally throttled per connection and delayed per request
+like a real CDN, so the download engine can be exercised and
+benchmarked without a network. write_hls_fixture() adds a synthetic
+HLS stream to the directory:
+
+    python -m Delta_Team.Smoke.Anime_Earth.Downloads.standin <directory> --port 8765 --rate 2000000 --hls
+"""
+
+import argparse
+import os
+import re
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Static file handler answering "Range: bytes=a-b" with 206 responses.
+
+    Class Attributes:
+        rate (int): Bytes per second allowed per connection, 0 for unlimited
+        ranges (bool): Whether range requests are honoured
+        latency (float): Seconds waited before answering each request
+    """
+
+    protocol_version = 'HTTP/1.1'
+    rate = 0
+    ranges = True
+    latency = 0.0
+
+    _RANGE = re.compile(r'bytes=(\d*)-(\d*)$')
+    _CHUNK = 64 * 1024
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+        path = self.translate_path(self.path)
+
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+
+        size = os.path.getsize(path)
+        start, end = 0, size - 1
+        match = self._RANGE.match(self.headers.get('Range', '')) if self.ranges else None
+
+        if match and (match.group(1) or match.group(2)):
+            if match.group(1):
+                start = int(match.group(1))
+                end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+            else:
+                start = max(0, size - int(match.group(2)))
+
+            if start > end:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        else:
+            self.send_response(200)
+
+        self.send_header('Accept-Ranges', 'bytes' if self.ranges else 'none')
+        self.send_header('Content-Type', self.guess_type(path))
+        self.send_header('Content-Length', str(end - start + 1))
+        self.end_headers()
+
+        with open(path, 'rb') as file:
+            file.seek(start)
+            self._send_body(file, end - start + 1)
+
+    def _send_body(self, file, remaining: int):
+        """ Writes the body, sleeping as needed to honour the rate limit. """
+
+        started = time.perf_counter()
+        sent = 0
+
+        while remaining > 0:
+            chunk = file.read(min(self._CHUNK, remaining))
+
+            if not chunk:
+                break
+
+            try:
+                self.wfile.write(chunk)
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+                return
+
+            sent += len(chunk)
+            remaining -= len(chunk)
+
+            if self.rate:
+                delay = sent / self.rate - (time.perf_counter() - started)
+
+                if delay > 0:
+                    time.sleep(delay)
+
+
+def write_hls_fixture(directory, segment_count: int = 60, segment_size: int = 256 * 1024,
+                      heights=(1080, 720, 480, 360), name: str = 'stream') -> str:
+    """
+    Writes a synthetic HLS stream: a master playlist and one media
+    playlist per height, each with its own numbered segment files.
+
+    Segment bytes encode their variant and index, so the order of a
+    concatenated download can be checked.
+
+    Args:
+        directory: Directory served by the stand-in
+        segment_count (int): Media segments per variant
+        segment_size (int): Bytes per media segment
+        heights (tuple): Variant heights, 1080 becomes 1920x1080
+        name (str): Folder of the stream inside the directory
+
+    Returns:
+        str: Path of the master playlist relative to the directory
+    """
+
+    root = os.path.join(os.fspath(directory), name)
+    master = ['#EXTM3U']
+
+    for height in heights:
+        variant_dir = os.path.join(root, f'{height}p')
+        os.makedirs(variant_dir, exist_ok=True)
+
+        media = ['#EXTM3U', '#EXT-X-VERSION:3', '#EXT-X-TARGETDURATION:4', '#EXT-X-PLAYLIST-TYPE:VOD']
+
+        for index in range(segment_count):
+            header = f'{height}p segment {index:06d}\n'.encode()
+
+            with open(os.path.join(variant_dir, f'{index:06d}.ts'), 'wb') as file:
+                file.write(header + bytes(max(0, segment_size - len(header))))
+
+            media += ['#EXTINF:4.0,', f'{index:06d}.ts']
+
+        media.append('#EXT-X-ENDLIST')
+
+        with open(os.path.join(variant_dir, 'index.m3u8'), 'w') as file:
+            file.write('\n'.join(media) + '\n')
+
+        master += [f'#EXT-X-STREAM-INF:BANDWIDTH={height * 4000},RESOLUTION={height * 16 // 9}x{height}',
+                   f'{height}p/index.m3u8']
+
+    with open(os.path.join(root, 'master.m3u8'), 'w') as file:
+        file.write('\n'.join(master) + '\n')
+
+    return f'{name}/master.m3u8'
+
+
+def serve(directory, port: int = 0, rate: int = 0, ranges: bool = True, latency: float = 0.0,
+          handler=RangeRequestHandler):
+    """
+    Starts a stand-in server in a daemon thread.
+
+    Args:
+        directory: Directory to serve
+        port (int): Port to listen on, 0 picks a free one
+        rate (int): Per connection bytes per second, 0 for unlimited
+        ranges (bool): Whether range requests are honoured
+        latency (float): Seconds waited before answering each request
+        handler: Request handler class
+
+    Returns:
+        ThreadingHTTPServer: The running server, stop it with shutdown()
+    """
+
+    handler_class = type(handler.__name__, (handler,), {'rate': rate, 'ranges': ranges, 'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', port), partial(handler_class, directory=os.fspath(directory)))
+    server.daemon_threads = True
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--rate', type=int, default=0, help='bytes per second per connection')
+    parser.add_argument('--no-ranges', action='store_true')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds per request')
+    parser.add_argument('--hls', action='store_true', help='write a synthetic HLS stream first')
+    arguments = parser.parse_args()
+
+    server = serve(arguments.directory, arguments.port, arguments.rate, not arguments.no_ranges, arguments.latency)
+    print(f'Serving {arguments.directory} on http://127.0.0.1:{server.server_address[1]}')
+
+    if arguments.hls:
+        print(f'HLS stream at http://127.0.0.1:{server.server_address[1]}/{write_hls_fixture(arguments.directory)}')
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,56 @@
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+
+class TitleCompletionModel(QAbstractListModel):
+    """
+    Completer model holding only the current suggestions.
+
+    Instead of copying the whole catalog into a QStringListModel and
+    letting QCompleter filter it, the suggestions are looked up in the
+    title index and pushed here, so the model never holds more than a
+    handful of rows. Use it with QCompleter.UnfilteredPopupCompletion.
+
+    Roles:
+        DisplayRole / EditRole: Title of the suggestion
+        UserRole: Catalog entry id of the suggestion
+    """
+
+    def __init__(self, parent=None):
+        """
+        Initialize an empty model.
+
+        Args:
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+
+        self._suggestions = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._suggestions)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        entry_id, title = self._suggestions[index.row()]
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return title
+
+        if role == Qt.ItemDataRole.UserRole:
+            return entry_id
+
+        return None
+
+    def set_suggestions(self, suggestions: list):
+        """
+        Replace the suggestions shown by the completer.
+
+        Args:
+            suggestions (list): (entry_id, title) tuples
+        """
+
+        self.beginResetModel()
+        self._suggestions = list(suggestions)
+        self.endResetModel()
@@ -0,0 +1,267 @@
+import asyncio
+import re
+from abc import ABC, abstractmethod
+import time
+from typing import NamedTuple
+
+from Delta_Team.Smoke.Anime_Earth.Search.index import TitleIndex, get_index_async, normalize
+
+
+class SearchResult(NamedTuple):
+    """ One search hit, ranked by score (1.0 is an exact match). """
+
+    score: float
+    entry_id: int
+    title: str
+
+
+class HandlerMetrics:
+    """
+    Timing counters of a search handler.
+
+    Attributes:
+        calls (int): Number of completed searches
+        total_time (float): Seconds spent in all searches
+        max_time (float): Slowest search in seconds
+        last_time (float): Duration of the latest search in seconds
+        last_first_batch (float): Seconds until the latest search produced its first batch
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time = 0.0
+        self.last_first_batch = 0.0
+
+    def record(self, duration: float, first_batch: float):
+        """ Adds one completed search. """
+
+        self.calls += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.last_time = duration
+        self.last_first_batch = first_batch
+
+    @property
+    def mean_time(self) -> float:
+        """ Average duration of a search in seconds. """
+
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def as_dict(self) -> dict:
+        """ Returns the counters as a dictionary, times in milliseconds. """
+
+        return {
+            'calls': self.calls,
+            'mean_ms': self.mean_time * 1000,
+            'max_ms': self.max_time * 1000,
+            'last_ms': self.last_time * 1000,
+            'last_first_batch_ms': self.last_first_batch * 1000,
+        }
+
+
+class SearchHandler(ABC):
+    """
+    Base class of the search strategies selectable in SearchWidget.
+
+    A handler is an async generator of result batches: cheap handlers
+    yield a single batch, streaming ones yield candidates as soon as
+    they are found so the user can start picking.
+
+    Class Attributes:
+        name (str): Mode identifier used by SearchWidget.get_handler_mode()
+        cost (int): Relative cost, 1 being the cheapest
+        streams (bool): Whether results arrive in several batches
+        sources (tuple): Index lookups the handler combines
+    """
+
+    name = ''
+    cost = 1
+    streams = False
+    sources = ()
+
+    def __init__(self):
+        self.metrics = HandlerMetrics()
+
+    @abstractmethod
+    async def search(self, search_term: str, is_exact: bool, limit: int = 50):
+        """
+        Yield batches of SearchResult for the search term.
+
+        Implemented as an async generator by every handler.
+
+        Args:
+            search_term (str): Query entered by the user
+            is_exact (bool): Whether only exact name matches are wanted
+            limit (int): Maximum number of results overall
+        """
+
+    async def run(self, search_term: str, is_exact: bool, limit: int = 50):
+        """
+        Run search() while recording timing metrics.
+
+        Yields the same batches as search().
+        """
+
+        start = time.perf_counter()
+        first_batch = None
+
+        try:
+            async for batch in self.search(search_term, is_exact, limit):
+                if first_batch is None:
+                    first_batch = time.perf_counter() - start
+
+                yield batch
+
+        finally:
+            duration = time.perf_counter() - start
+            self.metrics.record(duration, duration if first_batch is None else first_batch)
+
+
+_handlers = {}
+
+
+def register_handler(handler_class):
+    """ Class decorator registering a handler under its name. """
+
+    _handlers[handler_class.name] = handler_class()
+
+    return handler_class
+
+
+def get_handler(name: str) -> SearchHandler:
+    """ Returns the registered handler for a mode, falling back to the cheapest. """
+
+    return _handlers.get(name) or min(_handlers.values(), key=lambda handler: handler.cost)
+
+
+def get_handlers() -> dict:
+    """ Returns all registered handlers by name. """
+
+    return dict(_handlers)
+
+
+def _exact_results(index: TitleIndex, search_term: str) -> list:
+    """ Exact name matches as results. """
+
+    return [SearchResult(1.0, entry_id, title) for entry_id, title in index.exact(search_term)]
+
+
+@register_handler
+class SimpleHandler(SearchHandler):
+    """
+    Fast path: a single lookup in the title index.
+
+    Exact searches use the hash table, fuzzy ones the trigram index.
+    """
+
+    name = 'simple'
+    cost = 1
+    sources = ('exact', 'fuzzy')
+
+    async def search(self, search_term: str, is_exact: bool, limit: int = 50):
+        index = await get_index_async()
+
+        if is_exact:
+            yield _exact_results(index, search_term)[:limit]
+            return
+
+        yield [SearchResult(*hit) for hit in index.fuzzy(search_term, limit)]
+
+
+@register_handler
+class ComplexHandler(SearchHandler):
+    """
+    Thorough path: several index lookups merged and re-ranked.
+
+    Exact, prefix and a wide fuzzy lookup are combined. Prefix hits get
+    a bonus, and when the query names a season, titles of another season
+    are demoted.
+    """
+
+    name = 'complex'
+    cost = 3
+    sources = ('exact', 'prefix', 'fuzzy')
+
+    PREFIX_SCORE = 0.8
+    SEASON_PENALTY = 0.5
+
+    _SEASON = re.compile(r'\b(?:season|s)\s*(\d+)\b')
+
+    async def search(self, search_term: str, is_exact: bool, limit: int = 50):
+        index = await get_index_async()
+        scores = {}
+
+        for result in _exact_results(index, search_term):
+            scores[result.entry_id] = result.score
+
+        if not is_exact:
+            for entry_id, _ in index.prefix(search_term, limit):
+                scores[entry_id] = max(scores.get(entry_id, 0.0), self.PREFIX_SCORE)
+
+            for score, entry_id, _ in index.fuzzy(search_term, limit * 4, pool=limit * 8, scan_budget=100000):
+                scores[entry_id] = max(scores.get(entry_id, 0.0), score)
+
+        season = self._SEASON.search(normalize(search_term))
+
+        if season:
+            for entry_id in scores:
+                title_season = self._SEASON.search(normalize(index.titles[entry_id]))
+
+                if title_season is None or title_season.group(1) != season.group(1):
+                    scores[entry_id] *= self.SEASON_PENALTY
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], index.titles[item[0]]))
+
+        yield [SearchResult(score, entry_id, index.titles[entry_id]) for entry_id, score in ranked[:limit]]
+
+
+@register_handler
+class ChoiceHandler(SearchHandler):
+    """
+    Interactive path: candidates are streamed for the user to pick from.
+
+    Exact matches come first, then prefix matches, then fuzzy ones,
+    each as its own batch without entries already sent.
+    """
+
+    name = 'choice'
+    cost = 2
+    streams = True
+    sources = ('exact', 'prefix', 'fuzzy')
+
+    async def search(self, search_term: str, is_exact: bool, limit: int = 50):
+        index = await get_index_async()
+        sent = set()
+
+        def fresh(results):
+            batch = [result for result in results if result.entry_id not in sent][:limit - len(sent)]
+            sent.update(result.entry_id for result in batch)
+            return batch
+
+        batch = fresh(_exact_results(index, search_term))
+
+        if batch:
+            yield batch
+
+        if is_exact:
+            return
+
+        lookups = (
+            lambda: [SearchResult(ComplexHandler.PREFIX_SCORE, entry_id, title)
+                     for entry_id, title in index.prefix(search_term, limit)],
+            lambda: [SearchResult(*hit) for hit in index.fuzzy(search_term, limit)],
+        )
+
+        for lookup in lookups:
+            # Let the loop deliver the previous batch before the next lookup
+            await asyncio.sleep(0)
+
+            if len(sent) >= limit:
+                return
+
+            batch = fresh(lookup())
+
+            if batch:
+                yield batch
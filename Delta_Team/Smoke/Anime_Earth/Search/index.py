@@ -0,0 +1,446 @@
+import asyncio
+import json
+import os
+import re
+import struct
+import sys
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+
+from PySide6.QtCore import QStandardPaths
+
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+# Bumped whenever the persisted layout changes
+INDEX_VERSION = 3
+
+# Start of a persisted index, followed by the length of its JSON header
+_MAGIC = b'AEIDX\n'
+_HEADER_LENGTH = struct.Struct('<Q')
+
+
+def normalize(text: str) -> str:
+    """
+    Normalise a title for matching.
+
+    Case and accents are folded and every run of punctuation or
+    whitespace becomes a single space, so "Attack on Titan: Season 3"
+    and "attack on titan season 3" compare equal.
+    """
+
+    text = unicodedata.normalize('NFKD', text.casefold())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+
+    return _NON_ALNUM.sub(' ', text).strip()
+
+
+def trigrams(normalized: str) -> set:
+    """ Returns the set of padded trigrams of an already normalised string. """
+
+    padded = f' {normalized} '
+
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleIndex:
+    """
+    Trigram inverted index over a catalog of titles.
+
+    Every title and each of its alternative names is indexed under its
+    trigrams. Fuzzy lookups score names by the Jaccard similarity of
+    their trigram sets with the query and return the best entries.
+    Normalised names are also kept in a hash table for exact lookups
+    and in a sorted array for prefix lookups while the user types.
+
+    Features:
+        - Postings stored as compact unsigned int arrays
+        - Candidate generation from the rarest query trigrams only
+        - Exact re-scoring of a bounded candidate pool
+        - Exact match in O(1), prefix match in O(log n + limit)
+        - Persisted as a JSON header and raw arrays, reloaded without rebuilding
+
+    Attributes:
+        titles (list): Display title of each catalog entry
+    """
+
+    def __init__(self):
+        """ Initialize an empty index. """
+
+        self.titles = []
+
+        # Every indexed name (titles and alternative names), normalised
+        self._names = []
+        self._owners = array('I')
+
+        self._postings = {}
+        self._exact = {}
+
+        # Name ids ordered by name, built on the first prefix lookup
+        self._sorted_names = None
+        self._sorted_ids = None
+
+    def __len__(self):
+        return len(self.titles)
+
+    def add(self, title: str, alt_names=()) -> int:
+        """
+        Add a catalog entry to the index.
+
+        Args:
+            title (str): Display title of the entry
+            alt_names (iterable): Alternative names that should match as well
+
+        Returns:
+            int: Id of the new entry
+        """
+
+        entry_id = len(self.titles)
+        self.titles.append(title)
+
+        for name in (title, *alt_names):
+            normalized = normalize(name)
+
+            if not normalized:
+                continue
+
+            name_id = len(self._names)
+            grams = trigrams(normalized)
+
+            self._names.append(normalized)
+            self._owners.append(entry_id)
+            self._exact.setdefault(normalized, []).append(entry_id)
+
+            for gram in grams:
+                postings = self._postings.get(gram)
+
+                if postings is None:
+                    postings = self._postings[gram] = array('I')
+
+                postings.append(name_id)
+
+        self._sorted_names = None
+        self._sorted_ids = None
+
+        return entry_id
+
+    def exact(self, query: str) -> list:
+        """
+        Return the entries with a name equal to the query once normalised.
+
+        Returns:
+            list: (entry_id, title) tuples
+        """
+
+        entry_ids = self._exact.get(normalize(query), ())
+
+        return [(entry_id, self.titles[entry_id]) for entry_id in dict.fromkeys(entry_ids)]
+
+    def prefix(self, query: str, limit: int = 10) -> list:
+        """
+        Return entries with a name starting with the query, in name order.
+
+        A binary search finds the first matching name, so the cost only
+        depends on the limit and the logarithm of the catalog size.
+
+        Args:
+            query (str): Text typed so far
+            limit (int): Maximum number of results
+
+        Returns:
+            list: (entry_id, title) tuples
+        """
+
+        normalized = normalize(query)
+
+        if not normalized:
+            return []
+
+        self._ensure_sorted()
+
+        results = {}
+        position = bisect_left(self._sorted_names, normalized)
+
+        while position < len(self._sorted_names) and len(results) < limit:
+            if not self._sorted_names[position].startswith(normalized):
+                break
+
+            entry_id = self._owners[self._sorted_ids[position]]
+            results.setdefault(entry_id, self.titles[entry_id])
+            position += 1
+
+        return list(results.items())
+
+    def _ensure_sorted(self):
+        """ Builds the sorted name array used for prefix lookups. """
+
+        if self._sorted_names is not None:
+            return
+
+        order = sorted(range(len(self._names)), key=self._names.__getitem__)
+
+        self._sorted_names = [self._names[name_id] for name_id in order]
+        self._sorted_ids = array('I', order)
+
+    def fuzzy(self, query: str, limit: int = 10, threshold: float = 0.2, pool: int = 100,
+              scan_budget: int = 20000, min_lists: int = 4) -> list:
+        """
+        Return the entries whose names are most similar to the query.
+
+        Only the rarest query trigrams are scanned to collect candidates
+        (a name reaching the threshold must contain at least one of
+        them), the best candidates by partial overlap are then re-scored
+        exactly. The min_lists rarest lists are always scanned, whatever
+        their length, further lists only while the scanned postings stay
+        within scan_budget. The work thus grows with the lists the query
+        actually hits, which keeps recall on huge catalogs, while names
+        that only share very common trigrams with the query may be missed.
+
+        Args:
+            query (str): Free text typed by the user
+            limit (int): Maximum number of results
+            threshold (float): Minimum Jaccard similarity of a result
+            pool (int): Number of candidates re-scored exactly
+            scan_budget (int): Maximum number of postings scanned after the min_lists rarest lists
+            min_lists (int): Number of rarest trigram lists always scanned
+
+        Returns:
+            list: (score, entry_id, title) tuples, best first
+        """
+
+        normalized = normalize(query)
+
+        if not normalized:
+            return []
+
+        query_grams = trigrams(normalized)
+
+        lists = sorted(
+            (self._postings[gram] for gram in query_grams if gram in self._postings),
+            key=len
+        )
+
+        if not lists:
+            return []
+
+        # A name with Jaccard >= threshold shares at least this many trigrams
+        # with the query, so it appears in one of the len - overlap + 1 rarest
+        # lists. Common trigrams beyond the scan budget are left to re-scoring.
+        min_overlap = max(1, int(threshold * len(query_grams)))
+        required = max(1, len(lists) - min_overlap + 1)
+
+        counts = Counter()
+        scanned = 0
+
+        for position, postings in enumerate(lists[:required]):
+            if position >= min_lists and scanned + len(postings) > scan_budget:
+                break
+
+            counts.update(postings)
+            scanned += len(postings)
+
+        best = {}
+
+        for name_id, _ in counts.most_common(pool):
+            name_grams = trigrams(self._names[name_id])
+            overlap = len(query_grams & name_grams)
+            score = overlap / (len(query_grams) + len(name_grams) - overlap)
+
+            if score < threshold:
+                continue
+
+            # Keep the best matching name per entry
+            entry_id = self._owners[name_id]
+
+            if score > best.get(entry_id, 0.0):
+                best[entry_id] = score
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1], self.titles[item[0]]))
+
+        return [(score, entry_id, self.titles[entry_id]) for entry_id, score in ranked[:limit]]
+
+    def save(self, path):
+        """ Persist the index to a file, replacing it atomically. """
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_path = path.with_name(path.name + '.tmp')
+
+        # Persist the prefix order too, so loading never has to sort
+        self._ensure_sorted()
+
+        grams = list(self._postings)
+        header = json.dumps({
+            'version': INDEX_VERSION,
+            'byteorder': sys.byteorder,
+            'titles': self.titles,
+            'names': self._names,
+            'grams': grams,
+            'lengths': [len(self._postings[gram]) for gram in grams],
+        }, ensure_ascii=False).encode('utf-8')
+
+        try:
+            with open(temp_path, 'wb') as file:
+                file.write(_MAGIC)
+                file.write(_HEADER_LENGTH.pack(len(header)))
+                file.write(header)
+                self._owners.tofile(file)
+                self._sorted_ids.tofile(file)
+
+                for gram in grams:
+                    self._postings[gram].tofile(file)
+
+            os.replace(temp_path, path)
+
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an index saved with save().
+
+        Returns:
+            TitleIndex: The index, or None if the file is missing or outdated
+        """
+
+        try:
+            with open(path, 'rb') as file:
+                if file.read(len(_MAGIC)) != _MAGIC:
+                    return None
+
+                length, = _HEADER_LENGTH.unpack(file.read(_HEADER_LENGTH.size))
+                header = json.loads(file.read(length).decode('utf-8'))
+
+                if header.get('version') != INDEX_VERSION or header.get('byteorder') != sys.byteorder:
+                    return None
+
+                index = cls()
+                index.titles = header['titles']
+                index._names = header['names']
+                index._owners.fromfile(file, len(index._names))
+                index._sorted_ids = array('I')
+                index._sorted_ids.fromfile(file, len(index._names))
+
+                for gram, count in zip(header['grams'], header['lengths']):
+                    postings = index._postings[gram] = array('I')
+                    postings.fromfile(file, count)
+
+            # The lookup tables are derived from the names rather than stored
+            index._sorted_names = [index._names[name_id] for name_id in index._sorted_ids]
+
+            for name, entry_id in zip(index._names, index._owners):
+                index._exact.setdefault(name, []).append(entry_id)
+
+        # A truncated array raises EOFError, a corrupt header ValueError, KeyError and the like
+        except (OSError, EOFError, ValueError, KeyError, IndexError, TypeError, AttributeError, struct.error):
+            return None
+
+        return index
+
+    @classmethod
+    def from_catalog(cls, catalog_path):
+        """
+        Build an index from a catalog file.
+
+        The catalog is UTF-8 text with one entry per line: the display
+        title followed by optional tab separated alternative names.
+        """
+
+        index = cls()
+
+        with open(catalog_path, encoding='utf-8') as file:
+            for line in file:
+                title, *alt_names = line.rstrip('\n').split('\t')
+
+                if title:
+                    index.add(title, alt_names)
+
+        return index
+
+
+def get_catalog_path() -> Path:
+    """ Returns the catalog location, overridable with ANIME_EARTH_CATALOG. """
+
+    path = os.environ.get('ANIME_EARTH_CATALOG')
+
+    if path:
+        return Path(path)
+
+    data_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+
+    return Path(data_dir) / 'catalog.tsv'
+
+
+def load_index(catalog_path=None, index_path=None) -> TitleIndex:
+    """
+    Load the persisted title index, rebuilding it if the catalog changed.
+
+    Args:
+        catalog_path (optional): Catalog file, defaults to get_catalog_path()
+        index_path (optional): Index file, defaults to next to the catalog
+
+    Returns:
+        TitleIndex: The index, empty if there is no catalog
+    """
+
+    catalog_path = Path(catalog_path or get_catalog_path())
+    index_path = Path(index_path or catalog_path.with_suffix('.idx'))
+
+    try:
+        catalog_mtime = catalog_path.stat().st_mtime
+    except OSError:
+        return TitleIndex()
+
+    try:
+        if index_path.stat().st_mtime >= catalog_mtime:
+            index = TitleIndex.load(index_path)
+
+            if index is not None:
+                return index
+    except OSError:
+        pass
+
+    index = TitleIndex.from_catalog(catalog_path)
+    index.save(index_path)
+
+    return index
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> TitleIndex:
+    """
+    Returns the process-wide title index, loading it on first use.
+
+    Safe to call from the asyncio bridge and the GUI thread alike.
+    """
+    global _index
+
+    with _index_lock:
+        if _index is None:
+            _index = load_index()
+
+    return _index
+
+
+async def get_index_async() -> TitleIndex:
+    """
+    Returns the process-wide title index without blocking the event loop.
+
+    The first call loads or builds the index in the loop's default
+    executor, so the awaiting task can be cancelled and other tasks
+    keep running meanwhile.
+    """
+
+    if _index is not None:
+        return _index
+
+    return await asyncio.get_running_loop().run_in_executor(None, get_index)
@@ -0,0 +1,153 @@
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QRect
+from PySide6.QtGui import QPalette
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle
+
+
+class SearchResultsModel(QAbstractListModel):
+    """
+    List model of search results that grows in pages.
+
+    Results streamed in by a search handler are buffered in a plain
+    list. Only the first page is inserted right away; further pages are
+    exposed through canFetchMore()/fetchMore() as the view scrolls, so
+    a query with hundreds of thousands of hits never makes the view lay
+    out more rows than the user actually scrolled through.
+
+    Roles:
+        DisplayRole: Title of the result
+        UserRole: Catalog entry id
+        ScoreRole: Match score between 0 and 1
+    """
+
+    ScoreRole = Qt.ItemDataRole.UserRole + 1
+
+    PAGE_SIZE = 500
+
+    def __init__(self, parent=None):
+        """
+        Initialize an empty model.
+
+        Args:
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+
+        self._results = []
+        self._exposed = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._exposed
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._exposed:
+            return None
+
+        result = self._results[index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return result.title
+
+        if role == Qt.ItemDataRole.UserRole:
+            return result.entry_id
+
+        if role == self.ScoreRole:
+            return result.score
+
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._exposed < len(self._results)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+
+        self._expose(self._exposed + self.PAGE_SIZE)
+
+    def _expose(self, count: int):
+        """ Inserts buffered results into the model up to count rows. """
+
+        count = min(count, len(self._results))
+
+        if count <= self._exposed:
+            return
+
+        self.beginInsertRows(QModelIndex(), self._exposed, count - 1)
+        self._exposed = count
+        self.endInsertRows()
+
+    def append_results(self, batch: list):
+        """
+        Buffer a batch of results from a running search.
+
+        Rows are inserted immediately only while the first page is not
+        full yet, the rest waits for fetchMore().
+
+        Args:
+            batch (list): SearchResult tuples
+        """
+
+        self._results.extend(batch)
+
+        if self._exposed < self.PAGE_SIZE:
+            self._expose(self.PAGE_SIZE)
+
+    def clear(self):
+        """ Removes all results. """
+
+        self.beginResetModel()
+        self._results = []
+        self._exposed = 0
+        self.endResetModel()
+
+    def total_count(self) -> int:
+        """ Returns the number of results received, exposed or not. """
+
+        return len(self._results)
+
+
+class SearchResultDelegate(QStyledItemDelegate):
+    """
+    Paints a result row as its title with the match score on the right.
+
+    Every row has the same fixed height, which together with
+    QListView.setUniformItemSizes() lets the view skip measuring rows.
+    """
+
+    ROW_HEIGHT = 36
+    SCORE_WIDTH = 60
+    PADDING = 12
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        painter.save()
+
+        palette = option.palette
+
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, palette.color(QPalette.ColorRole.Highlight))
+            text_color = palette.color(QPalette.ColorRole.HighlightedText)
+        else:
+            if option.state & QStyle.StateFlag.State_MouseOver:
+                painter.fillRect(option.rect, palette.color(QPalette.ColorRole.AlternateBase))
+
+            text_color = palette.color(QPalette.ColorRole.Text)
+
+        rect = option.rect.adjusted(self.PADDING, 0, -self.PADDING, 0)
+        title_rect = QRect(rect.left(), rect.top(), rect.width() - self.SCORE_WIDTH, rect.height())
+        score_rect = QRect(rect.right() - self.SCORE_WIDTH, rect.top(), self.SCORE_WIDTH, rect.height())
+
+        title = option.fontMetrics.elidedText(
+            index.data(Qt.ItemDataRole.DisplayRole), Qt.TextElideMode.ElideRight, title_rect.width()
+        )
+        score = index.data(SearchResultsModel.ScoreRole)
+
+        painter.setPen(text_color)
+        painter.drawText(title_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, title)
+
+        painter.setPen(palette.color(QPalette.ColorRole.PlaceholderText))
+        painter.drawText(score_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignRight, f"{score:.0%}")
+
+        painter.restore()
@@ -0,0 +1,242 @@
+import hashlib
+import os
+from pathlib import Path
+
+from PySide6.QtCore import Qt, QFileInfo, QObject, QRunnable, QSize, QStandardPaths, QThreadPool, Signal, Slot
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+
+from Delta_Team.Images.image_finder import PixmapCache
+
+
+class _DecodeSignals(QObject):
+    """ Signals of a decode job, delivered queued to the GUI thread. """
+
+    decoded = Signal(object, object)
+
+
+class _DecodeJob(QRunnable):
+    """
+    Decodes one thumbnail in a pool thread.
+
+    The on-disk cache is tried first. Otherwise the source is decoded
+    straight to the target size with QImageReader.setScaledSize, so a
+    large cover is never fully decoded, and the result is written to
+    the disk cache for the next launch. The source is stat'ed for the
+    cache key here too, so a slow disk never blocks the GUI thread.
+    """
+
+    def __init__(self, key: tuple, source: str, target: QSize, cache_dir: Path, signals: _DecodeSignals):
+        super().__init__()
+
+        self.key = key
+        self.source = source
+        self.target = target
+        self.cache_dir = cache_dir
+        self.signals = signals
+
+    def run(self):
+        image = QImage()
+
+        # Whatever happens, the waiters of the key are released
+        try:
+            cache_path = self._cache_path()
+
+            if cache_path is not None and cache_path.exists():
+                image = QImageReader(str(cache_path)).read()
+
+            if image.isNull():
+                image = self._decode_scaled()
+
+                if not image.isNull() and cache_path is not None:
+                    self._write_cache(image, cache_path)
+
+        finally:
+            self.signals.decoded.emit(self.key, image)
+
+    @staticmethod
+    def _write_cache(image: QImage, cache_path: Path):
+        """ Stores a thumbnail in the disk cache, an unwritable cache only costs the next decode. """
+
+        temp_path = cache_path.with_name(cache_path.name + '.tmp')
+
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+            try:
+                if image.save(str(temp_path), 'PNG'):
+                    os.replace(temp_path, cache_path)
+            finally:
+                temp_path.unlink(missing_ok=True)
+
+        except OSError:
+            pass
+
+    def _cache_path(self):
+        """ Returns the disk cache file of the source at the target size, None if unknown. """
+
+        source, target = self.source, self.target
+
+        if source.startswith(':'):
+            # Bundled resource, changes along with the bundle's build time
+            info = QFileInfo(source)
+
+            if not info.exists():
+                return None
+
+            identity = f'{source}|{info.size()}|{info.lastModified().toMSecsSinceEpoch()}'
+        else:
+            try:
+                stat = os.stat(source)
+            except OSError:
+                return None
+
+            identity = f'{os.path.abspath(source)}|{stat.st_size}|{stat.st_mtime_ns}'
+
+        digest = hashlib.sha1(f'{identity}|{target.width()}x{target.height()}'.encode()).hexdigest()
+
+        return self.cache_dir / digest[:2] / f'{digest}.png'
+
+    def _decode_scaled(self) -> QImage:
+        """ Decodes the source directly at the size fitting the target. """
+
+        reader = QImageReader(self.source)
+        reader.setAutoTransform(True)
+
+        size = reader.size()
+
+        if size.isValid():
+            reader.setScaledSize(size.scaled(self.target, Qt.AspectRatioMode.KeepAspectRatio))
+
+        return reader.read()
+
+
+class ThumbnailService(QObject):
+    """
+    Asynchronous cover-art loader with a two-level cache.
+
+    Images are decoded off the GUI thread in a QThreadPool and handed
+    back as QImage; only the cheap QImage to QPixmap conversion happens
+    on the GUI thread. Converted pixmaps are kept in an in-memory LRU,
+    pre-scaled thumbnails are kept on disk between launches. Concurrent
+    requests for the same thumbnail share a single decode.
+
+    Signals:
+        thumbnail_ready (str, object): Emitted for every finished thumbnail
+                                       Args: (source, QPixmap)
+
+    Attributes:
+        memory_cache (PixmapCache): In-memory LRU of converted pixmaps
+        cache_dir (Path): Directory of the on-disk thumbnail cache
+        decodes (int): Number of decode jobs started
+        coalesced (int): Number of requests served by a decode already running
+    """
+
+    thumbnail_ready = Signal(str, object)
+
+    def __init__(self, cache_dir=None, max_bytes: int = 32 * 1024 * 1024, max_threads: int = 2, parent=None):
+        """
+        Initialize the service.
+
+        Args:
+            cache_dir (optional): On-disk cache directory, defaults to the app cache location
+            max_bytes (int): Memory budget of the in-memory cache
+            max_threads (int): Number of decoder threads
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+
+        if cache_dir is None:
+            cache_root = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+            cache_dir = Path(cache_root) / 'thumbnails'
+
+        self.cache_dir = Path(cache_dir)
+        self.memory_cache = PixmapCache(max_bytes)
+        self.decodes = 0
+        self.coalesced = 0
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+
+        self._pending = {}
+
+        self._signals = _DecodeSignals()
+        self._signals.decoded.connect(self._on_decoded)
+
+    def request(self, source: str, size: QSize, dpr: float = 1.0, callback=None) -> QPixmap:
+        """
+        Request a thumbnail of a local image file.
+
+        Args:
+            source (str): Path of the full size image
+            size (QSize): Logical size the thumbnail must fit into
+            dpr (float): Device pixel ratio of the target screen
+            callback (callable, optional): Called in the GUI thread with the pixmap
+                                           once decoded (not called on a cache hit)
+
+        Returns:
+            QPixmap: The cached thumbnail, or None if it is being decoded
+        """
+
+        key = (source, size.width(), size.height(), dpr)
+
+        pixmap = self.memory_cache.get(key)
+
+        if pixmap is not None:
+            return pixmap
+
+        waiters = self._pending.get(key)
+
+        if waiters is not None:
+            self.coalesced += 1
+            waiters.append(callback)
+            return None
+
+        self._pending[key] = [callback]
+        self.decodes += 1
+
+        target = size * dpr
+        self._pool.start(_DecodeJob(key, source, target, self.cache_dir, self._signals))
+
+        return None
+
+    @Slot(object, object)
+    def _on_decoded(self, key: tuple, image: QImage):
+        """
+        Convert a decoded image and notify everybody waiting for it.
+
+        Args:
+            key (tuple): (source, width, height, dpr)
+            image (QImage): Decoded thumbnail, null on failure
+        """
+
+        source, _, _, dpr = key
+
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+
+        if not pixmap.isNull():
+            self.memory_cache.put(key, pixmap)
+
+        for callback in self._pending.pop(key, ()):
+            if callback is not None:
+                callback(pixmap)
+
+        self.thumbnail_ready.emit(source, pixmap)
+
+    def wait_for_done(self, timeout_ms: int = -1) -> bool:
+        """ Blocks until all decode jobs finished, mainly for shutdown. """
+
+        return self._pool.waitForDone(timeout_ms)
+
+
+_service = None
+
+
+def get_thumbnail_service() -> ThumbnailService:
+    """ Returns the process-wide thumbnail service, creating it on first use. """
+    global _service
+
+    if _service is None:
+        _service = ThumbnailService()
+
+    return _service
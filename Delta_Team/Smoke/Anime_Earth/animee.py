@@ -1,12 +1,48 @@
-from PySide6.QtWidgets import QApplication
+import sys
 
-from Delta_Team.Smoke.Anime_Earth.windows import MainWindow
+from Delta_Team.Smoke.Defaults.Tracing.tracing import get_tracer
 
-# QT API
-App = QApplication()
+# Name the settings, journal, index and caches are stored under
+ORGANIZATION_NAME = 'Delta_Team'
+APPLICATION_NAME = 'Anime Earth'
 
-window = MainWindow()
-window.show()
-App.exec()
 
+def main() -> int:
+    """
+    Starts Anime Earth.
 
+    With SMOKE_TRACE set to a file name, the start-up is written there
+    as a Chrome trace, including the import time of every module.
+    """
+
+    tracer = get_tracer()
+    tracer.trace_imports()
+
+    with tracer.span('import Qt'):
+        from PySide6.QtWidgets import QApplication
+
+    # Before anything asks QStandardPaths for a data folder, which is
+    # otherwise named after however the process was launched
+    QApplication.setOrganizationName(ORGANIZATION_NAME)
+    QApplication.setApplicationName(APPLICATION_NAME)
+
+    # QT API
+    with tracer.span('QApplication'):
+        app = QApplication(sys.argv)
+
+    with tracer.span('import windows'):
+        from Delta_Team.Smoke.Anime_Earth.windows import MainWindow
+
+    with tracer.span('MainWindow'):
+        window = MainWindow()
+
+    tracer.watch_first_paint(window)
+
+    with tracer.span('show'):
+        window.show()
+
+    return app.exec()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
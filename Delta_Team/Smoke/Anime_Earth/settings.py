@@ -0,0 +1,62 @@
+import os
+from pathlib import Path
+
+from PySide6.QtCore import QCoreApplication, QStandardPaths
+
+from Delta_Team.Smoke.Anime_Earth.Downloads.options import QUALITIES
+from Delta_Team.Smoke.Defaults.Settings.settings import Setting, SettingsStore
+from Delta_Team.Smoke.Defaults.Themes.themes import THEMES
+
+# Every persisted preference, in the order the settings view shows them
+SCHEMA = (
+    Setting('downloads.folder', '', 'Download folder (empty for the default)'),
+    Setting('downloads.quality', '720p', 'Preferred quality', choices=QUALITIES),
+    Setting('downloads.language', 'subbed', 'Preferred language', choices=('dubbed', 'subbed', 'chinese')),
+    Setting('downloads.default_folder_name', True, 'Name folders as on the website'),
+    Setting('downloads.max_active', 4, 'Simultaneous downloads', minimum=1, maximum=16),
+    Setting('downloads.max_per_host', 2, 'Simultaneous downloads per server', minimum=1, maximum=16),
+    Setting('downloads.connections', 4, 'Connections per download', minimum=1, maximum=16),
+    Setting('downloads.bandwidth', 0, 'Bandwidth limit in KB/s (0 for none)', maximum=1_000_000),
+    Setting('appearance.theme', 'dark', 'Theme', choices=tuple(THEMES)),
+    Setting('search.suggestions', True, 'Suggest titles while typing'),
+)
+
+GROUP_TITLES = {
+    'downloads': 'Downloads',
+    'appearance': 'Appearance',
+    'search': 'Search',
+}
+
+
+def get_settings_path() -> Path:
+    """ Returns the settings file, overridable with ANIME_EARTH_SETTINGS. """
+
+    path = os.environ.get('ANIME_EARTH_SETTINGS')
+
+    if path:
+        return Path(path)
+
+    data_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+
+    return Path(data_dir) / 'settings.json'
+
+
+_settings = None
+
+
+def get_settings() -> SettingsStore:
+    """
+    Returns the application settings, loading them on first use.
+
+    Pending changes are saved when the application quits.
+    """
+    global _settings
+
+    if _settings is None:
+        _settings = SettingsStore(SCHEMA, get_settings_path())
+        app = QCoreApplication.instance()
+
+        if app is not None:
+            app.aboutToQuit.connect(_settings.close)
+
+    return _settings
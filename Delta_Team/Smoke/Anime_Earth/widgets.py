@@ -1,9 +1,21 @@
-from PySide6.QtWidgets import (QWidget, QGridLayout, QLabel, QRadioButton, QPushButton,
-                               QGroupBox, QHBoxLayout, QVBoxLayout, QLineEdit, QScrollArea, QFrame)
-from PySide6.QtGui import QPixmap
-from PySide6.QtCore import Qt, Signal
+from functools import partial
+
+from PySide6.QtWidgets import (QWidget, QGridLayout, QLabel, QRadioButton, QPushButton, QCompleter,
+                               QGroupBox, QHBoxLayout, QVBoxLayout, QLineEdit, QScrollArea, QFrame, QListView)
+from PySide6.QtCore import Qt, QSize, QTimer, Signal, Slot
+from PySide6.QtGui import QImageReader
+from shiboken6 import isValid
 
 from Delta_Team.Images.image_finder import get_image
+from Delta_Team.Smoke.Anime_Earth.Downloads.options import DownloadOptions
+from Delta_Team.Smoke.Anime_Earth.Downloads.ranges import EpisodeSelection, RangeSyntaxError, parse_episode_ranges
+from Delta_Team.Smoke.Anime_Earth.Search.completion import TitleCompletionModel
+from Delta_Team.Smoke.Anime_Earth.Search.index import get_index_async
+from Delta_Team.Smoke.Anime_Earth.Search.results import SearchResultsModel, SearchResultDelegate
+from Delta_Team.Smoke.Anime_Earth.Search.thumbnails import get_thumbnail_service
+from Delta_Team.Smoke.Anime_Earth.settings import GROUP_TITLES, get_settings
+from Delta_Team.Smoke.Defaults.Loops.loops import get_bridge
+from Delta_Team.Smoke.Defaults.Settings.settings import SettingsForm
 
 
 class StartupWidget(QWidget):
@@ -41,28 +53,8 @@ class StartupWidget(QWidget):
 
         super().__init__(parent)
 
-        # Configure widget appearance
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #1e1e1e;
-            }
-            QPushButton {
-                background-color: #0d7377;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 20px 40px;
-                font-size: 16px;
-                font-weight: bold;
-                min-width: 200px;
-            }
-            QPushButton:hover {
-                background-color: #14a085;
-            }
-            QPushButton:pressed {
-                background-color: #0a5f62;
-            }
-        """)
+        # Styled by the application theme
+        self.setObjectName('StartupWidget')
 
         # Main layout
         self.main_layout = QVBoxLayout()
@@ -72,12 +64,12 @@ class StartupWidget(QWidget):
         # Add top spacer for vertical centering
         self.main_layout.addStretch(1)
 
-        self.set_central_label(icon=get_image('Cyber-Smoke077.png'))
+        self.set_central_label(icon='Cyber-Smoke077.png')
 
         # Title label
         title_label = QLabel("Choose Your Destiny")
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title_label.setStyleSheet("font-size: 20px; color: #ffffff; margin: 20px;")
+        title_label.setProperty('role', 'title')
         self.main_layout.addWidget(title_label)
 
         # Buttons section
@@ -103,7 +95,13 @@ class StartupWidget(QWidget):
         self.setLayout(self.main_layout)
 
     def set_central_label(self, icon: str = None, default_text: str = 'ANIME EARTH'):
-        """ Sets an image or text as the central label. """
+        """
+        Sets an image (by name in the Images directory) or text as the central label.
+
+        The image is decoded off the GUI thread and cached on disk at
+        its display size, the label keeps its space until it arrives so
+        the first frame doesn't wait for the decode.
+        """
 
         # Logo section
         logo_container = QWidget()
@@ -111,27 +109,49 @@ class StartupWidget(QWidget):
         logo_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         animee_label = QLabel()
+        animee_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        logo_layout.addWidget(animee_label)
+
+        self.main_layout.addWidget(logo_container)
 
-        pixmap = QPixmap(icon)
+        if icon is None:
+            self._show_logo(animee_label, default_text, None)
+            return
 
-        # Handle if there is a valid image
-        if not pixmap.isNull():
-            # Scale logo responsively
-            scaled_pixmap = pixmap.scaled(
-                400, 400, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
-            )
-            animee_label.setPixmap(scaled_pixmap)
+        target = QSize(400, 400)
+        source = get_image(icon)
+        pixmap = get_thumbnail_service().request(
+            source, target, self.devicePixelRatioF(),
+            callback=partial(self._show_logo, animee_label, default_text)
+        )
 
+        if pixmap is not None:
+            self._show_logo(animee_label, default_text, pixmap)
         else:
-            animee_label.setText(default_text)
+            # Reading the header is enough to reserve the final size
+            size = QImageReader(source).size()
 
-            animee_label.setStyleSheet("font-size: 48px; color: #0d7377; font-weight: bold;")
+            if size.isValid():
+                animee_label.setMinimumSize(size.scaled(target, Qt.AspectRatioMode.KeepAspectRatio))
 
-        animee_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        logo_layout.addWidget(animee_label)
+    @staticmethod
+    def _show_logo(label: QLabel, default_text: str, pixmap):
+        """ Shows the decoded logo, or the text if there is no valid image. """
 
-        self.main_layout.addWidget(logo_container)
+        # The view may have been deleted while the logo was decoding
+        if not isValid(label):
+            return
 
+        # Handle if there is a valid image
+        if pixmap is not None and not pixmap.isNull():
+            label.setPixmap(pixmap)
+
+        else:
+            label.setText(default_text)
+
+            label.setProperty('role', 'logo')
+            label.style().unpolish(label)
+            label.style().polish(label)
 
 
 class OptionsWidget(QWidget):
@@ -145,16 +165,19 @@ class OptionsWidget(QWidget):
     Features:
         - Quality selection (1080p, 720p, 480p, 360p)
         - Language options (Dubbed, Subbed, Chinese)
-        - Episode range or full download
+        - Episode range or full download, ranges typed as "1-12, 15, 20-"
         - Custom folder naming toggle
         - Scrollable interface for smaller screens
         - Organized into logical groups
+        - Quality, language and folder naming remembered in the settings
 
     Methods:
         get_selected_quality(): Returns selected quality string
         get_selected_language(): Returns selected language string
         get_episode_mode(): Returns episode download mode
+        get_episode_selection(): Returns the parsed episode ranges
         use_default_folder_name(): Returns boolean for folder naming preference
+        get_download_options(): Returns all selections for the download engine
     """
 
     def __init__(self, parent=None):
@@ -178,54 +201,13 @@ class OptionsWidget(QWidget):
         # Container widget for scroll area
         container = QWidget()
 
-        # Configure styling
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #1e1e1e;
-                color: #ffffff;
-            }
-            QGroupBox {
-                background-color: #2b2b2b;
-                border: 2px solid #3d3d3d;
-                border-radius: 8px;
-                margin-top: 12px;
-                padding: 15px;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top center;
-                padding: 0 10px;
-                color: #0d7377;
-            }
-            QRadioButton {
-                spacing: 8px;
-                padding: 5px;
-            }
-            QRadioButton::indicator {
-                width: 18px;
-                height: 18px;
-            }
-            QRadioButton::indicator:unchecked {
-                border: 2px solid #5d5d5d;
-                border-radius: 9px;
-                background-color: #2b2b2b;
-            }
-            QRadioButton::indicator:checked {
-                border: 2px solid #0d7377;
-                border-radius: 9px;
-                background-color: #0d7377;
-            }
-            QRadioButton:hover {
-                color: #14a085;
-            }
-        """)
+        # Styled by the application theme
+        self.setObjectName('OptionsWidget')
 
         # Title
         title = QLabel("Download Options")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title.setStyleSheet("font-size: 24px; font-weight: bold; margin: 20px; color: #ffffff;")
+        title.setProperty('role', 'title')
 
         # QUALITY OPTIONS
         quality_group = QGroupBox("Video Quality")
@@ -261,16 +243,29 @@ class OptionsWidget(QWidget):
         self.download_all.setChecked(True)
         self.range_selector = QRadioButton("Download Specific Range")
 
+        # Typed ranges instead of one checkbox per episode, long series stay cheap
+        self.range_input = QLineEdit()
+        self.range_input.setPlaceholderText("e.g. 1-12, 15, 20- or S2: 1-5")
+        self.range_input.setEnabled(False)
+        self.range_input.textChanged.connect(self._validate_ranges)
+        self.range_selector.toggled.connect(self.range_input.setEnabled)
+
+        self.range_hint = QLabel()
+        self.range_hint.setWordWrap(True)
+        self.range_hint.setProperty('role', 'hint')
+
         episodes_layout = QVBoxLayout()
         episodes_layout.addWidget(self.download_all)
         episodes_layout.addWidget(self.range_selector)
+        episodes_layout.addWidget(self.range_input)
+        episodes_layout.addWidget(self.range_hint)
         episodes_group.setLayout(episodes_layout)
 
         # FOLDER NAME OPTIONS
         folder_group = QGroupBox("Folder Naming")
         folder_label = QLabel("Use the default folder name as shown on the website?")
         folder_label.setWordWrap(True)
-        folder_label.setStyleSheet("color: #cccccc; font-weight: normal; margin-bottom: 10px;")
+        folder_label.setProperty('role', 'note')
         self.folder_yes = QRadioButton("Yes - Use default name")
         self.folder_yes.setChecked(True)
         self.folder_no = QRadioButton("No - I'll specify a custom name")
@@ -308,6 +303,38 @@ class OptionsWidget(QWidget):
         final_layout.addWidget(scroll)
         self.setLayout(final_layout)
 
+        # Preferences survive restarts through the settings store
+        self.settings = get_settings()
+        self._quality_buttons = {'1080p': self.q1, '720p': self.q2, '480p': self.q3, '360p': self.q4}
+        self._language_buttons = {'dubbed': self.dubbed, 'subbed': self.subbed, 'chinese': self.chinese}
+
+        for key in ('downloads.quality', 'downloads.language', 'downloads.default_folder_name'):
+            self._show_setting(key, self.settings[key])
+
+        for quality, button in self._quality_buttons.items():
+            button.toggled.connect(partial(self._store_choice, 'downloads.quality', quality))
+
+        for language, button in self._language_buttons.items():
+            button.toggled.connect(partial(self._store_choice, 'downloads.language', language))
+
+        self.folder_yes.toggled.connect(partial(self.settings.set, 'downloads.default_folder_name'))
+        self.settings.changed.connect(self._show_setting)
+
+    def _store_choice(self, key: str, value: str, checked: bool):
+        """Remember the option of a radio button once it is checked."""
+        if checked:
+            self.settings.set(key, value)
+
+    @Slot(str, object)
+    def _show_setting(self, key: str, value):
+        """Check the radio button of a preference, also when changed in the settings view."""
+        if key == 'downloads.quality':
+            self._quality_buttons[value].setChecked(True)
+        elif key == 'downloads.language':
+            self._language_buttons[value].setChecked(True)
+        elif key == 'downloads.default_folder_name':
+            (self.folder_yes if value else self.folder_no).setChecked(True)
+
     def get_selected_quality(self) -> str:
         """Get the currently selected video quality."""
         if self.q1.isChecked():
@@ -332,10 +359,36 @@ class OptionsWidget(QWidget):
         """Get the episode download mode (all or range)."""
         return "all" if self.download_all.isChecked() else "range"
 
+    def get_episode_selection(self) -> EpisodeSelection:
+        """Get the selected episodes, raising RangeSyntaxError for malformed ranges."""
+        return self.get_download_options().episode_selection()
+
+    @Slot(str)
+    def _validate_ranges(self, text: str):
+        """Show how the typed ranges are understood, or what is wrong with them."""
+        if not text.strip():
+            self.range_hint.clear()
+            return
+
+        try:
+            self.range_hint.setText(f"Selected: {parse_episode_ranges(text)}")
+        except RangeSyntaxError as error:
+            self.range_hint.setText(str(error))
+
     def use_default_folder_name(self) -> bool:
         """Check if user wants to use default folder naming."""
         return self.folder_yes.isChecked()
 
+    def get_download_options(self) -> DownloadOptions:
+        """Get every selection as the options consumed by the download engine."""
+        return DownloadOptions(
+            quality=self.get_selected_quality(),
+            language=self.get_selected_language(),
+            episode_mode=self.get_episode_mode(),
+            default_folder_name=self.use_default_folder_name(),
+            episode_ranges=self.range_input.text(),
+        )
+
 
 class SearchWidget(QWidget):
     """
@@ -355,6 +408,7 @@ class SearchWidget(QWidget):
         - Multiple handler modes (Simple, Complex, Choice)
         - Clean, modern search interface
         - Real-time validation feedback
+        - Debounced live title suggestions while typing
 
     Handler Modes:
         - Simple: Basic search algorithm (fastest)
@@ -364,6 +418,10 @@ class SearchWidget(QWidget):
 
     search_requested = Signal(str, bool, str)
 
+    # Quiet time after the last keystroke before suggestions are looked up
+    SUGGEST_DELAY_MS = 150
+    SUGGEST_LIMIT = 10
+
     def __init__(self, parent=None):
         """
         Initialize the search widget.
@@ -376,76 +434,8 @@ class SearchWidget(QWidget):
         """
         super().__init__(parent)
 
-        # Configure styling
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #1e1e1e;
-                color: #ffffff;
-            }
-            QLineEdit {
-                background-color: #2b2b2b;
-                border: 2px solid #3d3d3d;
-                border-radius: 6px;
-                padding: 12px;
-                font-size: 14px;
-                color: #ffffff;
-            }
-            QLineEdit:focus {
-                border: 2px solid #0d7377;
-            }
-            QGroupBox {
-                background-color: #2b2b2b;
-                border: 2px solid #3d3d3d;
-                border-radius: 8px;
-                margin-top: 12px;
-                padding: 15px;
-                font-weight: bold;
-                font-size: 13px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0 10px;
-                color: #0d7377;
-            }
-            QRadioButton {
-                spacing: 8px;
-                padding: 8px;
-            }
-            QRadioButton::indicator {
-                width: 18px;
-                height: 18px;
-            }
-            QRadioButton::indicator:unchecked {
-                border: 2px solid #5d5d5d;
-                border-radius: 9px;
-                background-color: #2b2b2b;
-            }
-            QRadioButton::indicator:checked {
-                border: 2px solid #0d7377;
-                border-radius: 9px;
-                background-color: #0d7377;
-            }
-            QPushButton {
-                background-color: #0d7377;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 15px 40px;
-                font-size: 15px;
-                font-weight: bold;
-                min-height: 50px;
-            }
-            QPushButton:hover {
-                background-color: #14a085;
-            }
-            QPushButton:pressed {
-                background-color: #0a5f62;
-            }
-            QLabel {
-                color: #cccccc;
-            }
-        """)
+        # Styled by the application theme
+        self.setObjectName('SearchWidget')
 
         # Main layout
         main_layout = QVBoxLayout()
@@ -455,7 +445,7 @@ class SearchWidget(QWidget):
         # Title
         title = QLabel("Search for Content")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title.setStyleSheet("font-size: 26px; font-weight: bold; color: #ffffff; margin-bottom: 10px;")
+        title.setProperty('role', 'title')
         main_layout.addWidget(title)
 
         # Search input section
@@ -464,12 +454,26 @@ class SearchWidget(QWidget):
         search_layout.setSpacing(10)
 
         name_label = QLabel("Enter the name of the anime or animation:")
-        name_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        name_label.setProperty('role', 'heading')
 
         self.edit_name = QLineEdit()
         self.edit_name.setPlaceholderText("e.g., Attack on Titan Season 3, Demon Slayer...")
         self.edit_name.returnPressed.connect(self._perform_search)
 
+        # Live suggestions, looked up in the title index after typing pauses
+        self.completion_model = TitleCompletionModel(self)
+        self.completer = QCompleter(self.completion_model, self)
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.edit_name.setCompleter(self.completer)
+
+        self._suggest_timer = QTimer(self)
+        self._suggest_timer.setSingleShot(True)
+        self._suggest_timer.setInterval(self.SUGGEST_DELAY_MS)
+        self._suggest_timer.timeout.connect(self._request_suggestions)
+
+        # Only user edits, not text set by picking a suggestion
+        self.edit_name.textEdited.connect(self._suggest_timer.start)
+
         search_layout.addWidget(name_label)
         search_layout.addWidget(self.edit_name)
         main_layout.addWidget(search_section)
@@ -483,7 +487,7 @@ class SearchWidget(QWidget):
         exact_group = QGroupBox("Name Matching")
         exact_info = QLabel("Is the name exact?\n(Season and all, word for word)")
         exact_info.setWordWrap(True)
-        exact_info.setStyleSheet("color: #999999; font-weight: normal; font-size: 12px;")
+        exact_info.setProperty('role', 'hint')
 
         self.exact_yes = QRadioButton("Yes - Exact match")
         self.exact_no = QRadioButton("No - Fuzzy search")
@@ -499,7 +503,7 @@ class SearchWidget(QWidget):
         # HANDLER OPTIONS
         handler_group = QGroupBox("Search Handler")
         handler_info = QLabel("Choose search algorithm:")
-        handler_info.setStyleSheet("color: #999999; font-weight: normal; font-size: 12px;")
+        handler_info.setProperty('role', 'hint')
 
         self.handler_simple = QRadioButton("Simple (Fast)")
         self.handler_simple.setChecked(True)
@@ -552,6 +556,51 @@ class SearchWidget(QWidget):
 
         self.search_requested.emit(search_term, is_exact, handler)
 
+    @Slot()
+    def _request_suggestions(self):
+        """
+        Look up suggestions for the current text on the asyncio bridge.
+
+        Lookups run under a single key, so a lookup still waiting (for
+        example on the index being loaded in the executor) is cancelled
+        by the next one.
+        """
+        search_term = self.get_search_term()
+
+        if len(search_term) < 2 or not get_settings()['search.suggestions']:
+            self.completion_model.set_suggestions([])
+            return
+
+        get_bridge().submit(
+            self._lookup_suggestions(search_term),
+            on_result=partial(self._show_suggestions, search_term),
+            key='suggestions'
+        )
+
+    async def _lookup_suggestions(self, search_term: str) -> list:
+        """ Prefix lookup in the shared title index. """
+
+        index = await get_index_async()
+
+        return index.prefix(search_term, self.SUGGEST_LIMIT)
+
+    def _show_suggestions(self, search_term: str, suggestions: list):
+        """
+        Show the suggestions if they still match what is typed.
+
+        Args:
+            search_term (str): Text the suggestions were looked up for
+            suggestions (list): (entry_id, title) tuples
+        """
+
+        if search_term != self.get_search_term():
+            return
+
+        self.completion_model.set_suggestions(suggestions)
+
+        if suggestions and self.edit_name.hasFocus():
+            self.completer.complete()
+
     def get_search_term(self) -> str:
         """Get the current search term from input field."""
         return self.edit_name.text().strip()
@@ -570,54 +619,153 @@ class SearchWidget(QWidget):
             return "choice"
 
 
+class ResultsWidget(QWidget):
+    """
+    Search results page.
+
+    Shows the results of the latest search in a virtualised list: rows
+    are painted by a delegate at a fixed height and are only inserted
+    into the model page by page while the user scrolls, so the page
+    stays responsive with hundreds of thousands of results.
+
+    Signals:
+        result_selected (int, str): Emitted when a result is activated
+                                   Args: (entry_id, title)
+
+    Features:
+        - QListView with uniform item sizes and batched layout
+        - Results stream in while the handler is still searching
+        - Summary line with result count and search time
+    """
+
+    result_selected = Signal(int, str)
+
+    # Results requested from a handler, the view pages through them as the user scrolls
+    MAX_RESULTS = 100_000
+
+    def __init__(self, parent=None):
+        """
+        Initialize the results widget.
+
+        Creates the summary labels and the result list with its
+        model and delegate.
+
+        Args:
+            parent: Parent widget
+        """
+        super().__init__(parent)
+
+        # Styled by the application theme
+        self.setObjectName('ResultsWidget')
+
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(40, 40, 40, 40)
+        main_layout.setSpacing(15)
+
+        # Title
+        self.title = QLabel("Search Results")
+        self.title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.title.setProperty('role', 'title')
+        main_layout.addWidget(self.title)
+
+        self.summary = QLabel()
+        self.summary.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.summary.setProperty('role', 'hint')
+        main_layout.addWidget(self.summary)
+
+        # Result list, only visible rows are ever laid out and painted
+        self.model = SearchResultsModel(self)
+
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(SearchResultDelegate(self.list_view))
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.list_view.setBatchSize(SearchResultsModel.PAGE_SIZE)
+        self.list_view.setMouseTracking(True)
+        self.list_view.activated.connect(self._on_activated)
+        main_layout.addWidget(self.list_view)
+
+        self.setLayout(main_layout)
+
+    def start_search(self, search_term: str):
+        """ Clears the previous results before a new search. """
+
+        self.model.clear()
+        self.title.setText(f"Results for '{search_term}'")
+        self.summary.setText("Searching...")
+
+    def add_results(self, batch: list):
+        """ Appends a batch of results streamed by the search handler. """
+
+        self.model.append_results(batch)
+        self.summary.setText(f"{self.model.total_count()} results so far...")
+
+    def finish_search(self, elapsed_ms: float = 0.0, error: str = None):
+        """
+        Shows the final result count and search time.
+
+        Args:
+            elapsed_ms (float): Duration of the search
+            error (str, optional): Message shown instead when the search failed
+        """
+
+        if error is not None:
+            self.summary.setText(error)
+            return
+
+        self.summary.setText(f"{self.model.total_count()} results in {elapsed_ms:.0f} ms")
+
+    def _on_activated(self, index):
+        """ Emits result_selected for the activated row. """
+
+        self.result_selected.emit(
+            index.data(Qt.ItemDataRole.UserRole), index.data(Qt.ItemDataRole.DisplayRole)
+        )
+
+
 class SettingsWidget(QWidget):
     """
     Application settings and preferences widget.
 
-    Placeholder widget for future settings functionality such as:
-    - Download directory configuration
-    - Theme selection
-    - Network settings
-    - Notification preferences
+    The editors are generated from the settings schema, one group box
+    per group (downloads, appearance, search). Every change is applied
+    at once and saved in the background by the settings store.
 
-    This widget can be expanded as needed with additional
-    configuration options.
+    Attributes:
+        form (SettingsForm): Generated editors
     """
 
     def __init__(self, parent=None):
         """
         Initialize the settings widget.
 
-        Displays a placeholder message indicating
-        this feature is under development.
+        Builds the editors of every setting inside a scroll area.
 
         Args:
             parent: Parent widget
         """
         super().__init__(parent)
 
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #1e1e1e;
-                color: #ffffff;
-            }
-            QLabel {
-                color: #cccccc;
-            }
-        """)
-
-        layout = QVBoxLayout()
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        # Styled by the application theme
+        self.setObjectName('SettingsWidget')
 
         title = QLabel("Settings")
-        title.setStyleSheet("font-size: 28px; font-weight: bold; color: #ffffff;")
+        title.setProperty('role', 'title')
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        message = QLabel("Settings panel coming soon!")
-        message.setStyleSheet("font-size: 16px; color: #999999; margin-top: 20px;")
-        message.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.form = SettingsForm(get_settings(), GROUP_TITLES)
 
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.Shape.NoFrame)
+        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        scroll.setWidget(self.form)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(40, 20, 40, 20)
+        layout.setSpacing(20)
         layout.addWidget(title)
-        layout.addWidget(message)
+        layout.addWidget(scroll)
 
-        self.setLayout(layout)
\ No newline at end of file
+        self.setLayout(layout)
@@ -1,10 +1,15 @@
-from PySide6.QtCore import Qt, QSize, Slot
-from PySide6.QtWidgets import QMainWindow, QStackedWidget
-from PySide6.QtGui import QIcon
+from PySide6.QtCore import Qt, QSize, QTimer, Signal, Slot
+from PySide6.QtWidgets import QMainWindow, QStackedWidget, QWidget
 
-from Delta_Team.Images.image_finder import get_image
+from Delta_Team.Images.image_finder import get_icon
 from Delta_Team.Smoke.Anime_Earth import widgets
+from Delta_Team.Smoke.Anime_Earth.Downloads.progress import ProgressHub
+from Delta_Team.Smoke.Anime_Earth.Search.handlers import get_handler
+from Delta_Team.Smoke.Anime_Earth.settings import get_settings
 from Delta_Team.Smoke.Defaults.Bars.toolbars import NavigationToolBar
+from Delta_Team.Smoke.Defaults.Loops.loops import async_slot
+from Delta_Team.Smoke.Defaults.Themes import themes
+from Delta_Team.Smoke.Defaults.Tracing.tracing import get_tracer
 
 
 class MainWindow(QMainWindow):
@@ -18,6 +23,9 @@ class MainWindow(QMainWindow):
 
     Architecture:
         - Uses QStackedWidget for efficient view switching
+        - Views are built on first visit from factories in widget_map,
+          the remaining ones are prewarmed one per idle tick once painted
+        - The download stack starts after the first paint
         - NavigationToolBar for user navigation
         - Responsive design that adapts to window resizing
         - Modern dark theme throughout
@@ -26,30 +34,61 @@ class MainWindow(QMainWindow):
         - Startup: Initial landing page (Home)
         - Search: Content search interface
         - Options: Download configuration
-        - Settings: Application settings (placeholder)
+        - Settings: Application settings
+        - Results: Search results (opened by a search)
+
+    Signals:
+        search_batch (int, object): Carries result batches from the asyncio
+                                    bridge to the GUI thread
+                                    Args: (search_id, batch)
 
     Attributes:
         toolbar (NavigationToolBar): Left-side navigation toolbar
         stacked_widget (QStackedWidget): Container for switchable views
-        widget_map (dict): Maps view names to widget indices
+        widget_map (dict): Maps view names to widget factories
+        views (dict): Maps view names to the views built so far
+        progress_hub (ProgressHub): Batched progress of the running downloads
     """
 
-    def __init__(self):
+    search_batch = Signal(int, object)
+
+    WINDOW_TITLE = "Anime Earth - Downloader"
+
+    def __init__(self, prewarm: bool = True):
         """
         Initialize the main application window.
 
-        Sets up the window properties, creates all widgets, configures
+        Sets up the window properties, builds the home view, configures
         the navigation toolbar, and establishes signal connections for
-        view switching.
+        view switching. Other views are created on demand.
+
+        Args:
+            prewarm (bool): Build the remaining views during idle time
+                            after the window is first painted
         """
         super().__init__()
 
+        self.prewarm = prewarm
+        self.painted = False
+        self.views = {}
+        self._search_id = 0
+
+        tracer = get_tracer()
+
         self.setObjectName('MainWindow')
         # Window configuration
-        self._setup_window()
+        with tracer.span('_setup_window'):
+            self._setup_window()
 
         # Create the central widget structure
-        self._create_central_widget()
+        with tracer.span('_create_central_widget'):
+            self._create_central_widget()
+
+        # Download progress arrives in batches, slowed down while minimised.
+        # The scheduler is attached after the first paint.
+        self.progress_hub = ProgressHub(parent=self)
+        self.progress_hub.watch(self)
+        self.progress_hub.progress_batch.connect(self._on_download_progress)
 
         # Set initial size (responsive, but starts at reasonable dimensions)
         self.resize(1200, 800)
@@ -59,20 +98,18 @@ class MainWindow(QMainWindow):
         """
         Configure basic window properties.
 
-        Sets window title, icon, and applies the dark theme stylesheet
-        to the entire application window.
+        Sets window title, icon, and installs the theme from the
+        settings before any view is built.
         """
         # Set window icon
-        self.setWindowIcon(QIcon(get_image("Main logo.jpg")))
+        self.setWindowIcon(get_icon("Main logo.jpg"))
 
-        self.setWindowTitle("Anime Earth - Downloader")
+        self.setWindowTitle(self.WINDOW_TITLE)
 
-        # Apply dark theme to main window
-        self.setStyleSheet("""
-            MainWindow {
-                background-color: #1e1e1e;
-            }
-        """)
+        # The theme is one application-wide stylesheet, chosen in the settings
+        settings = get_settings()
+        themes.apply_theme(settings['appearance.theme'])
+        settings.changed.connect(self._on_setting_changed)
 
     def _create_central_widget(self):
         """
@@ -90,18 +127,13 @@ class MainWindow(QMainWindow):
         # Create stacked widget to hold different views
         self.stacked_widget = QStackedWidget()
 
-        # Create and add all widgets
-        self.startup_widget = widgets.StartupWidget()
-        self.search_widget = widgets.SearchWidget()
-        self.options_widget = widgets.OptionsWidget()
-        self.settings_widget = widgets.SettingsWidget()
-
-        # Add widgets to stack and create mapping
+        # Map view names to factories, views are only built when first needed
         self.widget_map = {
-            'startup': self.stacked_widget.addWidget(self.startup_widget),
-            'search': self.stacked_widget.addWidget(self.search_widget),
-            'options': self.stacked_widget.addWidget(self.options_widget),
-            'settings': self.stacked_widget.addWidget(self.settings_widget)
+            'startup': widgets.StartupWidget,
+            'search': widgets.SearchWidget,
+            'options': widgets.OptionsWidget,
+            'settings': widgets.SettingsWidget,
+            'results': widgets.ResultsWidget
         }
 
         # Set stacked widget as central widget
@@ -110,12 +142,111 @@ class MainWindow(QMainWindow):
         # Connect navigation signals
         self.toolbar.view_changed.connect(self._switch_view)
 
-        # Connect startup widget buttons to navigate to relevant views
-        self.startup_widget.anime_selected.connect(lambda: self._switch_view('search'))
-        self.startup_widget.animation_selected.connect(lambda: self._switch_view('search'))
+        # Queued from the asyncio bridge thread
+        self.search_batch.connect(self._on_search_batch)
+
+        # Only the landing page is needed for the first frame
+        self._switch_view('startup')
+
+    def _get_view(self, view_name: str) -> QWidget:
+        """
+        Return the view for the given name, building it on first use.
+
+        The widget is created from its factory in widget_map, added to
+        the stacked widget and wired up to the window's slots.
+
+        Args:
+            view_name (str): Identifier for the target view
+
+        Returns:
+            QWidget: The (possibly newly built) view
+        """
+
+        view = self.views.get(view_name)
+
+        if view is None:
+            with get_tracer().span(f'build {view_name} view'):
+                view = self.widget_map[view_name]()
+
+            self.stacked_widget.addWidget(view)
+            self.views[view_name] = view
+            self._connect_view(view_name, view)
+
+        return view
+
+    def _connect_view(self, view_name: str, view: QWidget):
+        """
+        Connect the signals of a freshly built view.
+
+        Args:
+            view_name (str): Identifier of the view
+            view (QWidget): The view that was just built
+        """
+
+        if view_name == 'startup':
+            self.startup_widget = view
+
+            # Connect startup widget buttons to navigate to relevant views
+            view.anime_selected.connect(lambda: self._switch_view('search'))
+            view.animation_selected.connect(lambda: self._switch_view('search'))
+
+        elif view_name == 'search':
+            self.search_widget = view
+
+            # Connect search widget signal (for future implementation)
+            view.search_requested.connect(self._handle_search)
+
+        elif view_name == 'options':
+            self.options_widget = view
+
+        elif view_name == 'settings':
+            self.settings_widget = view
+
+        elif view_name == 'results':
+            self.results_widget = view
+
+    def paintEvent(self, event):
+        """
+        Start the deferred work once the first frame is on screen.
+        """
+        super().paintEvent(event)
+
+        if not self.painted:
+            self.painted = True
+            QTimer.singleShot(0, self._after_first_paint)
+
+    @Slot()
+    def _after_first_paint(self):
+        """
+        Start the download scheduler, then prewarm the remaining views.
+
+        The download stack pulls in the networking modules and replays
+        the download journal, neither is needed for the first frame.
+        """
+
+        from Delta_Team.Smoke.Anime_Earth.Downloads.scheduler import get_scheduler
+
+        with get_tracer().span('start downloads'):
+            self.progress_hub.scheduler = get_scheduler()
 
-        # Connect search widget signal (for future implementation)
-        self.search_widget.search_requested.connect(self._handle_search)
+        if self.prewarm:
+            self.prewarm = False
+            QTimer.singleShot(0, self._prewarm_next_view)
+
+    @Slot()
+    def _prewarm_next_view(self):
+        """
+        Build one pending view and reschedule until all views exist.
+
+        Only a single view is built per idle tick so that input and
+        paint events are processed in between.
+        """
+
+        for view_name in self.widget_map:
+            if view_name not in self.views:
+                self._get_view(view_name)
+                QTimer.singleShot(0, self._prewarm_next_view)
+                return
 
     @Slot()
     def _switch_view(self, view_name: str):
@@ -124,7 +255,7 @@ class MainWindow(QMainWindow):
 
         Changes the currently displayed widget based on the view name
         provided by navigation actions. Updates the central content area
-        to show the requested view.
+        to show the requested view, building it first if needed.
 
         Args:
             view_name (str): Identifier for the target view
@@ -132,17 +263,16 @@ class MainWindow(QMainWindow):
         """
 
         if view_name in self.widget_map:
-            widget_index = self.widget_map[view_name]
-            self.stacked_widget.setCurrentIndex(widget_index)
+            self.stacked_widget.setCurrentWidget(self._get_view(view_name))
 
-    @Slot()
+    @Slot(str, bool, str)
     def _handle_search(self, search_term: str, is_exact: bool, handler: str):
         """
         Handle search requests from the search widget.
 
-        This is a placeholder for actual search functionality.
-        In a complete implementation, this would trigger the download
-        search process with the specified parameters.
+        Opens the results view and runs the handler for the selected
+        mode on the asyncio bridge, where a newer search cancels one
+        still in progress.
 
         Args:
             search_term (str): The search query entered by user
@@ -150,7 +280,69 @@ class MainWindow(QMainWindow):
             handler (str): Search handler mode ('simple', 'complex', 'choice')
         """
 
-        print(f"Search requested: '{search_term}'")
-        print(f"Exact match: {is_exact}")
-        print(f"Handler: {handler}")
+        self._search_id += 1
+
+        self._switch_view('results')
+        self.results_widget.start_search(search_term)
+
+        self._run_search(self._search_id, search_term, is_exact, handler)
+
+    @async_slot(key='search', done='_on_search_finished', error='_on_search_failed')
+    async def _run_search(self, search_id: int, search_term: str, is_exact: bool, handler: str):
+        """
+        Stream the handler's result batches to the GUI thread.
+
+        Returns:
+            tuple: (search_id, elapsed milliseconds)
+        """
+
+        search_handler = get_handler(handler)
+
+        async for batch in search_handler.run(search_term, is_exact, widgets.ResultsWidget.MAX_RESULTS):
+            self.search_batch.emit(search_id, batch)
+
+        return search_id, search_handler.metrics.last_time * 1000
+
+    @Slot(int, object)
+    def _on_search_batch(self, search_id: int, batch: list):
+        """ Adds a batch to the results view unless it belongs to an older search. """
+
+        if search_id == self._search_id:
+            self.results_widget.add_results(batch)
+
+    def _on_search_finished(self, outcome: tuple):
+        """ Shows the summary of a finished search. """
+
+        search_id, elapsed_ms = outcome
+
+        if search_id == self._search_id:
+            self.results_widget.finish_search(elapsed_ms)
+
+    def _on_search_failed(self, error: Exception):
+        """ Ends the search in the results view when the handler raised. """
+
+        self.results_widget.finish_search(error=f"Search failed: {error}")
+
+    @Slot(object)
+    def _on_download_progress(self, updates: list):
+        """ Shows the overall progress of the running downloads in the title. """
+
+        scheduler = self.progress_hub.scheduler
+        running = scheduler.running_jobs() if scheduler is not None else []
+
+        if not running:
+            self.setWindowTitle(self.WINDOW_TITLE)
+            return
+
+        received = sum(job.download.received for job in running)
+        total = sum(job.download.size or 0 for job in running)
+        percent = f", {received / total:.0%}" if total else ""
+
+        self.setWindowTitle(f"{self.WINDOW_TITLE} ({len(running)} downloading{percent})")
+
+    @Slot(str, object)
+    def _on_setting_changed(self, key: str, value):
+        """ Applies a new theme right away. """
 
+        if key == 'appearance.theme':
+            themes.apply_theme(value)
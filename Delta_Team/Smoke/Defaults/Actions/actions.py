@@ -2,6 +2,8 @@ from PySide6.QtWidgets import QWidgetAction
 from PySide6.QtGui import QIcon, QAction
 from PySide6.QtCore import Signal
 
+from Delta_Team.Images.image_finder import get_svg_icon
+
 
 class NavigationAction(QAction):
     """
@@ -10,14 +12,18 @@ class NavigationAction(QAction):
     This action is used to switch between different widgets in the main window.
     Each action represents a specific view/widget (Home, Search, Options, etc.)
 
+    SVG icons are drawn through the shared raster cache and can be
+    tinted, e.g. with the text colour of the theme.
+
     Attributes:
         widget_name (str): Identifier for which widget this action should display
+        icon_path (str): Path to the icon image file, None without icon
 
     Signals:
         triggered: Emitted when the action is clicked, carries the widget_name
     """
 
-    def __init__(self, text: str, widget_name: str, icon_path: str = None, parent=None):
+    def __init__(self, text: str, widget_name: str, icon_path: str = None, parent=None, icon_tint: str = None):
         """
         Initialize a navigation action.
 
@@ -26,16 +32,29 @@ class NavigationAction(QAction):
             widget_name (str): Internal identifier for the target widget
             icon_path (str, optional): Path to icon image file
             parent: Parent QObject
+            icon_tint (str, optional): Colour painted over an SVG icon
         """
         super().__init__(text, parent)
         self.widget_name = widget_name
+        self.icon_path = icon_path
 
         if icon_path:
-            self.setIcon(QIcon(icon_path))
+            self.set_icon_tint(icon_tint)
 
         # Make the action checkable for visual feedback
         self.setCheckable(True)
 
+    def set_icon_tint(self, tint: str = None):
+        """ Recolours an SVG icon, renderings of each colour are cached. """
+
+        if not self.icon_path:
+            return
+
+        if self.icon_path.endswith('.svg'):
+            self.setIcon(get_svg_icon(self.icon_path, tint))
+        else:
+            self.setIcon(QIcon(self.icon_path))
+
 
 class DefaultAction(QAction):
     """
@@ -0,0 +1,275 @@
+from functools import partial
+from typing import Callable, NamedTuple
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal, Slot
+from PySide6.QtGui import QAction, QIcon, QKeySequence
+
+from Delta_Team.Images.image_finder import get_svg_icon
+
+
+class Command(NamedTuple):
+    """
+    Definition of a user command.
+
+    Attributes:
+        id (str): Unique identifier, dotted by area such as "file.open"
+        text (str): Label shown in menus and toolbars
+        handler (callable): Called without arguments when the command runs, None for none
+        shortcut: Key sequence string or QKeySequence.StandardKey, None for none
+        icon (str): Path of the icon image, SVGs go through the raster cache
+        tooltip (str): Tooltip, defaults to the text
+        background (bool): Run the handler in a pool thread, it must not touch widgets
+    """
+
+    id: str
+    text: str
+    handler: Callable = None
+    shortcut: object = None
+    icon: str = None
+    tooltip: str = None
+    background: bool = False
+
+    def make_icon(self, tint: str = None) -> QIcon:
+        """ Returns the icon of the command, tinted if it is an SVG. """
+
+        if self.icon.endswith('.svg'):
+            return get_svg_icon(self.icon, tint)
+
+        return QIcon(self.icon)
+
+
+class _CommandSignals(QObject):
+    """ Signals of a background command, delivered queued to the GUI thread. """
+
+    done = Signal(str, object, object)
+
+
+class _CommandJob(QRunnable):
+    """ Runs the handler of a background command in a pool thread. """
+
+    def __init__(self, command: Command, signals: _CommandSignals):
+        super().__init__()
+
+        self.command = command
+        self.signals = signals
+
+    def run(self):
+        try:
+            result = self.command.handler()
+        except Exception as error:
+            self.signals.done.emit(self.command.id, None, error)
+        else:
+            self.signals.done.emit(self.command.id, result, None)
+
+
+class CommandRegistry(QObject):
+    """
+    Central registry of the commands of the application.
+
+    Commands are defined once and every menu, toolbar and shortcut
+    that offers them is built from that definition. The QAction of a
+    command is only created when something first asks for it, and
+    populate_on_show() defers filling a menu until it is first opened,
+    so building a window costs nothing for commands nobody looks at.
+
+    Every trigger goes through dispatch(), which runs the handler from
+    the event loop once the triggering menu has closed. Handlers of
+    background commands run in a thread pool.
+
+    Signals:
+        dispatched (str): Emitted when a command is about to run
+                          Args: (command id)
+        finished (str, object): Emitted when a handler returned
+                                Args: (command id, return value)
+        failed (str, object): Emitted when a handler raised
+                              Args: (command id, exception)
+    """
+
+    dispatched = Signal(str)
+    finished = Signal(str, object)
+    failed = Signal(str, object)
+
+    def __init__(self, max_threads: int = 2, parent=None):
+        """
+        Initialize an empty registry.
+
+        Args:
+            max_threads (int): Threads running background commands
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+
+        self._commands = {}
+        self._actions = {}
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+
+        self._signals = _CommandSignals()
+        self._signals.done.connect(self._on_done)
+
+    def register(self, command_id: str, text: str, handler: Callable = None, shortcut=None,
+                 icon: str = None, tooltip: str = None, background: bool = False) -> Command:
+        """
+        Defines a command, see Command for the arguments.
+
+        Raises:
+            ValueError: If another command already uses the id
+        """
+
+        if command_id in self._commands:
+            raise ValueError(f'Command {command_id!r} is already registered')
+
+        command = Command(command_id, text, handler, shortcut, icon, tooltip, background)
+        self._commands[command_id] = command
+
+        return command
+
+    def __contains__(self, command_id: str) -> bool:
+        return command_id in self._commands
+
+    def command(self, command_id: str) -> Command:
+        """ Returns the definition of a command, raises KeyError if it is unknown. """
+
+        return self._commands[command_id]
+
+    def action(self, command_id: str) -> QAction:
+        """
+        Returns the shared action of a command, creating it on first use.
+
+        The same action can be added to any number of menus and
+        toolbars, they all stay in sync with it.
+        """
+
+        action = self._actions.get(command_id)
+
+        if action is None:
+            action = self.create_action(command_id, self)
+            self._actions[command_id] = action
+
+        return action
+
+    def create_action(self, command_id: str, parent=None) -> QAction:
+        """
+        Creates a separate action configured from a command.
+
+        For widgets needing an action of their own, e.g. a checkable
+        one in an exclusive group.
+
+        Args:
+            command_id (str): Command to build the action from
+            parent: Parent QObject
+
+        Returns:
+            QAction: Action running the command when triggered
+        """
+
+        command = self._commands[command_id]
+        action = QAction(command.text, parent)
+
+        if command.shortcut is not None:
+            action.setShortcut(QKeySequence(command.shortcut))
+
+        if command.icon:
+            action.setIcon(command.make_icon())
+
+        if command.tooltip:
+            action.setToolTip(command.tooltip)
+
+        if command.handler is not None:
+            action.triggered.connect(partial(self.dispatch, command_id))
+
+        return action
+
+    def populate(self, menu, command_ids):
+        """
+        Adds the shared actions of commands to a menu or toolbar.
+
+        Args:
+            menu: QMenu or QToolBar
+            command_ids: Command ids, None adds a separator
+        """
+
+        for command_id in command_ids:
+            if command_id is None:
+                menu.addSeparator()
+            else:
+                menu.addAction(self.action(command_id))
+
+    def populate_on_show(self, menu, command_ids):
+        """
+        Fills a menu with commands the first time it is about to open.
+
+        Shortcuts don't wait for the menu, see install_shortcuts().
+        """
+
+        command_ids = tuple(command_ids)
+
+        def populate():
+            menu.aboutToShow.disconnect(populate)
+            self.populate(menu, command_ids)
+
+        menu.aboutToShow.connect(populate)
+
+        return menu
+
+    def install_shortcuts(self, widget, command_ids):
+        """
+        Makes the shortcuts of commands work in a widget's window.
+
+        Only the actions of commands that have a shortcut are created,
+        the rest stay unbuilt until a menu shows them.
+        """
+
+        for command_id in command_ids:
+            if command_id is not None and self._commands[command_id].shortcut is not None:
+                widget.addAction(self.action(command_id))
+
+    def dispatch(self, command_id: str, *_):
+        """
+        Runs a command from the event loop.
+
+        Returns at once. The handler runs on the next event loop
+        iteration, after the menu or button that triggered it is
+        repainted, or in the thread pool for background commands.
+        """
+
+        QTimer.singleShot(0, self, partial(self._run, self._commands[command_id]))
+
+    def _run(self, command: Command):
+        if command.handler is None:
+            return
+
+        self.dispatched.emit(command.id)
+
+        if command.background:
+            self._pool.start(_CommandJob(command, self._signals))
+            return
+
+        try:
+            result = command.handler()
+        except Exception as error:
+            self._on_done(command.id, None, error)
+            raise
+
+        self._on_done(command.id, result, None)
+
+    @Slot(str, object, object)
+    def _on_done(self, command_id: str, result, error):
+        if error is None:
+            self.finished.emit(command_id, result)
+        else:
+            self.failed.emit(command_id, error)
+
+
+_registry = None
+
+
+def get_commands() -> CommandRegistry:
+    """ Returns the application's command registry. """
+    global _registry
+
+    if _registry is None:
+        _registry = CommandRegistry()
+
+    return _registry
@@ -1,47 +1,131 @@
-from PySide6.QtWidgets import QMenuBar, QMessageBox
-from PySide6.QtCore import Slot
+from PySide6.QtWidgets import QApplication, QMenuBar, QMessageBox
+from PySide6.QtCore import QEvent
+from PySide6.QtGui import QKeySequence
+
+from Delta_Team.Smoke.Defaults.Actions.commands import get_commands
+
+_placeholder_box = None
+
+
+def placeholder():
+    """ Placeholder handler for commands that aren't implemented yet """
+    global _placeholder_box
+
+    # One message box for every placeholder, shown without blocking the event loop
+    if _placeholder_box is None:
+        _placeholder_box = QMessageBox()
+        _placeholder_box.setWindowTitle("Default title")
+        _placeholder_box.setText("This is a placeholder text")
+
+    _placeholder_box.open()
+
+
+def window_command(method: str):
+    """
+    Returns a handler calling a method of the focused widget or the window around it.
+
+    The focused widget and its parents up to the active window are
+    asked in turn, so the editor's undo or a line edit's paste take
+    over Edit commands and the editor window's open_file File ones.
+    The placeholder runs when none of them implements the command.
+    """
+
+    def run():
+        widget = QApplication.focusWidget() or QApplication.activeWindow()
+
+        while widget is not None:
+            handler = getattr(widget, method, None)
+
+            if callable(handler):
+                return handler()
+
+            widget = widget.parentWidget()
+
+        placeholder()
+
+    return run
+
+
+def close_window():
+    """ Closes the active window """
+
+    window = QApplication.activeWindow()
+
+    if window is not None:
+        window.close()
+
+
+def register_commands(registry):
+    """ Defines the commands of the text edit menus, once per registry. """
+
+    if 'file.new' in registry:
+        return
+
+    Key = QKeySequence.StandardKey
+
+    registry.register('file.new', "New File", window_command('new_file'), Key.New)
+    registry.register('file.new_window', "New Window", window_command('new_window'), "Ctrl+Shift+N")
+    registry.register('file.open', "Open", window_command('open_file'), Key.Open)
+    registry.register('file.save', "Save", window_command('save_file'), Key.Save)
+    registry.register('file.save_as', "Save As", window_command('save_file_as'), Key.SaveAs)
+    registry.register('file.exit', "Exit", close_window, Key.Quit)
+
+    registry.register('edit.cut', "Cut", window_command('cut'), Key.Cut)
+    registry.register('edit.copy', "Copy", window_command('copy'), Key.Copy)
+    registry.register('edit.paste', "Paste", window_command('paste'), Key.Paste)
+    registry.register('edit.undo', "Undo", window_command('undo'), Key.Undo)
+    registry.register('edit.redo', "Redo", window_command('redo'), Key.Redo)
+    registry.register('edit.delete', "Delete", window_command('delete'), Key.Delete)
+
+    registry.register('view.adjust', "Adjust", placeholder)
+    registry.register('view.analyze', "Analyze", placeholder)
 
 
 # Default class for editors
 class TextEditMenuBar(QMenuBar):
-    """ Default text edit menu class """
+    """
+    Default text edit menu class
 
-    def __init__(self):
-        super().__init__()
+    The entries come from the command registry and each menu is only
+    filled the first time it opens. The shortcuts are installed on the
+    window as soon as the menu bar is placed in one.
+    """
 
+    MENUS = {
         # File menu and does file and window handling
-        file_menu = self.addMenu("File")
-        file_menu.addAction("New Fie").triggered.connect(self.placeholder)
-        file_menu.addAction("New Window").triggered.connect(self.placeholder)
-        file_menu.addAction("Open").triggered.connect(self.placeholder)
-        file_menu.addAction("Save").triggered.connect(self.placeholder)
-        file_menu.addAction("Save As").triggered.connect(self.placeholder)
-        file_menu.addSeparator()
-        file_menu.addAction("Exit").triggered.connect(self.close)
+        "File": ('file.new', 'file.new_window', 'file.open', 'file.save', 'file.save_as', None, 'file.exit'),
+        # Edit menu that manipulates actions
+        "Edit": ('edit.cut', 'edit.copy', 'edit.paste', None, 'edit.undo', 'edit.redo', None, 'edit.delete'),
+        # View menu that controls the feel
+        "View": ('view.adjust', 'view.analyze'),
+    }
 
+    def __init__(self, parent=None):
+        super().__init__(parent)
 
-        # Edit menu that manipulates actions
-        edit_menu = self.addMenu("Edit")
-        edit_menu.addAction("Cut").triggered.connect(self.placeholder)
-        edit_menu.addAction("Copy").triggered.connect(self.placeholder)
-        edit_menu.addAction("Paste").triggered.connect(self.placeholder)
-        edit_menu.addSeparator()
-        edit_menu.addAction("Undo").triggered.connect(self.placeholder)
-        edit_menu.addAction("Redo").triggered.connect(self.placeholder)
-        edit_menu.addSeparator()
-        edit_menu.addAction("Delete").triggered.connect(self.placeholder)
+        self.commands = get_commands()
+        register_commands(self.commands)
 
-        # View menu that controls the feel
-        view_menu = self.addMenu("View")
-        view_menu.addAction("Adjust").triggered.connect(self.placeholder)
-        view_menu.addAction("Analyze").triggered.connect(self.placeholder)
+        for title, command_ids in self.MENUS.items():
+            self.commands.populate_on_show(self.addMenu(title), command_ids)
+
+        self._shortcut_window = None
+        self._install_shortcuts()
+
+    def _install_shortcuts(self):
+        window = self.window()
+
+        if window is self or window is self._shortcut_window:
+            return
+
+        self._shortcut_window = window
 
-    @Slot()
-    def placeholder(self):
-        """ Placeholder method for a default object """
+        for command_ids in self.MENUS.values():
+            self.commands.install_shortcuts(window, command_ids)
 
+    def changeEvent(self, event):
+        super().changeEvent(event)
 
-        message = QMessageBox()
-        message.setWindowTitle("Default title")
-        message.setText("This is a placeholder text")
-        message.exec()
+        # setMenuBar() reparents the menu bar into its window
+        if event.type() == QEvent.Type.ParentChange:
+            self._install_shortcuts()
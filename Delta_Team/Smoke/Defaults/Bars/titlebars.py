@@ -1,16 +1,236 @@
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QPushButton, QLabel
-from PySide6.QtCore import Qt, QPoint
-from PySide6.QtGui import QPixmap
+from PySide6.QtCore import Qt, QEvent, QObject, QPoint, QRect, QSize, QTimer
+
+from Delta_Team.Images.image_finder import get_pixmap
+from Delta_Team.Smoke.Defaults.Themes import themes
+
+
+class _FrameCoalescer(QObject):
+    """
+    Applies only the latest of many mouse positions, once per frame.
+
+    Mice report positions far faster than the screen refreshes, moving
+    the window for each of them only queues up work the compositor can't
+    show. Positions are stored and the callback runs with the newest one
+    when the frame timer fires.
+    """
+
+    def __init__(self, callback, parent=None):
+        super().__init__(parent)
+
+        self._callback = callback
+        self._pending = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self.flush)
+
+    def push(self, position: QPoint, screen=None):
+        """ Records a position, applied with the next frame. """
+
+        self._pending = position
+
+        if not self._timer.isActive():
+            rate = screen.refreshRate() if screen is not None else 0
+            self._timer.start(max(1, int(1000 / rate)) if rate > 0 else 16)
+
+    def flush(self):
+        """ Applies the pending position now. """
+
+        self._timer.stop()
+        position, self._pending = self._pending, None
+
+        if position is not None:
+            self._callback(position)
+
+    def cancel(self):
+        self._timer.stop()
+        self._pending = None
+
+
+class FrameResizer(QObject):
+    """
+    Resize handles along the edges of a frameless window.
+
+    Watches the mouse events of the native window, before Qt hands them
+    to the widget below the cursor, so the edges work whatever widget
+    fills them. Hit-testing is a few comparisons against the window
+    rectangle and the cursor shape is only set when the edge changes.
+
+    Resizing is delegated to the compositor with startSystemResize()
+    when the platform supports it, otherwise the geometry follows the
+    mouse once per frame.
+
+    Attributes:
+        margin (int): Width of the handles in pixels
+    """
+
+    _CURSORS = {
+        Qt.Edge.LeftEdge: Qt.CursorShape.SizeHorCursor,
+        Qt.Edge.RightEdge: Qt.CursorShape.SizeHorCursor,
+        Qt.Edge.TopEdge: Qt.CursorShape.SizeVerCursor,
+        Qt.Edge.BottomEdge: Qt.CursorShape.SizeVerCursor,
+        Qt.Edge.LeftEdge | Qt.Edge.TopEdge: Qt.CursorShape.SizeFDiagCursor,
+        Qt.Edge.RightEdge | Qt.Edge.BottomEdge: Qt.CursorShape.SizeFDiagCursor,
+        Qt.Edge.RightEdge | Qt.Edge.TopEdge: Qt.CursorShape.SizeBDiagCursor,
+        Qt.Edge.LeftEdge | Qt.Edge.BottomEdge: Qt.CursorShape.SizeBDiagCursor,
+    }
+
+    def __init__(self, window: QWidget, margin: int = 6):
+        """
+        Initialize the handles, they are active once the window is shown.
+
+        Args:
+            window (QWidget): Frameless top-level widget
+            margin (int): Width of the handles in pixels
+        """
+        super().__init__(window)
+
+        self.window = window
+        self.margin = margin
+
+        self._handle = None
+        self._hovered = Qt.Edge(0)
+        self._edges = Qt.Edge(0)
+        self._press_position = None
+        self._press_geometry = None
+        self._coalescer = _FrameCoalescer(self._apply_resize, self)
+
+        window.installEventFilter(self)
+        self._attach()
+
+    def _attach(self):
+        """ Starts watching the native window once it exists. """
+
+        handle = self.window.windowHandle()
+
+        if handle is not None and handle is not self._handle:
+            if self._handle is not None:
+                self._handle.removeEventFilter(self)
+
+            self._handle = handle
+            handle.installEventFilter(self)
+
+    def edges_at(self, position: QPoint) -> Qt.Edge:
+        """ Returns the edges under a position in window coordinates. """
+
+        if self.window.isMaximized() or self.window.isFullScreen():
+            return Qt.Edge(0)
+
+        x, y = position.x(), position.y()
+        width, height = self.window.width(), self.window.height()
+        edges = Qt.Edge(0)
+
+        if x < self.margin:
+            edges |= Qt.Edge.LeftEdge
+        elif x >= width - self.margin:
+            edges |= Qt.Edge.RightEdge
+
+        if y < self.margin:
+            edges |= Qt.Edge.TopEdge
+        elif y >= height - self.margin:
+            edges |= Qt.Edge.BottomEdge
+
+        return edges
+
+    def eventFilter(self, watched, event):
+        if watched is self.window:
+            if event.type() == QEvent.Type.Show:
+                self._attach()
+
+            return False
+
+        kind = event.type()
+
+        if kind == QEvent.Type.MouseMove:
+            if self._edges:
+                self._coalescer.push(event.globalPosition().toPoint(), self._handle.screen())
+                return True
+
+            if not event.buttons():
+                self._set_hovered(self.edges_at(event.position().toPoint()))
+
+        elif kind == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
+            edges = self.edges_at(event.position().toPoint())
+
+            if edges:
+                if not self._handle.startSystemResize(edges):
+                    self._edges = edges
+                    self._press_position = event.globalPosition().toPoint()
+                    self._press_geometry = self.window.geometry()
+
+                return True
+
+        elif kind == QEvent.Type.MouseButtonRelease and self._edges:
+            self._coalescer.flush()
+            self._edges = Qt.Edge(0)
+            return True
+
+        elif kind == QEvent.Type.Leave:
+            self._set_hovered(Qt.Edge(0))
+
+        return False
+
+    def _set_hovered(self, edges: Qt.Edge):
+        if edges == self._hovered:
+            return
+
+        self._hovered = edges
+
+        if edges:
+            self.window.setCursor(self._CURSORS[edges])
+        else:
+            self.window.unsetCursor()
+
+    def _apply_resize(self, position: QPoint):
+        """ Fallback resize: moves the dragged edges by the mouse travel. """
+
+        delta = position - self._press_position
+        geometry = QRect(self._press_geometry)
+        minimum = self.window.minimumSizeHint().expandedTo(self.window.minimumSize())
+
+        if self._edges & Qt.Edge.LeftEdge:
+            geometry.setLeft(min(geometry.left() + delta.x(), geometry.right() - minimum.width() + 1))
+        elif self._edges & Qt.Edge.RightEdge:
+            geometry.setRight(max(geometry.right() + delta.x(), geometry.left() + minimum.width() - 1))
+
+        if self._edges & Qt.Edge.TopEdge:
+            geometry.setTop(min(geometry.top() + delta.y(), geometry.bottom() - minimum.height() + 1))
+        elif self._edges & Qt.Edge.BottomEdge:
+            geometry.setBottom(max(geometry.bottom() + delta.y(), geometry.top() + minimum.height() - 1))
+
+        self.window.setGeometry(geometry)
 
-from Delta_Team.Images.image_finder import get_image
 
 class CustomTitleBar(QWidget):
+    """
+    Title bar of a frameless window.
+
+    Dragging the bar moves the window, double-clicking it maximises and
+    restores it. Moving is delegated to the compositor with
+    startSystemMove() where the platform supports it, which also gives
+    native snapping. Otherwise the window follows the mouse once per
+    frame. The window's edges become resize handles.
+
+    Attributes:
+        resizer (FrameResizer): Resize handles of the window
+    """
+
     def __init__(self, parent):
         super().__init__(parent)
         self.parent = parent
+        self.setObjectName('CustomTitleBar')
+        themes.ensure_theme()
+
+        window = parent.window()
+        self.resizer = FrameResizer(window)
+
+        self._drag_offset = None
+        self._coalescer = _FrameCoalescer(self._apply_move, self)
 
         window_icon = QLabel("Icon")
-        window_icon.setPixmap(QPixmap(get_image('Main logo.jpg')))
+        window_icon.setPixmap(get_pixmap('Main logo.jpg', QSize(30, 30), self.devicePixelRatioF()))
         window_icon.resize(window_icon.size())
         window_icon.setFixedSize(30,30)
 
@@ -20,33 +240,71 @@ class CustomTitleBar(QWidget):
         title = QLabel("My Custom Title Bar")
         btn_close = QPushButton("X")
         btn_close.setFixedSize(30, 30)
-        btn_close.clicked.connect(self.parent.close)
+        btn_close.clicked.connect(window.close)
 
         btn_minimize = QPushButton("-")
         btn_minimize.setFixedSize(30, 30)
+        btn_minimize.clicked.connect(window.showMinimized)
 
-        btn_maximize = QPushButton("[]")
-        btn_maximize.setFixedSize(30, 30)
+        self.btn_maximize = QPushButton("[]")
+        self.btn_maximize.setFixedSize(30, 30)
+        self.btn_maximize.clicked.connect(self.toggle_maximized)
 
         titlebar_layout.addWidget(window_icon)
         titlebar_layout.addWidget(title)
         titlebar_layout.addStretch()
         titlebar_layout.addWidget(btn_minimize)
-        titlebar_layout.addWidget(btn_maximize)
+        titlebar_layout.addWidget(self.btn_maximize)
         titlebar_layout.addWidget(btn_close)
 
-        # Style it (You'd usually use QSS/CSS here)
-        self.setStyleSheet("background-color: #333; color: white;")
+        window.installEventFilter(self)
+
+    def toggle_maximized(self):
+        """ Maximises the window, or restores it when it is maximised. """
+
+        window = self.window()
+
+        if window.isMaximized():
+            window.showNormal()
+        else:
+            window.showMaximized()
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.btn_maximize.setText("][" if watched.isMaximized() else "[]")
+
+        return False
 
     # Logic to make the window draggable
     def mousePressEvent(self, event):
-        if event.button() == Qt.MouseButton.LeftButton:
-            self.parent.old_pos = event.globalPosition().toPoint()
+        if event.button() != Qt.MouseButton.LeftButton:
+            return super().mousePressEvent(event)
+
+        window = self.window()
+        handle = window.windowHandle()
+
+        if handle is not None and handle.startSystemMove():
+            return
+
+        # Dragging a maximised window without compositor support would tear it off its screen
+        if not window.isMaximized():
+            self._drag_offset = event.globalPosition().toPoint() - window.frameGeometry().topLeft()
 
     def mouseMoveEvent(self, event):
-        if hasattr(self.parent, 'old_pos'):
-            delta = QPoint(event.globalPosition().toPoint() - self.parent.old_pos)
-            self.parent.move(self.parent.x() + delta.x(), self.parent.y() + delta.y())
-            self.parent.old_pos = event.globalPosition().toPoint()
+        if self._drag_offset is not None:
+            self._coalescer.push(event.globalPosition().toPoint(), self.screen())
 
+    def mouseReleaseEvent(self, event):
+        if self._drag_offset is not None:
+            self._coalescer.flush()
+            self._drag_offset = None
+
+    def mouseDoubleClickEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._coalescer.cancel()
+            self._drag_offset = None
+            self.toggle_maximized()
 
+    def _apply_move(self, position: QPoint):
+        if self._drag_offset is not None:
+            self.window().move(position - self._drag_offset)
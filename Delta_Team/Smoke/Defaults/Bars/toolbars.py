@@ -1,8 +1,9 @@
 from PySide6.QtWidgets import QToolBar
-from PySide6.QtCore import Qt, QSize, Signal
-from PySide6.QtGui import QActionGroup
+from PySide6.QtCore import Qt, QEvent, QSize, Signal
+from PySide6.QtGui import QActionGroup, QPalette
 
 from Delta_Team.Smoke.Defaults.Actions.actions import NavigationAction
+from Delta_Team.Smoke.Defaults.Actions.commands import get_commands
 from Delta_Team.Images.image_finder import get_image
 
 
@@ -46,31 +47,8 @@ class NavigationToolBar(QToolBar):
         self.setOrientation(Qt.Orientation.Vertical)
         self.setMovable(False)  # Keep toolbar fixed in place
 
-        # Set modern styling
-        self.setStyleSheet("""
-            QToolBar {
-                background-color: #2b2b2b;
-                border-right: 1px solid #3d3d3d;
-                spacing: 8px;
-                padding: 10px;
-            }
-            QToolButton {
-                color: #ffffff;
-                background-color: transparent;
-                border: none;
-                border-radius: 6px;
-                padding: 10px;
-                font-size: 13px;
-                text-align: left;
-            }
-            QToolButton:hover {
-                background-color: #3d3d3d;
-            }
-            QToolButton:checked {
-                background-color: #0d7377;
-                font-weight: bold;
-            }
-        """)
+        # Styled by the application theme
+        self.setObjectName('NavigationToolBar')
 
         # Create action group for mutually exclusive selection
         self.action_group = QActionGroup(self)
@@ -86,38 +64,19 @@ class NavigationToolBar(QToolBar):
         Defines the main navigation items: Home, Search, Options, and Settings.
         Each action is added to the action group and connected to the signal handler.
         """
-        # Home/Startup action
-        home_action = NavigationAction(
-            "Home",
-            "startup",
-            parent=self
-        )
-        home_action.setChecked(True)  # Start with home selected
-
-        # Search action
-        search_action = NavigationAction(
-            "Search",
-            "search",
-            parent=self
-        )
-
-        # Options/Download settings action
-        options_action = NavigationAction(
-            "Download Options",
-            "options",
-            parent=self
-        )
-
-        # Settings action (placeholder for future features)
-        settings_action = NavigationAction(
-            "Settings",
-            "settings",
-            parent=self
-        )
+        # SVG icons are tinted with the text colour of the theme
+        tint = self._icon_tint()
 
-        # Add all actions to the group and toolbar
-        actions = [home_action, search_action, options_action, settings_action]
+        # Labels and icons are defined once in the command registry
+        actions = [
+            NavigationAction(command.text, widget_name, command.icon, parent=self, icon_tint=tint)
+            for widget_name, command in self._navigation_commands()
+        ]
+
+        # Start with home selected
+        actions[0].setChecked(True)
 
+        # Add all actions to the group and toolbar
         for action in actions:
             self.action_group.addAction(action)
             self.addAction(action)
@@ -126,9 +85,46 @@ class NavigationToolBar(QToolBar):
 
         # Add spacer at bottom to push actions to top
         spacer = QToolBar(self)
-        spacer.setStyleSheet("background-color: transparent; border: none;")
+        spacer.setObjectName('NavigationSpacer')
         self.addWidget(spacer)
 
+    @staticmethod
+    def _navigation_commands() -> list:
+        """ Returns (widget name, command) of every navigation item, registering them once. """
+
+        commands = get_commands()
+
+        if 'navigate.startup' not in commands:
+            commands.register('navigate.startup', "Home", icon=get_image("anime-and-manga-svgrepo-com.svg"))
+            commands.register('navigate.search', "Search", icon=get_image("chevrons-right.svg"))
+            commands.register('navigate.options', "Download Options", icon=get_image("ellipsis-vertical.svg"))
+            commands.register('navigate.settings', "Settings", icon=get_image("wrench.svg"))
+
+        return [
+            (widget_name, commands.command(f'navigate.{widget_name}'))
+            for widget_name in ('startup', 'search', 'options', 'settings')
+        ]
+
+    def _icon_tint(self) -> str:
+        """ Returns the icon colour matching the current palette. """
+
+        return self.palette().color(QPalette.ColorRole.ButtonText).name()
+
+    def changeEvent(self, event):
+        """
+        Recolour the icons when the theme changes the palette.
+
+        The renderings of every colour are cached, switching back and
+        forth between themes doesn't render anything again.
+        """
+        super().changeEvent(event)
+
+        if event.type() == QEvent.Type.PaletteChange:
+            tint = self._icon_tint()
+
+            for action in self.action_group.actions():
+                action.set_icon_tint(tint)
+
     def _on_action_triggered(self, action: NavigationAction):
         """
         Handle navigation action clicks.
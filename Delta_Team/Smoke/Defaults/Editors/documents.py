@@ -0,0 +1,648 @@
+import mmap
+import os
+import shutil
+from bisect import bisect_right
+from itertools import accumulate
+from pathlib import Path
+
+# Granularity of the newline index, one count is kept per block
+BLOCK_SIZE = 64 * 1024
+
+# Size of the slices read, written and scanned at once
+CHUNK_SIZE = 1024 * 1024
+
+ORIGINAL, ADDED = 0, 1
+
+
+class LineIndex:
+    """
+    Sparse newline index of a buffer that is read-only or only appended to.
+
+    Instead of the offset of every line, the number of newlines before
+    each BLOCK_SIZE block is kept, 8 bytes per 64 KiB. Blocks are only
+    counted when a lookup reaches them, or by scan() in idle time. The
+    position of a newline is then found by searching a single block.
+
+    Attributes:
+        buffer: The indexed bytes, an mmap or a bytearray
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        # Newlines before block i, for every complete block counted so far
+        self._totals = [0]
+
+    @property
+    def scanned(self) -> int:
+        """ Number of bytes indexed, not counting the trailing partial block. """
+
+        return (len(self._totals) - 1) * BLOCK_SIZE
+
+    @property
+    def complete(self) -> bool:
+        """ Whether every complete block has been counted. """
+
+        return len(self._totals) - 1 >= len(self.buffer) // BLOCK_SIZE
+
+    def _count_blocks(self, blocks: int):
+        """ Counts complete blocks until `blocks` of them are indexed. """
+
+        blocks = min(blocks, len(self.buffer) // BLOCK_SIZE)
+        totals = self._totals
+        buffer = self.buffer
+
+        while len(totals) <= blocks:
+            start = (len(totals) - 1) * BLOCK_SIZE
+            totals.append(totals[-1] + buffer[start:start + BLOCK_SIZE].count(b'\n'))
+
+    def scan(self, max_bytes: int) -> bool:
+        """
+        Indexes up to max_bytes more of the buffer.
+
+        Returns:
+            bool: Whether the whole buffer is indexed now
+        """
+
+        self._count_blocks(len(self._totals) - 1 + max(1, max_bytes // BLOCK_SIZE))
+
+        return self.complete
+
+    def count_before(self, offset: int) -> int:
+        """ Returns the number of newlines in buffer[:offset]. """
+
+        block = offset // BLOCK_SIZE
+        self._count_blocks(block)
+        start = block * BLOCK_SIZE
+
+        return self._totals[block] + (self.buffer[start:offset].count(b'\n') if offset > start else 0)
+
+    def find_nth(self, n: int, end: int = None):
+        """
+        Returns the offset of newline number n (from 0), None when there is none before end.
+
+        Only the blocks up to the one holding the newline are counted.
+        """
+
+        if end is None:
+            end = len(self.buffer)
+
+        totals = self._totals
+        # Blocks before the one holding `end` are complete
+        last_block = min(end, len(self.buffer)) // BLOCK_SIZE
+
+        while totals[-1] <= n and len(totals) - 1 < last_block:
+            self._count_blocks(len(totals))
+
+        block = bisect_right(totals, n) - 1
+        position = block * BLOCK_SIZE
+        buffer = self.buffer
+
+        for _ in range(n - totals[block] + 1):
+            position = buffer.find(b'\n', position, end)
+
+            if position < 0:
+                return None
+
+            position += 1
+
+        return position - 1
+
+    def estimate(self, start: int, end: int) -> float:
+        """ Newlines in buffer[start:end], extrapolated past the indexed part. """
+
+        scanned = self.scanned
+
+        if end <= scanned or self.complete:
+            return self.count_before(end) - self.count_before(start)
+
+        # Line length of the indexed part, or of the first block
+        density = self._totals[-1] / scanned if scanned else \
+            self.buffer[:BLOCK_SIZE].count(b'\n') / max(1, min(len(self.buffer), BLOCK_SIZE))
+        counted = self.count_before(scanned) - self.count_before(start) if start < scanned else 0
+
+        return counted + (end - max(start, scanned)) * density
+
+
+class PieceTable:
+    """
+    Byte sequence edited without copying its original contents.
+
+    The text is a list of pieces, each a slice of either the read-only
+    original buffer or an append-only buffer holding everything typed
+    or pasted. Edits split and trim pieces, the buffers never change,
+    so an edit costs the same in a 500 MB file as in an empty one.
+    Typing at the end of the last inserted text grows its piece
+    instead of adding one, and edits continuing the previous one don't
+    look up their piece.
+
+    Offsets and line numbers count from 0. Lines are separated by b'\\n',
+    a b'\\r' before it is part of the line.
+
+    Attributes:
+        length (int): Number of bytes
+    """
+
+    def __init__(self, original=b''):
+        """
+        Initialize the table.
+
+        Args:
+            original: Original contents, any object with the bytes
+                      search and slicing methods such as an mmap
+        """
+
+        self.length = 0
+        self._reset(original)
+
+    def _reset(self, original):
+        added = bytearray()
+
+        self._buffers = [original, added]
+        self._indexes = [LineIndex(original), LineIndex(added)]
+        self._pieces = [[ORIGINAL, 0, len(original)]] if len(original) else []
+        # Newlines in each piece, None until counted
+        self._newlines = [None] * len(self._pieces)
+        # Offset and preceding newlines of each piece, valid for a prefix of the pieces
+        self._starts = []
+        self._lines = []
+        # Newlines added by edits minus those deleted, the text has the original's plus these
+        self._edited_newlines = 0
+        # (piece index, offset of its end) of the last edit, where typing continues
+        self._cursor = None
+        self.length = len(original)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def _invalidate(self, index: int):
+        """ Drops the cached offsets and line counts from piece `index` on. """
+
+        del self._starts[index:]
+        del self._lines[index:]
+
+    def _ensure_starts(self, index: int):
+        """ Computes the offsets of the pieces after the last edited one, up to piece `index`. """
+
+        starts = self._starts
+        pieces = self._pieces
+        index = min(index, len(pieces) - 1)
+
+        if len(starts) <= index:
+            if not starts:
+                starts.append(0)
+
+            offsets = accumulate((piece[2] for piece in pieces[len(starts) - 1:index]), initial=starts[-1])
+            next(offsets)
+            starts.extend(offsets)
+
+    def _piece_at(self, offset: int) -> tuple:
+        """ Returns (piece index, offset in the piece), (len(pieces), 0) at the end. """
+
+        if offset >= self.length:
+            return len(self._pieces), 0
+
+        starts = self._starts
+        pieces = self._pieces
+        batch = 256
+
+        # Offsets are computed in growing batches until the piece holding `offset`, not for the whole text
+        while not starts or starts[-1] + pieces[len(starts) - 1][2] <= offset:
+            self._ensure_starts(len(starts) + batch)
+            batch *= 2
+
+        index = bisect_right(starts, offset) - 1
+
+        return index, offset - starts[index]
+
+    def _join(self, index: int):
+        """ Merges piece `index` into the previous one when they are adjacent slices of one buffer. """
+
+        pieces = self._pieces
+
+        if 0 < index < len(pieces):
+            previous, piece = pieces[index - 1], pieces[index]
+
+            if previous[0] == piece[0] and previous[1] + previous[2] == piece[1]:
+                previous[2] += piece[2]
+                del pieces[index]
+                del self._newlines[index]
+                self._newlines[index - 1] = None
+
+    def _piece_newlines(self, index: int) -> int:
+        count = self._newlines[index]
+
+        if count is None:
+            buffer, start, length = self._pieces[index]
+            line_index = self._indexes[buffer]
+            count = line_index.count_before(start + length) - line_index.count_before(start)
+            self._newlines[index] = count
+
+        return count
+
+    def _lines_before(self, index: int) -> int:
+        """ Returns the number of newlines before piece `index`. """
+
+        lines = self._lines
+
+        while len(lines) <= index:
+            previous = len(lines) - 1
+            lines.append(lines[previous] + self._piece_newlines(previous) if lines else 0)
+
+        return lines[index]
+
+    def insert(self, offset: int, data: bytes):
+        """ Inserts bytes at an offset. """
+
+        if not 0 <= offset <= self.length:
+            raise IndexError(f'Offset {offset} outside of 0..{self.length}')
+
+        if not data:
+            return
+
+        added = self._buffers[ADDED]
+        start = len(added)
+        added += data
+
+        self._edited_newlines += data.count(b'\n')
+        pieces = self._pieces
+
+        if self._cursor is not None and self._cursor[1] == offset:
+            # Continuing the last edit, the piece ending here is known
+            index, inner = self._cursor[0] + 1, 0
+        else:
+            index, inner = self._piece_at(offset)
+
+        self.length += len(data)
+
+        if inner == 0 and index:
+            previous = pieces[index - 1]
+
+            # Typing: the previous piece ends right where the new bytes were appended
+            if previous[0] == ADDED and previous[1] + previous[2] == start:
+                previous[2] += len(data)
+                self._newlines[index - 1] = None
+                self._invalidate(index)
+                self._cursor = (index - 1, offset + len(data))
+                return
+
+        piece = [ADDED, start, len(data)]
+
+        if inner == 0:
+            pieces.insert(index, piece)
+            self._newlines.insert(index, None)
+        else:
+            buffer, piece_start, length = pieces[index]
+            pieces[index:index + 1] = [[buffer, piece_start, inner], piece, [buffer, piece_start + inner, length - inner]]
+            self._newlines[index:index + 1] = [None, None, None]
+            index += 1
+
+        self._invalidate(index)
+        self._cursor = (index, offset + len(data))
+
+    def delete(self, offset: int, length: int) -> bytes:
+        """
+        Removes bytes.
+
+        Returns:
+            bytes: The removed bytes
+        """
+
+        end = min(offset + length, self.length)
+
+        if not 0 <= offset <= end:
+            raise IndexError(f'Offset {offset} outside of 0..{self.length}')
+
+        if end == offset:
+            return b''
+
+        cursor = self._cursor
+
+        # Backspace at the end of the last edit trims its piece
+        if cursor is not None and cursor[1] == end and self._pieces[cursor[0]][2] > end - offset:
+            index = cursor[0]
+            piece = self._pieces[index]
+            piece[2] -= end - offset
+            stop = piece[1] + piece[2]
+            removed = bytes(self._buffers[piece[0]][stop:stop + end - offset])
+            self._edited_newlines -= removed.count(b'\n')
+
+            self._newlines[index] = None
+            self._invalidate(index + 1)
+            self._cursor = (index, offset)
+            self.length -= end - offset
+
+            return removed
+
+        self._cursor = None
+        removed = self.read(offset, end - offset)
+        self._edited_newlines -= removed.count(b'\n')
+
+        first, head = self._piece_at(offset)
+        last, tail = self._piece_at(end)
+        pieces = self._pieces
+        replacement = []
+
+        if head:
+            replacement.append([pieces[first][0], pieces[first][1], head])
+
+        if last < len(pieces) and tail:
+            buffer, start, piece_length = pieces[last]
+            replacement.append([buffer, start + tail, piece_length - tail])
+            last += 1
+
+        pieces[first:last] = replacement
+        self._newlines[first:last] = [None] * len(replacement)
+
+        # Deleting what was inserted into a piece joins its halves again
+        self._join(first + len(replacement))
+        self._join(first)
+
+        self._invalidate(first)
+        self.length -= end - offset
+
+        return removed
+
+    def iter_chunks(self, offset: int = 0, end: int = None, chunk_size: int = CHUNK_SIZE):
+        """ Yields the bytes between two offsets as slices of at most chunk_size. """
+
+        end = self.length if end is None else min(end, self.length)
+        index, inner = self._piece_at(offset)
+        position = offset
+
+        while position < end and index < len(self._pieces):
+            buffer, start, length = self._pieces[index]
+            data = self._buffers[buffer]
+            stop = start + min(length, inner + end - position)
+            chunk_start = start + inner
+
+            while chunk_start < stop:
+                chunk_end = min(chunk_start + chunk_size, stop)
+                yield data[chunk_start:chunk_end]
+                position += chunk_end - chunk_start
+                chunk_start = chunk_end
+
+            index += 1
+            inner = 0
+
+    def read(self, offset: int, length: int) -> bytes:
+        """ Returns `length` bytes from an offset. """
+
+        return b''.join(self.iter_chunks(offset, offset + length))
+
+    def find_newline(self, offset: int):
+        """ Returns the offset of the first newline at or after an offset, None if there is none. """
+
+        index, inner = self._piece_at(offset)
+
+        while index < len(self._pieces):
+            buffer, start, length = self._pieces[index]
+            found = self._buffers[buffer].find(b'\n', start + inner, start + length)
+
+            if found >= 0:
+                self._ensure_starts(index)
+
+                return self._starts[index] + found - start
+
+            index += 1
+            inner = 0
+
+        return None
+
+    def _newline_offset(self, n: int):
+        """ Returns the offset of newline number n, None when there are fewer. """
+
+        pieces = self._pieces
+
+        # Pieces whose newlines are counted already are skipped by bisection
+        index = max(bisect_right(self._lines, n) - 1, 0) if self._lines else 0
+
+        while index < len(pieces):
+            buffer, start, length = pieces[index]
+            line_index = self._indexes[buffer]
+            wanted = line_index.count_before(start) + n - self._lines_before(index)
+            found = line_index.find_nth(wanted, start + length)
+
+            if found is not None:
+                self._ensure_starts(index)
+
+                return self._starts[index] + found - start
+
+            index += 1
+
+        return None
+
+    def line_start(self, line: int):
+        """ Returns the offset of the first byte of a line, None past the last line. """
+
+        if line == 0:
+            return 0
+
+        newline = self._newline_offset(line - 1)
+
+        return None if newline is None else newline + 1
+
+    def line_of(self, offset: int) -> int:
+        """ Returns the line an offset is on. """
+
+        index, inner = self._piece_at(offset)
+
+        if index == len(self._pieces):
+            return self._lines_before(index)
+
+        buffer, start, _ = self._pieces[index]
+        line_index = self._indexes[buffer]
+
+        return self._lines_before(index) + line_index.count_before(start + inner) - line_index.count_before(start)
+
+    def line_count(self) -> int:
+        """ Returns the exact number of lines, indexing the whole original text if needed. """
+
+        original = self._indexes[ORIGINAL]
+
+        return original.count_before(len(original.buffer)) + self._edited_newlines + 1
+
+    def estimated_line_count(self) -> int:
+        """
+        Returns the number of lines, extrapolated from the indexed part of the original text.
+
+        The newlines of the edits are counted as they are made, so this
+        doesn't depend on the number of pieces.
+        """
+
+        original = self._indexes[ORIGINAL]
+
+        if original.complete:
+            return self.line_count()
+
+        return max(1, int(original.estimate(0, len(original.buffer)) + self._edited_newlines + 1))
+
+    def index_step(self, max_bytes: int = 8 * CHUNK_SIZE) -> bool:
+        """
+        Indexes more of the original text, for idle time.
+
+        Returns:
+            bool: Whether the text is fully indexed
+        """
+
+        return self._indexes[ORIGINAL].scan(max_bytes)
+
+    def read_lines(self, first: int, count: int, max_line_bytes: int = None) -> list:
+        """
+        Returns consecutive lines without their line breaks.
+
+        Args:
+            first (int): Number of the first line
+            count (int): Maximum number of lines
+            max_line_bytes (int, optional): Longer lines are cut to this length
+
+        Returns:
+            list: Lines as bytes, fewer than count at the end of the text
+        """
+
+        lines = []
+        position = self.line_start(first)
+
+        while position is not None and len(lines) < count:
+            newline = self.find_newline(position)
+            end = self.length if newline is None else newline
+
+            if max_line_bytes is not None:
+                end = min(end, position + max_line_bytes)
+
+            lines.append(self.read(position, end - position))
+            position = None if newline is None else newline + 1
+
+        return lines
+
+
+class TextDocument(PieceTable):
+    """
+    Piece table over a memory-mapped file.
+
+    Opening maps the file and reads nothing, pages are loaded by the
+    OS as lines are shown and indexed. Memory use beyond the mapping
+    is the sparse line index and the typed text, whatever the size of
+    the file.
+
+    Saving streams the pieces to a temporary file next to the target,
+    then renames it over the target, so an interrupted save leaves the
+    previous file intact.
+
+    Attributes:
+        path (Path): File the document was opened from or saved to, None for a new document
+        encoding (str): Encoding used to show the text
+        modified (bool): Whether there are unsaved changes
+    """
+
+    def __init__(self, path=None, encoding: str = 'utf-8'):
+        """
+        Initialize a document.
+
+        Args:
+            path (optional): File to open, an empty document when None
+            encoding (str): Encoding used to show the text
+        """
+
+        self.path = None
+        self.encoding = encoding
+        self.modified = False
+        self._map = None
+
+        super().__init__()
+
+        if path is not None:
+            self.open(path)
+
+    @staticmethod
+    def _map_file(path: Path):
+        with open(path, 'rb') as file:
+            # Empty files can't be mapped
+            if os.fstat(file.fileno()).st_size == 0:
+                return None
+
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def open(self, path):
+        """ Replaces the contents with a file, mapped instead of read. """
+
+        path = Path(path)
+        mapping = self._map_file(path)
+
+        self.close()
+        self._map = mapping
+        self._reset(mapping if mapping is not None else b'')
+        self.path = path
+        self.modified = False
+
+    def close(self):
+        """ Releases the file mapping, the document is empty afterwards. """
+
+        self._reset(b'')
+
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def insert(self, offset: int, data: bytes):
+        super().insert(offset, data)
+        self.modified = True
+
+    def delete(self, offset: int, length: int) -> bytes:
+        removed = super().delete(offset, length)
+        self.modified = self.modified or bool(removed)
+
+        return removed
+
+    def save(self, path=None):
+        """
+        Writes the document, atomically replacing the file.
+
+        Args:
+            path (optional): Target file, the document's own file when None
+        """
+
+        path = Path(path) if path is not None else self.path
+
+        if path is None:
+            raise ValueError('A new document needs a path to be saved')
+
+        temp_path = path.with_name(path.name + '.tmp')
+
+        try:
+            with open(temp_path, 'wb') as file:
+                for chunk in self.iter_chunks():
+                    file.write(chunk)
+
+                file.flush()
+                os.fsync(file.fileno())
+
+            # The replacement keeps the permissions of the file it replaces
+            if path.exists():
+                shutil.copymode(path, temp_path)
+
+            replacing_map = self._map is not None and self.path is not None and os.name == 'nt' \
+                and path.exists() and os.path.samefile(path, self.path)
+
+            # Windows refuses to replace a mapped file, the pieces are in the temporary file now
+            if replacing_map:
+                self._map.close()
+                self._map = None
+
+            try:
+                os.replace(temp_path, path)
+            except OSError:
+                if replacing_map:
+                    self._remap()
+                raise
+
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+        self.open(path)
+
+    def _remap(self):
+        """ Maps the unchanged file again after a failed save. """
+
+        self._map = self._map_file(self.path)
+        self._buffers[ORIGINAL] = self._map
+        self._indexes[ORIGINAL].buffer = self._map
@@ -0,0 +1,572 @@
+import sys
+
+from PySide6.QtCore import Qt, QEvent, QTimer, Signal
+from PySide6.QtGui import QFontDatabase, QPainter, QPalette
+from PySide6.QtWidgets import QAbstractScrollArea, QApplication, QFileDialog, QMainWindow, QMessageBox
+
+from Delta_Team.Smoke.Defaults.Bars.menubars import TextEditMenuBar
+from Delta_Team.Smoke.Defaults.Editors.documents import TextDocument
+from Delta_Team.Smoke.Defaults.Editors.history import UndoStack
+
+TAB_WIDTH = 4
+
+# Keys moving the cursor, they end the merging of keystrokes into one undo step
+_NAVIGATION_KEYS = {
+    Qt.Key.Key_Left, Qt.Key.Key_Right, Qt.Key.Key_Up, Qt.Key.Key_Down,
+    Qt.Key.Key_PageUp, Qt.Key.Key_PageDown, Qt.Key.Key_Home, Qt.Key.Key_End,
+}
+
+
+def _column_at(text: str, expanded_column: int) -> int:
+    """ Returns the column in text shown at a column of text.expandtabs(). """
+
+    shown = 0
+
+    for column, character in enumerate(text):
+        shown = (shown // TAB_WIDTH + 1) * TAB_WIDTH if character == '\t' else shown + 1
+
+        if shown > expanded_column:
+            return column
+
+    return len(text)
+
+
+class TextView(QAbstractScrollArea):
+    """
+    Plain text editor that only touches the lines on screen.
+
+    Nothing is laid out ahead of time: every paint reads the visible
+    lines from the document and draws the visible columns of them, so
+    the cost of a frame doesn't depend on the size of the file. The
+    line count behind the scroll bar is extrapolated until the document
+    is indexed, which happens a few megabytes at a time when the event
+    loop is idle.
+
+    The cursor is a line and a column of characters. The text is
+    decoded with surrogateescape, bytes that aren't valid in the
+    encoding are written back unchanged.
+
+    Every edit is recorded in `history` as the bytes it replaced. There
+    is no selection yet, so cut and copy take the cursor's line.
+
+    Signals:
+        document_changed: Emitted after an edit or when another document is shown
+    """
+
+    document_changed = Signal()
+
+    # Lines longer than this are shown cut off
+    MAX_LINE_BYTES = 64 * 1024
+    MARGIN = 4
+    UNDO_BUDGET = 16 * 1024 * 1024
+
+    def __init__(self, document: TextDocument = None, parent=None):
+        """
+        Initialize the view.
+
+        Args:
+            document (TextDocument, optional): Document to show, an empty one when None
+            parent: Parent widget
+        """
+        super().__init__(parent)
+
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.viewport().setCursor(Qt.CursorShape.IBeamCursor)
+
+        self.document = None
+        self.history = UndoStack(self.UNDO_BUDGET)
+        self.cursor_line = 0
+        self.cursor_column = 0
+
+        # Widest line painted so far, in characters
+        self._widest = 0
+
+        self._indexer = QTimer(self)
+        self._indexer.timeout.connect(self._index_step)
+
+        self.set_document(document or TextDocument())
+
+    def set_document(self, document: TextDocument):
+        """ Shows a document, closing the previous one. """
+
+        if self.document is not None and self.document is not document:
+            self.document.close()
+
+        self.document = document
+        self.history.clear()
+        self.cursor_line = self.cursor_column = 0
+        self._widest = 0
+
+        self.verticalScrollBar().setValue(0)
+        self.horizontalScrollBar().setValue(0)
+        self.refresh()
+
+    def refresh(self):
+        """ Shows the document again after it was reloaded, e.g. by saving it. """
+
+        self._update_scrollbars()
+        self._indexer.start(0)
+
+        self.viewport().update()
+        self.document_changed.emit()
+
+    def _index_step(self):
+        """ Indexes the next part of the document, while the event loop is idle. """
+
+        if self.document.index_step():
+            self._indexer.stop()
+
+        self._update_scrollbars()
+
+    def _line_height(self) -> int:
+        return self.fontMetrics().lineSpacing()
+
+    def _char_width(self) -> int:
+        return self.fontMetrics().horizontalAdvance('M')
+
+    def visible_rows(self) -> int:
+        """ Number of lines fitting in the viewport. """
+
+        return max(1, self.viewport().height() // self._line_height())
+
+    def _update_scrollbars(self):
+        rows = self.visible_rows()
+        vertical = self.verticalScrollBar()
+        vertical.setRange(0, max(0, self.document.estimated_line_count() - rows))
+        vertical.setPageStep(rows)
+
+        horizontal = self.horizontalScrollBar()
+        horizontal.setRange(0, max(0, self._widest * self._char_width() + 2 * self.MARGIN - self.viewport().width()))
+        horizontal.setPageStep(self.viewport().width())
+        horizontal.setSingleStep(self._char_width())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scrollbars()
+
+    def line_text(self, line: int) -> str:
+        """ Returns a line as shown, without its line break. """
+
+        lines = self.document.read_lines(line, 1, self.MAX_LINE_BYTES)
+
+        if not lines:
+            return ''
+
+        text = lines[0].decode(self.document.encoding, 'surrogateescape')
+
+        return text[:-1] if text.endswith('\r') else text
+
+    def offset_of(self, line: int, column: int) -> int:
+        """ Returns the document offset of a line and column. """
+
+        start = self.document.line_start(line)
+        prefix = self.line_text(line)[:column]
+
+        return start + len(prefix.encode(self.document.encoding, 'surrogateescape'))
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        palette = self.palette()
+        painter.fillRect(event.rect(), palette.color(QPalette.ColorRole.Base))
+        painter.setPen(palette.color(QPalette.ColorRole.Text))
+
+        line_height = self._line_height()
+        char_width = self._char_width()
+        ascent = self.fontMetrics().ascent()
+
+        first = self.verticalScrollBar().value()
+        scroll_x = self.horizontalScrollBar().value()
+        first_column = scroll_x // char_width
+        columns = self.viewport().width() // char_width + 2
+        x = self.MARGIN + first_column * char_width - scroll_x
+        rows = self.visible_rows() + 1
+        widest = self._widest
+
+        for row, data in enumerate(self.document.read_lines(first, rows, self.MAX_LINE_BYTES)):
+            text = data.decode(self.document.encoding, 'surrogateescape').rstrip('\r').expandtabs(TAB_WIDTH)
+            widest = max(widest, len(text))
+            painter.drawText(x, row * line_height + ascent, text[first_column:first_column + columns])
+
+        if first <= self.cursor_line < first + rows and self.hasFocus():
+            shown = self.line_text(self.cursor_line)[:self.cursor_column].expandtabs(TAB_WIDTH)
+            cursor_x = self.MARGIN + len(shown) * char_width - scroll_x
+            painter.fillRect(cursor_x, (self.cursor_line - first) * line_height, 2, line_height,
+                             palette.color(QPalette.ColorRole.Text))
+
+        painter.end()
+
+        # Lines only get measured once they are seen
+        if widest > self._widest:
+            self._widest = widest
+            self._update_scrollbars()
+
+    def focusInEvent(self, event):
+        super().focusInEvent(event)
+        self.viewport().update()
+
+    def focusOutEvent(self, event):
+        super().focusOutEvent(event)
+        self.viewport().update()
+
+    def focusNextPrevChild(self, next_child: bool) -> bool:
+        # Tab is text here
+        return False
+
+    def move_cursor(self, line: int, column: int):
+        """ Moves the cursor, clamped to the text, and scrolls it into view. """
+
+        line = max(0, line)
+
+        if self.document.line_start(line) is None:
+            line = self.document.line_count() - 1
+
+        self.cursor_line = line
+        self.cursor_column = max(0, min(column, len(self.line_text(line))))
+
+        vertical = self.verticalScrollBar()
+        rows = self.visible_rows()
+
+        if line > vertical.maximum():
+            self._update_scrollbars()
+
+        if line < vertical.value():
+            vertical.setValue(line)
+        elif line >= vertical.value() + rows:
+            vertical.setValue(line - rows + 1)
+
+        char_width = self._char_width()
+        cursor_x = len(self.line_text(line)[:self.cursor_column].expandtabs(TAB_WIDTH)) * char_width
+        horizontal = self.horizontalScrollBar()
+
+        if cursor_x < horizontal.value():
+            horizontal.setValue(cursor_x)
+        elif cursor_x > horizontal.value() + self.viewport().width() - 2 * self.MARGIN:
+            horizontal.setValue(cursor_x - self.viewport().width() + 2 * self.MARGIN)
+
+        self.viewport().update()
+
+    def _edited(self):
+        self._update_scrollbars()
+        self.viewport().update()
+        self.document_changed.emit()
+
+    def move_to_offset(self, offset: int):
+        """ Moves the cursor to a document offset. """
+
+        line = self.document.line_of(offset)
+        start = self.document.line_start(line)
+        column = len(self.document.read(start, offset - start).decode(self.document.encoding, 'surrogateescape'))
+        self.move_cursor(line, column)
+
+    def _replace(self, offset: int, length: int, data: bytes = b''):
+        """ Replaces bytes of the document, recording the edit for undo. """
+
+        removed = self.document.delete(offset, length) if length else b''
+        self.document.insert(offset, data)
+        self.history.push(offset, removed, data)
+
+    def insert_text(self, text: str):
+        """ Inserts text at the cursor and moves the cursor behind it. """
+
+        self._replace(self.offset_of(self.cursor_line, self.cursor_column), 0,
+                      text.encode(self.document.encoding, 'surrogateescape'))
+
+        lines = text.split('\n')
+
+        if len(lines) == 1:
+            self.move_cursor(self.cursor_line, self.cursor_column + len(text))
+        else:
+            self.move_cursor(self.cursor_line + len(lines) - 1, len(lines[-1]))
+
+        self._edited()
+
+    def _line_break_before(self, line: int) -> tuple:
+        """ Returns (offset, length) of the line break ending the previous line. """
+
+        newline = self.document.line_start(line) - 1
+        length = 2 if newline and self.document.read(newline - 1, 1) == b'\r' else 1
+
+        return newline - length + 1, length
+
+    def delete_backward(self):
+        """ Deletes the character before the cursor, joining lines at the start of one. """
+
+        if self.cursor_column:
+            text = self.line_text(self.cursor_line)
+            character = text[self.cursor_column - 1].encode(self.document.encoding, 'surrogateescape')
+            self._replace(self.offset_of(self.cursor_line, self.cursor_column) - len(character), len(character))
+            self.move_cursor(self.cursor_line, self.cursor_column - 1)
+
+        elif self.cursor_line:
+            column = len(self.line_text(self.cursor_line - 1))
+            self._replace(*self._line_break_before(self.cursor_line))
+            self.move_cursor(self.cursor_line - 1, column)
+
+        else:
+            return
+
+        self._edited()
+
+    def delete_forward(self):
+        """ Deletes the character after the cursor, joining lines at the end of one. """
+
+        text = self.line_text(self.cursor_line)
+
+        if self.cursor_column < len(text):
+            character = text[self.cursor_column].encode(self.document.encoding, 'surrogateescape')
+            self._replace(self.offset_of(self.cursor_line, self.cursor_column), len(character))
+
+        elif self.document.line_start(self.cursor_line + 1) is not None:
+            self._replace(*self._line_break_before(self.cursor_line + 1))
+
+        else:
+            return
+
+        self._edited()
+
+    def delete(self):
+        """ Deletes the character after the cursor. """
+
+        self.delete_forward()
+
+    def undo(self):
+        """ Reverts the last edit. """
+
+        offset = self.history.undo(self.document)
+
+        if offset is not None:
+            self.move_to_offset(offset)
+            self._edited()
+
+    def redo(self):
+        """ Applies the last undone edit again. """
+
+        offset = self.history.redo(self.document)
+
+        if offset is not None:
+            self.move_to_offset(offset)
+            self._edited()
+
+    def copy(self):
+        """ Copies the cursor's line. """
+
+        QApplication.clipboard().setText(self.line_text(self.cursor_line) + '\n')
+
+    def cut(self):
+        """ Moves the cursor's line to the clipboard. """
+
+        self.copy()
+        start = self.document.line_start(self.cursor_line)
+        end = self.document.line_start(self.cursor_line + 1)
+        self._replace(start, (self.document.length if end is None else end) - start)
+        self.history.seal()
+        self.move_cursor(self.cursor_line, 0)
+        self._edited()
+
+    def paste(self):
+        """ Inserts the clipboard text at the cursor. """
+
+        text = QApplication.clipboard().text()
+
+        if text:
+            self.insert_text(text)
+            self.history.seal()
+
+    def event(self, event):
+        # Typing and Delete must reach the editor rather than the window shortcuts
+        if event.type() == QEvent.Type.ShortcutOverride:
+            plain = not event.modifiers() & ~(Qt.KeyboardModifier.ShiftModifier | Qt.KeyboardModifier.KeypadModifier)
+
+            if plain and (event.key() in (Qt.Key.Key_Delete, Qt.Key.Key_Backspace) or event.text().isprintable()
+                          and event.text()):
+                event.accept()
+                return True
+
+        return super().event(event)
+
+    def keyPressEvent(self, event):
+        key = event.key()
+        control = bool(event.modifiers() & Qt.KeyboardModifier.ControlModifier)
+        line, column = self.cursor_line, self.cursor_column
+        rows = self.visible_rows()
+
+        if key in _NAVIGATION_KEYS:
+            self.history.seal()
+
+        if key == Qt.Key.Key_Left:
+            if column:
+                self.move_cursor(line, column - 1)
+            elif line:
+                self.move_cursor(line - 1, len(self.line_text(line - 1)))
+        elif key == Qt.Key.Key_Right:
+            if column < len(self.line_text(line)):
+                self.move_cursor(line, column + 1)
+            elif self.document.line_start(line + 1) is not None:
+                self.move_cursor(line + 1, 0)
+        elif key == Qt.Key.Key_Up:
+            self.move_cursor(line - 1, column)
+        elif key == Qt.Key.Key_Down:
+            self.move_cursor(line + 1, column)
+        elif key == Qt.Key.Key_PageUp:
+            self.move_cursor(line - rows, column)
+        elif key == Qt.Key.Key_PageDown:
+            self.move_cursor(line + rows, column)
+        elif key == Qt.Key.Key_Home:
+            self.move_cursor(0 if control else line, 0)
+        elif key == Qt.Key.Key_End:
+            # Ctrl+End needs the exact line count, which indexes the rest of the document
+            target = self.document.line_count() - 1 if control else line
+            self.move_cursor(target, len(self.line_text(target)))
+        elif key == Qt.Key.Key_Backspace:
+            self.delete_backward()
+        elif key == Qt.Key.Key_Delete:
+            self.delete_forward()
+        elif key in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+            self.insert_text('\n')
+        elif event.text() and (event.text().isprintable() or event.text() == '\t') and not control:
+            self.insert_text(event.text())
+        else:
+            super().keyPressEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() != Qt.MouseButton.LeftButton:
+            return super().mousePressEvent(event)
+
+        self.history.seal()
+        position = event.position()
+        line = self.verticalScrollBar().value() + int(position.y()) // self._line_height()
+        shown_column = (int(position.x()) - self.MARGIN + self.horizontalScrollBar().value()) // self._char_width()
+
+        if self.document.line_start(line) is None:
+            line = self.document.line_count() - 1
+
+        self.move_cursor(line, _column_at(self.line_text(line), shown_column))
+
+
+class EditorWindow(QMainWindow):
+    """
+    Window editing one text document, with the default text edit menu.
+
+    Files are opened through a memory map, see TextDocument, so large
+    logs and subtitle files open without being read.
+
+    Attributes:
+        view (TextView): The editor
+    """
+
+    WINDOW_TITLE = "Smoke Editor"
+
+    def __init__(self, path=None):
+        """
+        Initialize the window.
+
+        Args:
+            path (optional): File to open
+        """
+        super().__init__()
+
+        self.setMenuBar(TextEditMenuBar())
+
+        self.view = TextView()
+        self.view.document_changed.connect(self._update_title)
+        self.setCentralWidget(self.view)
+        self.resize(800, 600)
+
+        self._update_title()
+
+        if path is not None:
+            self.open_file(path)
+
+    @property
+    def document(self) -> TextDocument:
+        return self.view.document
+
+    def _update_title(self):
+        path = self.document.path
+        name = path.name if path is not None else "Untitled"
+        self.setWindowTitle(f"{name}{'*' if self.document.modified else ''} - {self.WINDOW_TITLE}")
+
+    def _confirm_discard(self) -> bool:
+        """ Asks to save unsaved changes, returns False when the user cancels. """
+
+        if not self.document.modified:
+            return True
+
+        answer = QMessageBox.question(
+            self, self.WINDOW_TITLE, "Save the changes to the document?",
+            QMessageBox.StandardButton.Save | QMessageBox.StandardButton.Discard | QMessageBox.StandardButton.Cancel
+        )
+
+        if answer == QMessageBox.StandardButton.Save:
+            return self.save_file()
+
+        return answer == QMessageBox.StandardButton.Discard
+
+    def new_file(self):
+        """ Replaces the document with an empty one. """
+
+        if self._confirm_discard():
+            self.view.set_document(TextDocument())
+
+    def open_file(self, path=None) -> bool:
+        """ Opens a file, asking for it when no path is given. """
+
+        if not self._confirm_discard():
+            return False
+
+        if path is None:
+            path, _ = QFileDialog.getOpenFileName(self, "Open")
+
+            if not path:
+                return False
+
+        try:
+            document = TextDocument(path)
+        except (OSError, ValueError) as error:
+            QMessageBox.warning(self, self.WINDOW_TITLE, f"Could not open {path}: {error}")
+            return False
+
+        self.view.set_document(document)
+
+        return True
+
+    def save_file(self) -> bool:
+        """ Saves the document to its file, asking for one if it has none. """
+
+        if self.document.path is None:
+            return self.save_file_as()
+
+        return self._save(self.document.path)
+
+    def save_file_as(self) -> bool:
+        """ Saves the document to a file chosen by the user. """
+
+        path, _ = QFileDialog.getSaveFileName(self, "Save As", str(self.document.path or ''))
+
+        return bool(path) and self._save(path)
+
+    def _save(self, path) -> bool:
+        try:
+            self.document.save(path)
+        except OSError as error:
+            QMessageBox.warning(self, self.WINDOW_TITLE, f"Could not save {path}: {error}")
+            return False
+
+        self.view.refresh()
+
+        return True
+
+    def closeEvent(self, event):
+        if self._confirm_discard():
+            self.document.close()
+            event.accept()
+        else:
+            event.ignore()
+
+
+if __name__ == '__main__':
+    App = QApplication(sys.argv)
+    window = EditorWindow(sys.argv[1] if len(sys.argv) > 1 else None)
+    window.show()
+    sys.exit(App.exec())
@@ -0,0 +1,249 @@
+import time
+import zlib
+from collections import deque
+
+# Approximate bytes an entry costs besides its text: the object and two bytes headers
+ENTRY_OVERHEAD = 160
+
+
+class Delta:
+    """
+    One undoable edit: `removed` was replaced by `inserted` at `offset`.
+
+    Only the changed bytes are kept, never a copy of the document.
+
+    Attributes:
+        offset (int): Document offset of the edit
+        time (float): When the edit was last extended, monotonic seconds
+        compressed (bool): Whether the texts are stored zlib-compressed
+        size (int): Bytes the entry is accounted for
+    """
+
+    __slots__ = ('offset', 'removed', 'inserted', 'time', 'compressed', 'size')
+
+    def __init__(self, offset: int, removed: bytes, inserted: bytes, time_: float):
+        self.offset = offset
+        self.removed = removed
+        self.inserted = inserted
+        self.time = time_
+        self.compressed = False
+        self.size = ENTRY_OVERHEAD + len(removed) + len(inserted)
+
+    def texts(self) -> tuple:
+        """ Returns (removed, inserted) as bytes. """
+
+        if self.compressed:
+            return zlib.decompress(self.removed), zlib.decompress(self.inserted)
+
+        return self.removed, self.inserted
+
+    def compress(self) -> int:
+        """ Compresses the texts, returns how many bytes that saved. """
+
+        removed, inserted = zlib.compress(self.removed, 1), zlib.compress(self.inserted, 1)
+        size = ENTRY_OVERHEAD + len(removed) + len(inserted)
+
+        if size >= self.size:
+            return 0
+
+        saved = self.size - size
+        self.removed, self.inserted, self.size = removed, inserted, size
+        self.compressed = True
+
+        return saved
+
+
+class UndoStack:
+    """
+    Undo and redo history of a document, bounded in memory.
+
+    Entries are deltas of the bytes an edit replaced, so pushing and
+    popping costs the same whatever the size of the document.
+    Consecutive keystrokes are merged into one entry while they
+    continue each other within MERGE_INTERVAL: typing, backspacing
+    and deleting forwards. A line break always starts a new entry.
+
+    Entries that are COMPRESS_AFTER or more edits old and larger than
+    COMPRESS_MIN are compressed, one per push. When the history
+    exceeds its budget the oldest entries are dropped. An edit larger
+    than the whole budget empties the history.
+
+    Attributes:
+        budget (int): Bytes the undo and redo entries may take together
+        memory (int): Bytes they take now
+        evicted (int): Number of entries dropped for the budget
+    """
+
+    MERGE_INTERVAL = 1.0
+    # Merged entries don't grow beyond this, so merging stays cheap
+    MERGE_LIMIT = 1024
+    COMPRESS_AFTER = 64
+    COMPRESS_MIN = 4096
+
+    def __init__(self, budget: int = 16 * 1024 * 1024):
+        """
+        Initialize an empty history.
+
+        Args:
+            budget (int): Memory budget in bytes
+        """
+
+        self.budget = budget
+        self.memory = 0
+        self.evicted = 0
+
+        self._undo = deque()
+        self._redo = deque()
+        # Whether the newest entry may still absorb the next keystroke
+        self._open = False
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self.memory = 0
+        self._open = False
+
+    def seal(self):
+        """ Makes the next edit a separate entry, e.g. after the cursor was moved. """
+
+        self._open = False
+
+    def _merge(self, offset: int, removed: bytes, inserted: bytes, now: float) -> bool:
+        """ Extends the newest entry by a keystroke continuing it, returns whether it did. """
+
+        last = self._undo[-1]
+
+        if last.compressed or now - last.time > self.MERGE_INTERVAL \
+                or last.size - ENTRY_OVERHEAD + len(removed) + len(inserted) > self.MERGE_LIMIT:
+            return False
+
+        if not removed and not last.removed:
+            # Typing on
+            if offset != last.offset + len(last.inserted) or b'\n' in inserted or b'\n' in last.inserted:
+                return False
+
+            last.inserted += inserted
+
+        elif not inserted and not last.inserted:
+            if offset + len(removed) == last.offset:
+                # Backspace
+                last.removed = removed + last.removed
+                last.offset = offset
+            elif offset == last.offset:
+                # Delete
+                last.removed += removed
+            else:
+                return False
+
+        else:
+            return False
+
+        last.time = now
+        last.size += len(removed) + len(inserted)
+        self.memory += len(removed) + len(inserted)
+
+        return True
+
+    def push(self, offset: int, removed: bytes, inserted: bytes):
+        """
+        Records an edit that was applied to the document.
+
+        Args:
+            offset (int): Offset of the edit
+            removed (bytes): Bytes it removed
+            inserted (bytes): Bytes it inserted
+        """
+
+        if not removed and not inserted:
+            return
+
+        now = time.monotonic()
+
+        while self._redo:
+            self.memory -= self._redo.pop().size
+
+        if self._open and self._undo and self._merge(offset, removed, inserted, now):
+            return
+
+        delta = Delta(offset, bytes(removed), bytes(inserted), now)
+        self._undo.append(delta)
+        self.memory += delta.size
+        self._open = True
+
+        if len(self._undo) > self.COMPRESS_AFTER:
+            aged = self._undo[-self.COMPRESS_AFTER - 1]
+
+            if not aged.compressed and aged.size >= self.COMPRESS_MIN:
+                self.memory -= aged.compress()
+
+        self._trim()
+
+    def _trim(self):
+        """ Drops the oldest entries until the history fits its budget. """
+
+        while self.memory > self.budget and (self._undo or self._redo):
+            stack = self._undo if self._undo else self._redo
+            self.memory -= stack.popleft().size
+            self.evicted += 1
+
+    def undo(self, document):
+        """
+        Reverts the newest edit.
+
+        Args:
+            document: PieceTable the edits were made to
+
+        Returns:
+            int: Offset just after the restored text, None when there is nothing to undo
+        """
+
+        if not self._undo:
+            return None
+
+        delta = self._undo.pop()
+        self._redo.append(delta)
+        self._open = False
+
+        removed, inserted = delta.texts()
+
+        if inserted:
+            document.delete(delta.offset, len(inserted))
+
+        if removed:
+            document.insert(delta.offset, removed)
+
+        return delta.offset + len(removed)
+
+    def redo(self, document):
+        """
+        Applies the newest undone edit again.
+
+        Returns:
+            int: Offset just after the inserted text, None when there is nothing to redo
+        """
+
+        if not self._redo:
+            return None
+
+        delta = self._redo.pop()
+        self._undo.append(delta)
+        self._open = False
+
+        removed, inserted = delta.texts()
+
+        if removed:
+            document.delete(delta.offset, len(removed))
+
+        if inserted:
+            document.insert(delta.offset, inserted)
+
+        return delta.offset + len(inserted)
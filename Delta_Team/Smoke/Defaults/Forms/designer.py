@@ -0,0 +1,337 @@
+"""
+Turns Qt Designer .ui files into Python form classes.
+
+    python -m Delta_Team.Smoke.Defaults.Forms.designer              # every .ui under Delta_Team
+    python -m Delta_Team.Smoke.Defaults.Forms.designer form.ui ...  # the given files
+
+Each form.ui is compiled with Qt's uic into form_ui.py next to it. The
+first line of the generated module records the SHA-1 of the .ui it was
+made from, a form is only compiled again when that hash changes.
+
+load_form() builds a form from the generated class when it is up to
+date, that is plain widget construction without parsing any XML. A
+form without (or with stale) generated code is loaded with QUiLoader
+instead. The fallback keeps the .ui contents in memory per hash and
+reuses a single loader, so QtUiTools is only imported, and its plugins
+only scanned, when a form actually needs it.
+
+The generated modules are ignored by git, rebuild after editing a form.
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib.util
+import os
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+from PySide6.QtWidgets import QWidget
+
+SEARCH_ROOT = Path(__file__).resolve().parents[3]
+GENERATED_SUFFIX = '_ui.py'
+
+_HEADER = '# ui-form: sha1={digest} class={name} base={base}\n'
+_HEADER_PATTERN = re.compile(r'# ui-form: sha1=(\w+) class=(\w+) base=(\w+)')
+_TOP_WIDGET_PATTERN = re.compile(rb'<ui\b[^>]*>.*?<widget\s+class="(\w+)"\s+name="(\w+)"', re.DOTALL)
+
+
+def generated_path(ui_path) -> Path:
+    """ Returns the path of the module generated from a .ui file. """
+
+    ui_path = Path(ui_path)
+
+    return ui_path.with_name(ui_path.stem + GENERATED_SUFFIX)
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def _top_widget(data: bytes) -> tuple:
+    """ Returns the class and object name of the top-level widget of a form. """
+
+    match = _TOP_WIDGET_PATTERN.search(data)
+
+    if match is None:
+        raise ValueError('No top-level widget in the form')
+
+    return match.group(1).decode(), match.group(2).decode()
+
+
+def _read_header(path: Path):
+    """ Returns (sha1, class name, base class) from a generated module, None if there is none. """
+
+    try:
+        with open(path, encoding='utf-8') as file:
+            match = _HEADER_PATTERN.match(file.readline())
+    except OSError:
+        return None
+
+    return match.groups() if match else None
+
+
+def prune_imports(source: str) -> str:
+    """
+    Drops the names uic imports from PySide6 without using them.
+
+    uic imports a fixed list of classes from each Qt module. Importing
+    a class initialises its enums, which made loading a generated form
+    slower than the form itself.
+    """
+
+    tree = ast.parse(source)
+    used = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+    lines = source.splitlines(keepends=True)
+
+    # Bottom up, so the line numbers of the remaining imports stay valid
+    for node in reversed(tree.body):
+        if not isinstance(node, ast.ImportFrom) or not (node.module or '').startswith('PySide6'):
+            continue
+
+        names = [alias.name for alias in node.names if (alias.asname or alias.name) in used]
+        replacement = [f'from {node.module} import {", ".join(names)}\n'] if names else []
+        lines[node.lineno - 1:node.end_lineno] = replacement
+
+    return ''.join(lines)
+
+
+def find_uic() -> list:
+    """ Returns the command running Qt's user interface compiler. """
+
+    wrapper = shutil.which('pyside6-uic')
+
+    if wrapper:
+        return [wrapper]
+
+    # The wrapper isn't on PATH in every environment, the binary ships with PySide6
+    import PySide6
+
+    for candidate in ('libexec/uic', 'Qt/libexec/uic', 'uic.exe', 'uic'):
+        path = Path(PySide6.__file__).parent / candidate
+
+        if path.is_file():
+            return [str(path), '-g', 'python']
+
+    raise FileNotFoundError('Qt user interface compiler (pyside6-uic) not found')
+
+
+def compile_form(ui_path, force: bool = False) -> bool:
+    """
+    Generates the Python module of a form, unless it is up to date.
+
+    Args:
+        ui_path: The .ui file
+        force (bool): Compile even when the hash didn't change
+
+    Returns:
+        bool: Whether the module was (re)written
+    """
+
+    ui_path = Path(ui_path)
+    data = ui_path.read_bytes()
+    digest = _digest(data)
+    output = generated_path(ui_path)
+    header = _read_header(output)
+
+    if not force and header is not None and header[0] == digest:
+        return False
+
+    base, name = _top_widget(data)
+    temp_path = output.with_name(output.name + '.tmp')
+
+    try:
+        result = subprocess.run(find_uic() + [str(ui_path)], check=True, capture_output=True)
+        source = prune_imports(result.stdout.decode('utf-8'))
+
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(_HEADER.format(digest=digest, name=name, base=base))
+            file.write(source)
+
+        os.replace(temp_path, output)
+
+    finally:
+        Path(temp_path).unlink(missing_ok=True)
+
+    return True
+
+
+def find_forms(root=SEARCH_ROOT) -> list:
+    """ Returns every .ui file below a directory, sorted. """
+
+    return sorted(Path(root).rglob('*.ui'))
+
+
+def build(paths=None, force: bool = False) -> list:
+    """
+    Compiles forms whose .ui changed since they were last generated.
+
+    Args:
+        paths (optional): .ui files, every form under Delta_Team when None
+        force (bool): Compile all of them regardless of their hash
+
+    Returns:
+        list: The .ui files that were compiled
+    """
+
+    return [path for path in (paths or find_forms()) if compile_form(path, force)]
+
+
+class _GeneratedForm:
+    """ Generated form class bound to the widget class it is set up on. """
+
+    def __init__(self, form_class, base_class):
+        self.form_class = form_class
+        self.base_class = base_class
+
+    def create(self, parent=None) -> QWidget:
+        widget = self.base_class(parent)
+        form = self.form_class()
+        form.setupUi(widget)
+        # Child widgets stay reachable as attributes, as with QUiLoader by objectName
+        widget.ui = form
+
+        return widget
+
+
+class FormLoader:
+    """
+    Builds widgets from .ui files, preferring the generated form classes.
+
+    What a .ui resolves to, the generated class or its contents for
+    QUiLoader, is cached by the modification times of the .ui and its
+    generated module. A form loaded again costs two stat calls before
+    its widgets are built, editing or recompiling it drops the entry.
+    """
+
+    def __init__(self):
+        self._forms = {}
+        self._ui_loader = None
+
+    def _key(self, ui_path: Path):
+        stat = ui_path.stat()
+        generated = generated_path(ui_path)
+
+        try:
+            generated_mtime = generated.stat().st_mtime_ns
+        except OSError:
+            generated_mtime = None
+
+        return str(ui_path), stat.st_mtime_ns, stat.st_size, generated_mtime
+
+    def _generated(self, ui_path: Path, data: bytes):
+        """ Imports the generated form of a .ui, None when missing or stale. """
+
+        output = generated_path(ui_path)
+        header = _read_header(output)
+
+        if header is None or header[0] != _digest(data):
+            return None
+
+        digest, name, base = header
+        spec = importlib.util.spec_from_file_location(f'_form_{ui_path.stem}_{digest[:12]}', output)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        from PySide6 import QtWidgets
+        base_class = getattr(QtWidgets, base, None)
+
+        # Forms promoted to custom widget classes are left to QUiLoader
+        if base_class is None:
+            return None
+
+        return _GeneratedForm(getattr(module, f'Ui_{name}'), base_class)
+
+    def is_generated(self, ui_path) -> bool:
+        """ Whether a form is built from up-to-date generated code. """
+
+        return isinstance(self._lookup(Path(ui_path)), _GeneratedForm)
+
+    def _lookup(self, ui_path: Path):
+        key = self._key(ui_path)
+        form = self._forms.get(key)
+
+        if form is None:
+            data = ui_path.read_bytes()
+            form = self._generated(ui_path, data) or QByteArray(data)
+            # Entries of an older version of the file are dropped
+            self._forms = {cached: value for cached, value in self._forms.items() if cached[0] != key[0]}
+            self._forms[key] = form
+
+        return form
+
+    def load(self, ui_path, parent=None) -> QWidget:
+        """
+        Creates the widget described by a .ui file.
+
+        Args:
+            ui_path: The .ui file
+            parent (optional): Parent widget
+
+        Returns:
+            QWidget: The form's top-level widget. Built from generated
+            code, the form object with the child widgets is its `ui`
+            attribute. Otherwise look children up with findChild().
+        """
+
+        form = self._lookup(Path(ui_path))
+
+        if isinstance(form, _GeneratedForm):
+            return form.create(parent)
+
+        if self._ui_loader is None:
+            from PySide6.QtUiTools import QUiLoader
+            self._ui_loader = QUiLoader()
+
+        buffer = QBuffer(form)
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+
+        try:
+            widget = self._ui_loader.load(buffer, parent)
+        finally:
+            buffer.close()
+
+        if widget is None:
+            raise ValueError(f'Could not load {ui_path}: {self._ui_loader.errorString()}')
+
+        return widget
+
+
+_form_loader = None
+
+
+def get_form_loader() -> FormLoader:
+    """ Returns the shared form loader. """
+    global _form_loader
+
+    if _form_loader is None:
+        _form_loader = FormLoader()
+
+    return _form_loader
+
+
+def load_form(ui_path, parent=None) -> QWidget:
+    """ Creates the widget described by a .ui file, see FormLoader.load(). """
+
+    return get_form_loader().load(ui_path, parent)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('forms', nargs='*', type=Path, help='.ui files, every form under Delta_Team by default')
+    parser.add_argument('--force', action='store_true', help='compile even when a form did not change')
+    arguments = parser.parse_args()
+
+    try:
+        compiled = build(arguments.forms, arguments.force)
+    except (OSError, ValueError, subprocess.CalledProcessError) as error:
+        sys.exit(f'Compiling the forms failed: {error}')
+
+    for path in compiled:
+        print(f'Wrote {generated_path(path)}')
+
+    print(f'{len(compiled)} form(s) compiled')
@@ -0,0 +1,232 @@
+import asyncio
+import functools
+import sys
+import threading
+
+from PySide6.QtCore import Qt, QObject, Signal, Slot
+from PySide6.QtWidgets import QApplication
+
+
+class AsyncBridge(QObject):
+    """
+    Bridge between the Qt event loop and an asyncio event loop.
+
+    The asyncio loop runs in a dedicated daemon thread, so coroutines
+    scheduled from slots never block the GUI thread. Results and errors
+    are delivered back to the GUI thread through a queued signal, where
+    the given callbacks may safely touch widgets.
+
+    Coroutines themselves run in the loop thread and must not access
+    widgets directly; return a value and handle it in on_result instead.
+
+    Signals:
+        _delivered (object): Carries finished futures to the GUI thread
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop): Loop running in the worker thread
+    """
+
+    _delivered = Signal(object)
+
+    def __init__(self, parent=None):
+        """
+        Initialize the bridge and start the loop thread.
+
+        Args:
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+
+        self.loop = asyncio.new_event_loop()
+        self._tasks = {}
+
+        self._thread = threading.Thread(target=self._run_loop, name='asyncio-bridge', daemon=True)
+        self._thread.start()
+
+        # Queued across threads since the bridge lives in the GUI thread
+        self._delivered.connect(self._on_delivered)
+
+    def _run_loop(self):
+        """ Runs the asyncio loop until the bridge is shut down. """
+
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+        self.loop.close()
+
+    def submit(self, coro, on_result=None, on_error=None, key: str = None):
+        """
+        Schedule a coroutine on the asyncio loop.
+
+        When a key is given, a still running task submitted earlier with
+        the same key is cancelled, so only the latest request of a kind
+        (e.g. the latest search) delivers its result.
+
+        Args:
+            coro: Coroutine object to run
+            on_result (callable, optional): Called in the GUI thread with the result
+            on_error (callable, optional): Called in the GUI thread with the exception
+            key (str, optional): Identifier of superseded tasks to cancel
+
+        Returns:
+            concurrent.futures.Future: Future of the scheduled coroutine
+        """
+
+        if key is not None:
+            self.cancel(key)
+
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+        if key is not None:
+            self._tasks[key] = future
+
+        future.add_done_callback(
+            lambda done: self._delivered.emit((done, on_result, on_error, key))
+        )
+
+        return future
+
+    def cancel(self, key: str):
+        """ Cancels the running task submitted with the given key, if any. """
+
+        future = self._tasks.pop(key, None)
+
+        if future is not None:
+            future.cancel()
+
+    @Slot(object)
+    def _on_delivered(self, delivery):
+        """
+        Dispatch a finished future to its callbacks in the GUI thread.
+
+        Args:
+            delivery (tuple): (future, on_result, on_error, key)
+        """
+
+        future, on_result, on_error, key = delivery
+
+        if key is not None:
+            # Superseded tasks are dropped silently, also when they finished before being cancelled
+            if self._tasks.get(key) is not future:
+                return
+
+            del self._tasks[key]
+
+        if future.cancelled():
+            return
+
+        error = future.exception()
+
+        if error is not None:
+            if on_error is not None:
+                on_error(error)
+            else:
+                # Reported like an exception raised in a slot
+                sys.excepthook(type(error), error, error.__traceback__)
+
+        elif on_result is not None:
+            on_result(future.result())
+
+    def shutdown(self):
+        """ Cancels all tasks and stops the loop thread. """
+
+        for key in list(self._tasks):
+            self.cancel(key)
+
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=1)
+
+
+_bridge = None
+
+
+def get_bridge() -> AsyncBridge:
+    """
+    Returns the process-wide bridge, creating it on first use.
+
+    The bridge is shut down automatically when the application quits.
+    """
+    global _bridge
+
+    if _bridge is None:
+        app = QApplication.instance()
+        _bridge = AsyncBridge(app)
+
+        if app is not None:
+            app.aboutToQuit.connect(_bridge.shutdown)
+
+    return _bridge
+
+
+def async_slot(key: str = None, done: str = None, error: str = None):
+    """
+    Decorator that turns a coroutine method into a regular slot.
+
+    Calling the decorated method schedules the coroutine on the shared
+    bridge and returns immediately. The names of methods to call with
+    the result or the exception in the GUI thread may be given.
+
+    Example:
+        @Slot(str)
+        @async_slot(key='search', done='_show_results')
+        async def _handle_search(self, search_term):
+            return await fetch(search_term)
+
+    Args:
+        key (str, optional): Cancel the previous call still running under this key
+        done (str, optional): Name of the method receiving the result
+        error (str, optional): Name of the method receiving the exception
+    """
+
+    def decorator(method):
+
+        @functools.wraps(method)
+        def wrapper(self, *args):
+            on_result = getattr(self, done) if done else None
+            on_error = getattr(self, error) if error else None
+
+            return get_bridge().submit(method(self, *args), on_result, on_error, key)
+
+        return wrapper
+
+    return decorator
+
+
+async def wait_signal(signal, timeout: float = None):
+    """
+    Wait in a coroutine until a Qt signal is emitted.
+
+    Must be awaited on the bridge loop. The connection is removed again
+    after the first emission (or on timeout/cancellation).
+
+    Args:
+        signal: Bound Qt signal, e.g. button.clicked
+        timeout (float, optional): Seconds to wait before raising TimeoutError
+
+    Returns:
+        tuple: The arguments the signal was emitted with
+    """
+
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(args):
+        if not future.done():
+            future.set_result(args)
+
+    def on_emitted(*args):
+        loop.call_soon_threadsafe(resolve, args)
+
+    # Direct, so the callback runs in the emitting thread rather than
+    # being queued to this thread, which has no Qt event loop
+    signal.connect(on_emitted, Qt.ConnectionType.DirectConnection)
+
+    try:
+        return await asyncio.wait_for(future, timeout)
+
+    finally:
+        try:
+            signal.disconnect(on_emitted)
+        except (RuntimeError, TypeError):
+            # Already gone together with its sender
+            pass
@@ -0,0 +1,387 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from PySide6.QtCore import QObject, QSignalBlocker, Signal, Slot
+from PySide6.QtWidgets import (QWidget, QCheckBox, QComboBox, QFormLayout, QGroupBox, QLineEdit, QSpinBox,
+                               QVBoxLayout)
+
+SETTINGS_VERSION = 1
+
+
+class Setting(NamedTuple):
+    """
+    Schema entry of one setting.
+
+    The kind follows from the default (bool, int or str) unless choices
+    are given, which makes it a pick from a fixed list.
+
+    Attributes:
+        key (str): Dotted key, the part before the first dot is its group
+        default: Value used until the user changes it
+        label (str): Text shown next to the editor
+        choices (tuple): Allowed values, None for free values
+        minimum (int): Lower bound of int settings
+        maximum (int): Upper bound of int settings
+    """
+
+    key: str
+    default: object
+    label: str
+    choices: tuple = None
+    minimum: int = 0
+    maximum: int = 1 << 30
+
+    @property
+    def group(self) -> str:
+        return self.key.partition('.')[0]
+
+    def coerce(self, value):
+        """
+        Validates a value for this setting.
+
+        Raises:
+            ValueError: If the value has the wrong type or is out of range
+        """
+
+        kind = type(self.default)
+
+        # bool is an int, an int setting must not accept True
+        if type(value) is not kind and not (kind is int and type(value) is float and value.is_integer()):
+            raise ValueError(f'{self.key} expects {kind.__name__}, got {value!r}')
+
+        value = kind(value)
+
+        if self.choices is not None and value not in self.choices:
+            raise ValueError(f'{self.key} must be one of {", ".join(map(str, self.choices))}')
+
+        if kind is int and not self.minimum <= value <= self.maximum:
+            raise ValueError(f'{self.key} must be between {self.minimum} and {self.maximum}')
+
+        return value
+
+
+class SettingsStore(QObject):
+    """
+    Typed settings held in memory and saved in the background.
+
+    The file is read once, with a single read call, when the store is
+    created; get() never touches the disk. Only values differing from
+    their default are saved, as one compact JSON object. Values that are
+    unknown or no longer valid are dropped while loading.
+
+    set() only updates memory and wakes a writer thread. The writer waits
+    until no change happened for SAVE_DELAY seconds, then writes a
+    snapshot to "<name>.tmp" and renames it over the file, so a burst of
+    changes (a slider, typing) costs one write and a crash never leaves a
+    half-written file. flush() saves right away, call it on exit.
+
+    Signals:
+        changed (str, object): Emitted from the thread calling set()
+                               Args: (key, value)
+
+    Attributes:
+        schema (dict): Setting per key
+        path (Path): Settings file
+        saves (int): Number of times the file was written
+    """
+
+    changed = Signal(str, object)
+
+    SAVE_DELAY = 0.5
+
+    def __init__(self, schema, path, parent=None):
+        """
+        Initialize the store and load the settings file.
+
+        Args:
+            schema: Iterable of Setting
+            path: Settings file, created on the first save
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+
+        self.schema = {setting.key: setting for setting in schema}
+        self.path = Path(path)
+        self.saves = 0
+
+        self._values = {key: setting.default for key, setting in self.schema.items()}
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._last_change = 0.0
+        self._version = 0
+        self._saved_version = 0
+        self._thread = None
+        self._closed = False
+
+        self._load()
+
+    def _load(self):
+        """ Reads the settings file, keeping the defaults for anything missing or invalid. """
+
+        try:
+            with open(self.path, 'rb') as file:
+                data = json.loads(file.read())
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(data, dict) or data.get('version') != SETTINGS_VERSION:
+            return
+
+        values = data.get('values')
+
+        if not isinstance(values, dict):
+            return
+
+        for key, value in values.items():
+            setting = self.schema.get(key)
+
+            if setting is None:
+                continue
+
+            try:
+                self._values[key] = setting.coerce(value)
+            except ValueError:
+                pass
+
+    def get(self, key: str):
+        """ Returns the current value of a setting. """
+
+        return self._values[key]
+
+    def __getitem__(self, key: str):
+        return self._values[key]
+
+    def values(self) -> dict:
+        """ Returns a copy of every current value. """
+
+        return dict(self._values)
+
+    def set(self, key: str, value):
+        """
+        Changes a setting and schedules a save.
+
+        Raises:
+            KeyError: For keys missing from the schema
+            ValueError: For values the setting doesn't accept
+        """
+
+        value = self.schema[key].coerce(value)
+
+        with self._lock:
+            if self._values[key] == value:
+                return
+
+            self._values[key] = value
+            self._version += 1
+            self._last_change = time.monotonic()
+
+        self._ensure_thread()
+        self._dirty.set()
+        self.changed.emit(key, value)
+
+    def reset(self, key: str):
+        """ Restores the default of a setting. """
+
+        self.set(key, self.schema[key].default)
+
+    def flush(self):
+        """ Saves pending changes now. """
+
+        with self._lock:
+            if self._version == self._saved_version:
+                return
+
+            version = self._version
+            snapshot = {
+                key: value for key, value in self._values.items() if value != self.schema[key].default
+            }
+
+        self._write(snapshot)
+
+        with self._lock:
+            self._saved_version = max(self._saved_version, version)
+
+    @Slot()
+    def close(self):
+        """ Stops the writer thread after saving pending changes. """
+
+        self._closed = True
+        self._dirty.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.flush()
+
+    def _write(self, snapshot: dict):
+        """ Replaces the settings file atomically. """
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({'version': SETTINGS_VERSION, 'values': snapshot}, file, separators=(',', ':'))
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp_path, self.path)
+        self.saves += 1
+
+    def _ensure_thread(self):
+        """ Starts the writer thread on the first change. """
+
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._write_loop, name='settings-writer', daemon=True)
+                self._thread.start()
+
+    def _write_loop(self):
+        while True:
+            self._dirty.wait()
+
+            # Debounce, wait for changes to settle
+            while not self._closed:
+                quiet = time.monotonic() - self._last_change
+
+                if quiet >= self.SAVE_DELAY:
+                    break
+
+                time.sleep(self.SAVE_DELAY - quiet)
+
+            self._dirty.clear()
+
+            if self._closed:
+                return
+
+            try:
+                self.flush()
+            except OSError:
+                # Kept in memory, retried with the next change or on exit
+                pass
+
+
+class SettingsForm(QWidget):
+    """
+    Editor generated from the schema of a settings store.
+
+    Settings get a group box per group, in schema order, and an editor
+    matching their kind: a check box for bools, a combo box for choices,
+    a spin box for ints and a line edit for strings. Edits are written
+    to the store at once, and changes made elsewhere (e.g. by the
+    options view) are reflected in the editors.
+
+    Attributes:
+        store (SettingsStore): Store being edited
+        editors (dict): Editor widget per key
+    """
+
+    def __init__(self, store: SettingsStore, group_titles: dict = None, parent=None):
+        """
+        Initialize the form.
+
+        Args:
+            store (SettingsStore): Store to edit
+            group_titles (dict, optional): Title of the group box per group name
+            parent: Parent widget
+        """
+        super().__init__(parent)
+
+        self.store = store
+        self.editors = {}
+
+        group_titles = group_titles or {}
+        layouts = {}
+
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        main_layout.setSpacing(15)
+
+        for key, setting in store.schema.items():
+            form_layout = layouts.get(setting.group)
+
+            if form_layout is None:
+                group_box = QGroupBox(group_titles.get(setting.group, setting.group.capitalize()))
+                form_layout = layouts[setting.group] = QFormLayout(group_box)
+                main_layout.addWidget(group_box)
+
+            editor = self._create_editor(setting)
+            self.editors[key] = editor
+
+            if isinstance(editor, QCheckBox):
+                form_layout.addRow(editor)
+            else:
+                form_layout.addRow(setting.label, editor)
+
+        self.setLayout(main_layout)
+
+        store.changed.connect(self._on_changed)
+
+    def _create_editor(self, setting: Setting) -> QWidget:
+        """ Creates the editor of a setting, showing its current value. """
+
+        value = self.store.get(setting.key)
+
+        if setting.choices is not None:
+            editor = QComboBox()
+
+            for choice in setting.choices:
+                editor.addItem(str(choice), choice)
+
+            editor.setCurrentIndex(setting.choices.index(value))
+            editor.currentIndexChanged.connect(
+                lambda index, key=setting.key, editor=editor: self._commit(key, editor.itemData(index))
+            )
+
+        elif type(setting.default) is bool:
+            editor = QCheckBox(setting.label)
+            editor.setChecked(value)
+            editor.toggled.connect(lambda checked, key=setting.key: self._commit(key, checked))
+
+        elif type(setting.default) is int:
+            editor = QSpinBox()
+            editor.setRange(setting.minimum, min(setting.maximum, 2 ** 31 - 1))
+            editor.setValue(value)
+            editor.valueChanged.connect(lambda number, key=setting.key: self._commit(key, number))
+
+        else:
+            editor = QLineEdit(value)
+            editor.editingFinished.connect(
+                lambda key=setting.key, editor=editor: self._commit(key, editor.text())
+            )
+
+        return editor
+
+    def _commit(self, key: str, value):
+        """ Writes an edit to the store, restoring the editor if it is rejected. """
+
+        try:
+            self.store.set(key, value)
+        except ValueError:
+            self._on_changed(key, self.store.get(key))
+
+    @Slot(str, object)
+    def _on_changed(self, key: str, value):
+        """ Shows a value changed outside the form. """
+
+        editor = self.editors.get(key)
+
+        if editor is None:
+            return
+
+        blocker = QSignalBlocker(editor)
+
+        if isinstance(editor, QComboBox):
+            editor.setCurrentIndex(editor.findData(value))
+        elif isinstance(editor, QCheckBox):
+            editor.setChecked(value)
+        elif isinstance(editor, QSpinBox):
+            editor.setValue(value)
+        else:
+            editor.setText(value)
+
+        blocker.unblock()
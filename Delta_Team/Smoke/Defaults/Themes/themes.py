@@ -0,0 +1,300 @@
+from string import Template
+
+from PySide6.QtGui import QColor, QPalette
+from PySide6.QtWidgets import QApplication
+
+
+# Design tokens, every colour used by the application lives here
+THEMES = {
+    'dark': {
+        'background': '#1e1e1e',
+        'surface': '#2b2b2b',
+        'border': '#3d3d3d',
+        'border_strong': '#5d5d5d',
+        'titlebar': '#333333',
+        'accent': '#0d7377',
+        'accent_hover': '#14a085',
+        'accent_pressed': '#0a5f62',
+        'text': '#ffffff',
+        'text_muted': '#cccccc',
+        'text_subtle': '#999999',
+        'on_accent': '#ffffff',
+    },
+    'light': {
+        'background': '#f4f4f4',
+        'surface': '#ffffff',
+        'border': '#d0d0d0',
+        'border_strong': '#a0a0a0',
+        'titlebar': '#e0e0e0',
+        'accent': '#0d7377',
+        'accent_hover': '#14a085',
+        'accent_pressed': '#0a5f62',
+        'text': '#1e1e1e',
+        'text_muted': '#3d3d3d',
+        'text_subtle': '#6d6d6d',
+        'on_accent': '#ffffff',
+    },
+}
+
+# One stylesheet for the whole application. Views are told apart by
+# their object name and labels by their "role" property, so no widget
+# needs a style sheet of its own.
+STYLESHEET = Template("""
+    QWidget {
+        background-color: $background;
+        color: $text;
+    }
+    QLabel {
+        color: $text_muted;
+    }
+
+    QLineEdit {
+        background-color: $surface;
+        border: 2px solid $border;
+        border-radius: 6px;
+        padding: 12px;
+        font-size: 14px;
+        color: $text;
+    }
+    QLineEdit:focus {
+        border: 2px solid $accent;
+    }
+
+    QGroupBox {
+        background-color: $surface;
+        border: 2px solid $border;
+        border-radius: 8px;
+        margin-top: 12px;
+        padding: 15px;
+        font-weight: bold;
+        font-size: 13px;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        subcontrol-position: top left;
+        padding: 0 10px;
+        color: $accent;
+    }
+    #OptionsWidget QGroupBox {
+        font-size: 14px;
+    }
+    #OptionsWidget QGroupBox::title {
+        subcontrol-position: top center;
+    }
+
+    QRadioButton {
+        spacing: 8px;
+        padding: 8px;
+    }
+    #OptionsWidget QRadioButton {
+        padding: 5px;
+    }
+    #OptionsWidget QRadioButton:hover {
+        color: $accent_hover;
+    }
+    QRadioButton::indicator {
+        width: 18px;
+        height: 18px;
+    }
+    QRadioButton::indicator:unchecked {
+        border: 2px solid $border_strong;
+        border-radius: 9px;
+        background-color: $surface;
+    }
+    QRadioButton::indicator:checked {
+        border: 2px solid $accent;
+        border-radius: 9px;
+        background-color: $accent;
+    }
+
+    #StartupWidget QPushButton, #SearchWidget QPushButton {
+        background-color: $accent;
+        color: $on_accent;
+        border: none;
+        border-radius: 8px;
+        font-weight: bold;
+    }
+    #StartupWidget QPushButton:hover, #SearchWidget QPushButton:hover {
+        background-color: $accent_hover;
+    }
+    #StartupWidget QPushButton:pressed, #SearchWidget QPushButton:pressed {
+        background-color: $accent_pressed;
+    }
+    #StartupWidget QPushButton {
+        padding: 20px 40px;
+        font-size: 16px;
+        min-width: 200px;
+    }
+    #SearchWidget QPushButton {
+        padding: 15px 40px;
+        font-size: 15px;
+        min-height: 50px;
+    }
+
+    QLabel[role="title"] {
+        font-size: 26px;
+        font-weight: bold;
+        color: $text;
+    }
+    #StartupWidget QLabel[role="title"] {
+        font-size: 20px;
+        font-weight: normal;
+        margin: 20px;
+    }
+    #OptionsWidget QLabel[role="title"] {
+        font-size: 24px;
+        margin: 20px;
+    }
+    #SearchWidget QLabel[role="title"] {
+        margin-bottom: 10px;
+    }
+    #SettingsWidget QLabel[role="title"] {
+        font-size: 28px;
+    }
+    QLabel[role="logo"] {
+        font-size: 48px;
+        font-weight: bold;
+        color: $accent;
+    }
+    QLabel[role="heading"] {
+        font-size: 14px;
+        font-weight: bold;
+    }
+    QLabel[role="hint"] {
+        color: $text_subtle;
+        font-weight: normal;
+        font-size: 12px;
+    }
+    QLabel[role="note"] {
+        color: $text_muted;
+        font-weight: normal;
+        margin-bottom: 10px;
+    }
+    QLabel[role="message"] {
+        font-size: 16px;
+        color: $text_subtle;
+        margin-top: 20px;
+    }
+
+    #ResultsWidget QListView {
+        background-color: $surface;
+        border: 2px solid $border;
+        border-radius: 8px;
+        outline: none;
+    }
+
+    #NavigationToolBar {
+        background-color: $surface;
+        border-right: 1px solid $border;
+        spacing: 8px;
+        padding: 10px;
+    }
+    #NavigationToolBar QToolButton {
+        color: $text;
+        background-color: transparent;
+        border: none;
+        border-radius: 6px;
+        padding: 10px;
+        font-size: 13px;
+        text-align: left;
+    }
+    #NavigationToolBar QToolButton:hover {
+        background-color: $border;
+    }
+    #NavigationToolBar QToolButton:checked {
+        background-color: $accent;
+        font-weight: bold;
+    }
+    #NavigationSpacer {
+        background-color: transparent;
+        border: none;
+    }
+
+    #CustomTitleBar, #CustomTitleBar * {
+        background-color: $titlebar;
+        color: $text;
+    }
+""")
+
+_current_theme = None
+_compiled = {}
+
+
+def compile_stylesheet(theme_name: str) -> str:
+    """ Returns the application stylesheet for a theme, compiled once per theme. """
+
+    stylesheet = _compiled.get(theme_name)
+
+    if stylesheet is None:
+        stylesheet = STYLESHEET.substitute(THEMES[theme_name])
+        _compiled[theme_name] = stylesheet
+
+    return stylesheet
+
+
+def build_palette(theme_name: str) -> QPalette:
+    """ Builds a palette matching the theme for widgets not covered by the stylesheet. """
+
+    tokens = THEMES[theme_name]
+    palette = QPalette()
+
+    palette.setColor(QPalette.ColorRole.Window, QColor(tokens['background']))
+    palette.setColor(QPalette.ColorRole.WindowText, QColor(tokens['text']))
+    palette.setColor(QPalette.ColorRole.Base, QColor(tokens['surface']))
+    palette.setColor(QPalette.ColorRole.AlternateBase, QColor(tokens['background']))
+    palette.setColor(QPalette.ColorRole.Text, QColor(tokens['text']))
+    palette.setColor(QPalette.ColorRole.PlaceholderText, QColor(tokens['text_subtle']))
+    palette.setColor(QPalette.ColorRole.Button, QColor(tokens['surface']))
+    palette.setColor(QPalette.ColorRole.ButtonText, QColor(tokens['text']))
+    palette.setColor(QPalette.ColorRole.Highlight, QColor(tokens['accent']))
+    palette.setColor(QPalette.ColorRole.HighlightedText, QColor(tokens['on_accent']))
+    palette.setColor(QPalette.ColorRole.ToolTipBase, QColor(tokens['surface']))
+    palette.setColor(QPalette.ColorRole.ToolTipText, QColor(tokens['text']))
+
+    return palette
+
+
+def apply_theme(theme_name: str = 'dark', app: QApplication = None):
+    """
+    Applies a theme to the whole application.
+
+    The palette and the compiled stylesheet are set on the QApplication
+    while updates of the top-level windows are paused, so switching
+    themes at runtime re-polishes and repaints every widget only once.
+
+    Args:
+        theme_name (str): Key of the theme in THEMES
+        app (QApplication, optional): Application to style, defaults to the running one
+    """
+    global _current_theme
+
+    app = app or QApplication.instance()
+
+    if theme_name == _current_theme:
+        return
+
+    windows = [window for window in app.topLevelWidgets() if window.isVisible()]
+
+    for window in windows:
+        window.setUpdatesEnabled(False)
+
+    app.setPalette(build_palette(theme_name))
+    app.setStyleSheet(compile_stylesheet(theme_name))
+
+    for window in windows:
+        window.setUpdatesEnabled(True)
+
+    _current_theme = theme_name
+
+
+def ensure_theme():
+    """ Applies the default theme if the application has none yet. """
+
+    if _current_theme is None:
+        apply_theme()
+
+
+def current_theme() -> str:
+    """ Returns the name of the active theme, or None before any was applied. """
+
+    return _current_theme
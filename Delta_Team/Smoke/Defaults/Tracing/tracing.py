@@ -0,0 +1,233 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from importlib.abc import MetaPathFinder
+from pathlib import Path
+
+# Path of the trace file, tracing is off while unset
+TRACE_ENV = 'SMOKE_TRACE'
+
+
+class _TimedLoader:
+    """ Loader proxy recording how long a module takes to load and run. """
+
+    def __init__(self, loader, tracer, name: str):
+        self._loader = loader
+        self._tracer = tracer
+        self._name = name
+
+    def create_module(self, spec):
+        # Extension modules (the Qt bindings) do their real work here
+        with self._tracer.span(f'{self._name} (load)', 'import'):
+            return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._tracer.span(self._name, 'import'):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _ImportTimer(MetaPathFinder):
+    """ Meta path finder wrapping the loader of every module imported while installed. """
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+
+            spec = finder.find_spec(name, path, target)
+
+            if spec is not None:
+                break
+        else:
+            return None
+
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(spec.loader, self.tracer, name)
+
+        return spec
+
+
+class StartupTracer:
+    """
+    Records where start-up time goes, as a Chrome trace.
+
+    Phases are recorded with span() and single moments with mark().
+    trace_imports() additionally times every module imported from then
+    on, nested imports show up nested. watch_first_paint() marks the
+    first paint of a window and the first idle event loop iteration
+    after it, then writes the trace.
+
+    The file is in the Trace Event Format, open it in chrome://tracing
+    or https://ui.perfetto.dev. A disabled tracer records nothing and
+    its spans cost a single attribute check.
+
+    Attributes:
+        path (Path): Trace file, None when disabled
+        enabled (bool): Whether anything is recorded
+        events (list): Recorded trace events
+    """
+
+    def __init__(self, path=None):
+        """
+        Initialize a tracer.
+
+        Args:
+            path (optional): Trace file, no tracing when None
+        """
+
+        self.path = Path(path) if path else None
+        self.enabled = self.path is not None
+        self.events = []
+
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._import_timer = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls):
+        """ Creates a tracer writing to the file named by SMOKE_TRACE, disabled if unset. """
+
+        return cls(os.environ.get(TRACE_ENV) or None)
+
+    def _timestamp(self, ns: int) -> float:
+        """ Microseconds since the tracer was created. """
+
+        return (ns - self._origin) / 1000
+
+    def span(self, name: str, category: str = 'startup', **args):
+        """
+        Context manager recording a phase.
+
+        Args:
+            name (str): Phase name
+            category (str): Trace category such as 'startup' or 'import'
+            **args: Extra values shown with the event
+        """
+
+        if not self.enabled:
+            return nullcontext()
+
+        return self._span(name, category, args)
+
+    @contextmanager
+    def _span(self, name: str, category: str, args: dict):
+        start = time.perf_counter_ns()
+
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            event = {
+                'name': name, 'cat': category, 'ph': 'X', 'pid': self._pid, 'tid': threading.get_ident(),
+                'ts': self._timestamp(start), 'dur': (end - start) / 1000,
+            }
+
+            if args:
+                event['args'] = args
+
+            with self._lock:
+                self.events.append(event)
+
+    def mark(self, name: str, category: str = 'startup'):
+        """ Records a single moment, such as the first paint. """
+
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self.events.append({
+                'name': name, 'cat': category, 'ph': 'i', 's': 'p', 'pid': self._pid,
+                'tid': threading.get_ident(), 'ts': self._timestamp(time.perf_counter_ns()),
+            })
+
+    def trace_imports(self):
+        """ Times every module imported until stop_imports() is called. """
+
+        if self.enabled and self._import_timer is None:
+            self._import_timer = _ImportTimer(self)
+            sys.meta_path.insert(0, self._import_timer)
+
+    def stop_imports(self):
+        """ Stops timing imports. """
+
+        if self._import_timer is not None:
+            sys.meta_path.remove(self._import_timer)
+            self._import_timer = None
+
+    def watch_first_paint(self, widget):
+        """
+        Marks the first paint of a widget and the first idle moment after it.
+
+        The trace is written once the event loop got idle, and written
+        again on exit to include the phases that ran lazily afterwards.
+        """
+
+        if not self.enabled:
+            return
+
+        # Qt is only needed when tracing a window
+        from PySide6.QtCore import QCoreApplication, QEvent, QObject, QTimer
+
+        tracer = self
+
+        class FirstPaintFilter(QObject):
+            def eventFilter(self, watched, event):
+                if event.type() == QEvent.Type.Paint:
+                    watched.removeEventFilter(self)
+                    tracer.mark('first paint')
+                    QTimer.singleShot(0, tracer._on_first_idle)
+
+                return False
+
+        self._paint_filter = FirstPaintFilter(widget)
+        widget.installEventFilter(self._paint_filter)
+
+        app = QCoreApplication.instance()
+
+        if app is not None:
+            app.aboutToQuit.connect(self.dump)
+
+    def _on_first_idle(self):
+        self.mark('first idle')
+        self.stop_imports()
+        self.dump()
+
+    def dump(self):
+        """ Writes the trace file, replacing it atomically. """
+
+        if not self.enabled:
+            return
+
+        with self._lock:
+            events = list(self.events)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+
+        os.replace(temp_path, self.path)
+
+
+_tracer = None
+
+
+def get_tracer() -> StartupTracer:
+    """ Returns the process-wide tracer, configured from SMOKE_TRACE on first use. """
+    global _tracer
+
+    if _tracer is None:
+        _tracer = StartupTracer.from_environment()
+
+    return _tracer
@@ -1,12 +1,18 @@
 from pathlib import Path
 
 from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QAction, QIcon
+from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import QApplication, QMainWindow, QToolBar
 
+from Delta_Team.Smoke.Defaults.Actions.commands import get_commands
+
 App = QApplication()
 icon_path = Path(__file__).resolve().parent / "Cyber-Smoke077.png"
 
+commands = get_commands()
+commands.register('smoke.commit', "Commit", shortcut="Ctrl+C", icon=str(icon_path), tooltip="Commit")
+commands.register('smoke.exit', "Exit", App.quit, icon=str(icon_path))
+
 class MainWindow(QMainWindow):
     title: str
     def __init__(self, title= "Smoke"):
@@ -24,12 +30,7 @@ class MainWindow(QMainWindow):
         )
         self.addToolBar(toolbar)
 
-        commit_action = QAction(icon, "Commit")
-        commit_action.setToolTip("Commit")
-        commit_action.setShortcut("Ctrl+C")
-        toolbar.addAction(commit_action)
-        toolbar.addSeparator()
-        toolbar.addAction(icon, "Exit").triggered.connect(App.quit)
+        commands.populate(toolbar, ('smoke.commit', None, 'smoke.exit'))
 
 
 
@@ -1,14 +1,13 @@
-from PySide6.QtGui import QIcon, QPixmap
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QSplashScreen, QLineEdit, QPushButton, QDialog, \
     QWidget, QToolBar
 
 from Delta_Team.Smoke.Defaults.Bars.menubars import TextEditMenuBar
-from Delta_Team.Images.image_finder import get_image
+from Delta_Team.Images.image_finder import get_icon, get_pixmap
 
 App = QApplication()
 
-icon_path = get_image("Cyber-Smoke077.png")
+icon_name = "Cyber-Smoke077.png"
 class MainWindow(QMainWindow):
     """ Main window class """
 
@@ -21,7 +20,7 @@ class MainWindow(QMainWindow):
 
 
         self.setMenuBar(menu)
-        self.setWindowIcon(QIcon(icon_path))
+        self.setWindowIcon(get_icon(icon_name))
         self.setMinimumSize(600,400)
 
         main_widget = QWidget()
@@ -56,7 +55,7 @@ class LoginForm(QDialog):
 
 window = MainWindow("Killer Smoke")
 splash = QSplashScreen()
-splash.setPixmap(QPixmap(icon_path))
+splash.setPixmap(get_pixmap(icon_name))
 splash.setFixedSize(600,400)
 splash.adjustSize()
 splash.show()
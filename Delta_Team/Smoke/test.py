@@ -1,15 +1,13 @@
+from pathlib import Path
+
 from PySide6.QtWidgets import QApplication, QMessageBox
-from PySide6.QtCore import QFile
-from PySide6.QtUiTools import QUiLoader
 
-app = QApplication()
+from Delta_Team.Smoke.Defaults.Forms.designer import load_form
 
-ui = QUiLoader()
-file = QFile("qt_designer_test1.ui")
-file.readAll()
+app = QApplication()
 
-window = ui.load(file)
-file.close()
+# Built from the generated form class once the designer build step ran, QUiLoader otherwise
+window = load_form(Path(__file__).resolve().parent / "qt_designer_test1.ui")
 
 window.show()
-app.exec()
\ No newline at end of file
+app.exec()
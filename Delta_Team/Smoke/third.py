@@ -1,8 +1,8 @@
 from PySide6.QtWidgets import QWidget, QLabel, QPushButton, QHBoxLayout, QVBoxLayout
-from PySide6.QtGui import QPixmap
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, QSize, Signal
 
-from Delta_Team.Images.image_finder import get_image
+from Delta_Team.Images.image_finder import get_pixmap
+from Delta_Team.Smoke.Defaults.Themes import themes
 
 
 class DetailedStartupWidget(QWidget):
@@ -39,28 +39,9 @@ class DetailedStartupWidget(QWidget):
         """
         super().__init__(parent)
 
-        # Configure widget appearance
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #1e1e1e;
-            }
-            QPushButton {
-                background-color: #0d7377;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 20px 40px;
-                font-size: 16px;
-                font-weight: bold;
-                min-width: 200px;
-            }
-            QPushButton:hover {
-                background-color: #14a085;
-            }
-            QPushButton:pressed {
-                background-color: #0a5f62;
-            }
-        """)
+        # Styled by the application theme, same look as the startup view
+        self.setObjectName('StartupWidget')
+        themes.ensure_theme()
 
         # Main layout
         main_layout = QVBoxLayout()
@@ -77,15 +58,12 @@ class DetailedStartupWidget(QWidget):
 
         animee_label = QLabel()
 
-        pixmap = QPixmap(get_image('Cyber-Smoke077.png'))
+        pixmap = get_pixmap('Cyber-Smoke077.png', QSize(400, 400), self.devicePixelRatioF())
         if not pixmap.isNull():
-            # Scale logo responsively
-            scaled_pixmap = pixmap.scaled(400, 400, Qt.AspectRatioMode.KeepAspectRatio,
-                                          Qt.TransformationMode.SmoothTransformation)
-            animee_label.setPixmap(scaled_pixmap)
+            animee_label.setPixmap(pixmap)
         else:
             animee_label.setText("ANIMEE")
-            animee_label.setStyleSheet("font-size: 48px; color: #0d7377; font-weight: bold;")
+            animee_label.setProperty('role', 'logo')
 
         animee_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         logo_layout.addWidget(animee_label)
@@ -95,7 +73,7 @@ class DetailedStartupWidget(QWidget):
         # Title label
         title_label = QLabel("Choose Your Content Type")
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title_label.setStyleSheet("font-size: 20px; color: #ffffff; margin: 20px;")
+        title_label.setProperty('role', 'title')
         main_layout.addWidget(title_label)
 
         # Buttons section
@@ -0,0 +1,77 @@
+"""
+Benchmark of segmented download throughput against the local stand-in.
+
+Serves a generated file with a per-connection rate limit and downloads
+it with increasing segment and connection counts; aggregate throughput
+should grow with the connections until the CPU or disk saturates.
+Every output is checked against the source:
+
+    python -m benchmarks.downloads --size-mb 64 --rate 8000000 --runs 1/1 2/2 4/4 8/8 16/8
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+
+from Delta_Team.Smoke.Anime_Earth.Downloads.engine import ConnectionPool, SegmentedDownload
+from Delta_Team.Smoke.Anime_Earth.Downloads.standin import serve
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=64)
+    parser.add_argument('--rate', type=int, default=8_000_000, help='bytes per second per connection')
+    parser.add_argument('--runs', nargs='+', default=['1/1', '2/2', '4/4', '8/8', '16/8'],
+                        help='segments/connections of each run')
+    arguments = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+
+    try:
+        source = os.path.join(directory, 'episode.mkv')
+
+        with open(source, 'wb') as file:
+            for _ in range(arguments.size_mb):
+                file.write(os.urandom(1024 * 1024))
+
+        with open(source, 'rb') as file:
+            digest = hashlib.sha1(file.read()).hexdigest()
+
+        server = serve(directory, rate=arguments.rate)
+        url = f'http://127.0.0.1:{server.server_address[1]}/episode.mkv'
+        destination = os.path.join(directory, 'out', 'episode.mkv')
+
+        print(f'{arguments.size_mb} MB at {arguments.rate / 1e6:.1f} MB/s per connection')
+
+        for run in arguments.runs:
+            segment_count, connections = map(int, run.split('/'))
+            pool = ConnectionPool()
+            download = SegmentedDownload(url, destination, segment_count, connections, pool=pool)
+
+            started = time.perf_counter()
+            download.start()
+            download.wait()
+            elapsed = time.perf_counter() - started
+
+            with open(destination, 'rb') as file:
+                intact = hashlib.sha1(file.read()).hexdigest() == digest
+
+            print(f'{segment_count:>3} segments / {connections:>2} connections: {download.state}, '
+                  f'{arguments.size_mb / elapsed:.1f} MB/s, connections created {pool.created}, '
+                  f'reused {pool.reused}, {"intact" if intact else "CORRUPT"}')
+
+            pool.close()
+            os.remove(destination)
+
+        server.shutdown()
+        server.server_close()
+
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark of building Designer forms with QUiLoader vs generated code.
+
+Copies a .ui file to a temporary directory, compiles it there and
+measures the first form of a fresh process through load_form(), with
+and without the generated module, then the steady-state cost per form
+of a new QUiLoader per form, a shared QUiLoader, the FormLoader
+fallback and the generated class. The working tree is never modified.
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.forms --forms 300 --runs 10
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PySide6.QtWidgets import QApplication
+
+from Delta_Team.Smoke.Defaults.Forms.designer import SEARCH_ROOT, FormLoader, compile_form
+
+FORM = SEARCH_ROOT / 'Smoke' / 'qt_designer_test1.ui'
+
+# Runs in the child process, prints the time of the first form in milliseconds
+PROBE = r'''
+import sys
+import time
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication([])
+
+from Delta_Team.Smoke.Defaults.Forms.designer import load_form
+
+started = time.perf_counter()
+load_form(sys.argv[1])
+print((time.perf_counter() - started) * 1000)
+'''
+
+
+def first_form(ui_path: Path, runs: int) -> float:
+    """ Returns the median time of the first form over `runs` fresh processes. """
+
+    environment = dict(os.environ, PYTHONPATH=str(SEARCH_ROOT.parent))
+    command = [sys.executable, '-c', PROBE, str(ui_path)]
+
+    # Warm-up run, fills the disk cache
+    subprocess.run(command, env=environment, check=True, capture_output=True)
+
+    return statistics.median(
+        float(subprocess.run(command, env=environment, check=True, capture_output=True, text=True).stdout)
+        for _ in range(runs)
+    )
+
+
+def per_form(app: QApplication, create, count: int) -> float:
+    """ Returns the mean time of building one form, in milliseconds. """
+
+    create().deleteLater()
+    started = time.perf_counter()
+
+    for _ in range(count):
+        create().deleteLater()
+
+    elapsed = time.perf_counter() - started
+    app.processEvents()
+
+    return elapsed / count * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--form', type=Path, default=FORM, help='.ui file to build')
+    parser.add_argument('--forms', type=int, default=300, help='forms built per steady-state measurement')
+    parser.add_argument('--runs', type=int, default=10, help='fresh processes per first form measurement')
+    arguments = parser.parse_args()
+
+    app = QApplication.instance() or QApplication()
+    directory = Path(tempfile.mkdtemp())
+
+    try:
+        fallback = directory / 'fallback' / arguments.form.name
+        generated = directory / 'generated' / arguments.form.name
+
+        for path in (fallback, generated):
+            path.parent.mkdir()
+            shutil.copy(arguments.form, path)
+
+        compile_form(generated)
+
+        print(f'{arguments.form.name}, first form of a fresh process, median of {arguments.runs}:')
+        print(f'  QUiLoader          {first_form(fallback, arguments.runs):6.1f} ms')
+        print(f'  generated class    {first_form(generated, arguments.runs):6.1f} ms')
+
+        from PySide6.QtCore import QFile
+        from PySide6.QtUiTools import QUiLoader
+
+        def load_file(loader):
+            file = QFile(str(fallback))
+            widget = loader.load(file)
+            file.close()
+
+            return widget
+
+        shared = QUiLoader()
+        loader = FormLoader()
+        assert not loader.is_generated(fallback) and loader.is_generated(generated)
+
+        print(f'steady state, mean of {arguments.forms} forms:')
+        print(f'  new QUiLoader per form     {per_form(app, lambda: load_file(QUiLoader()), arguments.forms):.3f} ms')
+        print(f'  shared QUiLoader           {per_form(app, lambda: load_file(shared), arguments.forms):.3f} ms')
+        print(f'  FormLoader fallback        {per_form(app, lambda: loader.load(fallback), arguments.forms):.3f} ms')
+        print(f'  FormLoader generated class {per_form(app, lambda: loader.load(generated), arguments.forms):.3f} ms')
+
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
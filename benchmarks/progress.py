@@ -0,0 +1,163 @@
+"""
+Stress test of progress reporting with 100 concurrent transfers.
+
+Measures the CPU time the GUI thread spends on progress while the
+transfers run, either with one queued signal per received chunk or
+through ProgressHub, with its window visible or hidden. Transfers are
+simulated by threads bumping segment counters, or are real downloads
+from the local stand-in server with --standin:
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.progress --mode signal
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.progress --mode hub
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.progress --mode hub --hidden
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.progress --mode hub --standin
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtWidgets import QApplication, QWidget
+
+from Delta_Team.Smoke.Anime_Earth.Downloads.engine import ConnectionPool, Segment, SegmentedDownload
+from Delta_Team.Smoke.Anime_Earth.Downloads.progress import ProgressHub
+from Delta_Team.Smoke.Anime_Earth.Downloads.standin import serve
+
+CHUNK = 16 * 1024
+
+
+class SimulatedTransfer:
+    """ Transfer whose segments are filled by writer threads, like SegmentedDownload's. """
+
+    def __init__(self, segment_count: int):
+        self.segments = [Segment(0, 1 << 40) for _ in range(segment_count)]
+        self.size = segment_count << 40
+        self.state = 'running'
+
+    @property
+    def received(self) -> int:
+        return sum(segment.received for segment in self.segments)
+
+
+class ChunkSignals(QObject):
+    """ The naive alternative: one queued signal per received chunk. """
+
+    chunk = Signal(int, int)
+
+
+def simulate(transfers: list, stop: threading.Event, on_chunk):
+    """ Starts one writer thread per segment, each adding a chunk every half millisecond. """
+
+    def write(segment, job_id):
+        while not stop.is_set():
+            segment.received += CHUNK
+
+            if on_chunk is not None:
+                on_chunk(job_id, CHUNK)
+
+            time.sleep(0.0005)
+
+    for job_id, transfer in enumerate(transfers):
+        for segment in transfer.segments:
+            threading.Thread(target=write, args=(segment, job_id), daemon=True).start()
+
+
+def start_downloads(count: int, directory: str, rate: int, on_chunk) -> list:
+    """ Starts `count` downloads of one file from the stand-in, each over its own connection. """
+
+    with open(os.path.join(directory, 'episode.mkv'), 'wb') as file:
+        file.write(os.urandom(64 * 1024 * 1024))
+
+    server = serve(directory, rate=rate)
+    url = f'http://127.0.0.1:{server.server_address[1]}/episode.mkv'
+    pool = ConnectionPool(max_idle=count)
+    downloads = []
+
+    for job_id in range(count):
+        on_progress = None if on_chunk is None else (lambda byte_count, job_id=job_id: on_chunk(job_id, byte_count))
+        download = SegmentedDownload(url, os.path.join(directory, 'out', f'{job_id}.mkv'), 1, 1,
+                                     pool=pool, on_progress=on_progress)
+        download.start()
+        downloads.append(download)
+
+    return downloads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mode', choices=('signal', 'hub'), default='hub')
+    parser.add_argument('--hidden', action='store_true', help='hide the watched window')
+    parser.add_argument('--standin', action='store_true', help='real downloads from the stand-in server')
+    parser.add_argument('--transfers', type=int, default=100)
+    parser.add_argument('--segments', type=int, default=4, help='writer threads per simulated transfer')
+    parser.add_argument('--rate', type=int, default=500_000, help='stand-in bytes per second per connection')
+    parser.add_argument('--seconds', type=float, default=3.0)
+    arguments = parser.parse_args()
+
+    app = QApplication.instance() or QApplication()
+
+    chunks = [0]
+    on_chunk = None
+
+    if arguments.mode == 'signal':
+        signals = ChunkSignals()
+        # Queued to the GUI thread like a per-chunk progress signal of a worker
+        signals.chunk.connect(lambda job_id, byte_count: chunks.__setitem__(0, chunks[0] + byte_count))
+        on_chunk = signals.chunk.emit
+
+    stop = threading.Event()
+    directory = tempfile.mkdtemp()
+
+    try:
+        if arguments.standin:
+            transfers = start_downloads(arguments.transfers, directory, arguments.rate, on_chunk)
+        else:
+            transfers = [SimulatedTransfer(arguments.segments) for _ in range(arguments.transfers)]
+            simulate(transfers, stop, on_chunk)
+
+        hub = None
+
+        if arguments.mode == 'hub':
+            hub = ProgressHub()
+            hub.progress_batch.connect(lambda updates: None)
+
+            for job_id, transfer in enumerate(transfers):
+                hub.register(job_id, transfer)
+
+            window = QWidget()
+            hub.watch(window)
+            window.show()
+
+            if arguments.hidden:
+                window.hide()
+
+        # Per-chunk signals can flood the queue so much that timers starve, the writers are stopped from a thread
+        threading.Timer(arguments.seconds, stop.set).start()
+        QTimer.singleShot(int(arguments.seconds * 1000), app.quit)
+
+        started, wall = time.thread_time(), time.perf_counter()
+        app.exec()
+        cpu, wall = time.thread_time() - started, time.perf_counter() - wall
+
+        for transfer in transfers:
+            if isinstance(transfer, SegmentedDownload):
+                transfer.pause()
+                transfer.wait(5)
+
+        received = sum(transfer.received for transfer in transfers)
+        label = arguments.mode + (' (hidden)' if arguments.hidden else '')
+        print(f'{label}, {arguments.transfers} {"stand-in" if arguments.standin else "simulated"} transfers: '
+              f'GUI thread CPU {cpu * 1000:.0f} ms over {wall:.1f} s ({cpu / wall:.1%}), '
+              f'{received / 1e6:.0f} MB received' + (f', {hub.batches} batches in {hub.ticks} ticks' if hub else ''))
+
+    finally:
+        stop.set()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
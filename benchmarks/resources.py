@@ -0,0 +1,111 @@
+"""
+Benchmark of first asset load latency from disk vs the resource bundle.
+
+Copies the Images package to a temporary tree and measures, in a fresh
+process per run, the import of image_finder (which registers the
+bundle) and reading the first assets through get_image(): straight
+from the filesystem, from the embedded images_rc.py module and from
+the memory mapped images.rcc. The working tree is never modified.
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.resources --runs 15
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from Delta_Team.Images.build_resources import IMAGES_DIR
+
+ASSETS = ('Cyber-Smoke077.png', 'Main logo.jpg', 'angry.svg')
+
+# Runs in the child process, prints the timings in milliseconds
+PROBE = r'''
+import sys
+import time
+
+from PySide6.QtCore import QFile
+from PySide6.QtWidgets import QApplication
+
+app = QApplication([])
+
+started = time.perf_counter()
+from Delta_Team.Images.image_finder import get_image
+timings = [time.perf_counter() - started]
+
+for name in sys.argv[1:]:
+    started = time.perf_counter()
+    file = QFile(get_image(name))
+    file.open(QFile.OpenModeFlag.ReadOnly)
+    file.readAll()
+    file.close()
+    timings.append(time.perf_counter() - started)
+
+print(*(timing * 1000 for timing in timings))
+'''
+
+
+def copy_images(root: Path):
+    """ Copies the Images package without generated bundles to root/Delta_Team/Images. """
+
+    package = root / 'Delta_Team'
+    package.mkdir()
+    (package / '__init__.py').touch()
+
+    shutil.copytree(IMAGES_DIR, package / 'Images',
+                    ignore=shutil.ignore_patterns('__pycache__', 'images_rc.py', 'images.rcc', '*.tmp'))
+
+
+def measure(root: Path, runs: int) -> list:
+    """ Returns the median timings over `runs` fresh processes. """
+
+    environment = dict(os.environ, PYTHONPATH=str(root))
+    # The embedded module is meant to load from bytecode, as in a frozen build
+    environment.pop('PYTHONDONTWRITEBYTECODE', None)
+    command = [sys.executable, '-c', PROBE, *ASSETS]
+
+    # Warm-up run, writes the bytecode
+    subprocess.run(command, env=environment, cwd=root, check=True, capture_output=True)
+
+    samples = [
+        [float(value) for value in subprocess.run(command, env=environment, cwd=root, check=True,
+                                                  capture_output=True, text=True).stdout.split()]
+        for _ in range(runs)
+    ]
+
+    return [statistics.median(column) for column in zip(*samples)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=15, help='fresh processes per mode')
+    arguments = parser.parse_args()
+
+    print(f'median of {arguments.runs} processes, reading {", ".join(ASSETS)}')
+
+    for mode, build_arguments in (('filesystem', None), ('images_rc.py', []), ('images.rcc', ['--binary'])):
+        root = Path(tempfile.mkdtemp())
+
+        try:
+            copy_images(root)
+
+            if build_arguments is not None:
+                subprocess.run([sys.executable, '-m', 'Delta_Team.Images.build_resources', *build_arguments],
+                               env=dict(os.environ, PYTHONPATH=str(root)), cwd=root, check=True, capture_output=True)
+
+            timings = measure(root, arguments.runs)
+
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+        reads = ', '.join(f'{timing:.3f}' for timing in timings[2:])
+        print(f'{mode:<13} import image_finder {timings[0]:6.2f} ms, first asset {timings[1]:.3f} ms, '
+              f'next assets {reads} ms')
+
+
+if __name__ == '__main__':
+    main()
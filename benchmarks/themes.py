@@ -0,0 +1,73 @@
+"""
+Benchmark of building the full MainWindow and switching themes.
+
+Builds MainWindow with all of its views and shows it, then switches
+between the dark and light theme at runtime. Run it on a checkout
+before the theme module existed for the "before" numbers, the theme
+switch is skipped there:
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.themes --rounds 15
+"""
+
+import argparse
+import statistics
+import time
+
+from PySide6.QtCore import QCoreApplication, QEvent
+from PySide6.QtWidgets import QApplication
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=15, help='windows to build, the first 3 are warm-up')
+    parser.add_argument('--switches', type=int, default=10, help='theme switches to time')
+    arguments = parser.parse_args()
+
+    app = QApplication.instance() or QApplication()
+
+    from Delta_Team.Smoke.Anime_Earth.windows import MainWindow
+
+    try:
+        from Delta_Team.Smoke.Defaults.Themes import themes
+    except ImportError:
+        themes = None
+
+    window, times = None, []
+
+    for _ in range(arguments.rounds):
+        if window is not None:
+            # Only the last window stays, the stylesheet is applied to every living widget
+            window.close()
+            window.deleteLater()
+            QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+        started = time.perf_counter()
+        window = MainWindow(prewarm=False)
+
+        for view_name in window.widget_map:
+            window._get_view(view_name)
+
+        window.show()
+        app.processEvents()
+        times.append((time.perf_counter() - started) * 1000)
+
+    print(f'full MainWindow build: {statistics.median(times[3:] or times):.2f} ms (median)')
+    print(f'widgets: {len(app.allWidgets())}')
+
+    if themes is None:
+        print('theme switch: no theme module')
+        return
+
+    times = []
+
+    for theme_name in ('light', 'dark') * (arguments.switches // 2):
+        started = time.perf_counter()
+        themes.apply_theme(theme_name)
+        app.processEvents()
+        times.append((time.perf_counter() - started) * 1000)
+
+    print(f'theme switch: {statistics.median(times):.2f} ms (median, including the repaint)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Micro-benchmark of the fuzzy title index at 10k, 100k and 1M titles.
+
+Titles are generated from a syllable vocabulary mixed with common
+English title words, 30% of them with a season suffix. Each query is
+a catalog title with one character dropped; recall@k counts the
+queries whose source title is among the top k results. Raising
+--min-lists or --scan-budget trades latency for recall on the largest
+catalogs.
+
+    python -m benchmarks.title_index --sizes 10000 100000 1000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from Delta_Team.Smoke.Anime_Earth.Search.index import TitleIndex, normalize
+
+SYLLABLES = ('ka', 'ki', 'ku', 'ke', 'ko', 'sa', 'shi', 'su', 'na', 'ni', 'no', 'ta', 'to',
+             'ma', 'mi', 'ra', 'ri', 'ro', 'ya', 'yo', 'ha', 'hi', 'ze', 'do', 'ga')
+WORDS = ('attack', 'on', 'titan', 'the', 'of', 'demon', 'slayer', 'hero', 'academy', 'my', 'sword',
+         'art', 'online', 'dragon', 'ball', 'one', 'piece', 'night', 'blue', 'black', 'clover',
+         'season', 'movie', 'ova')
+
+
+def make_titles(count: int, rng: random.Random) -> list:
+    """ Returns `count` synthetic titles. """
+
+    vocabulary = list({''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(20000)})
+    words = vocabulary + list(WORDS) * 200
+    titles = []
+
+    for _ in range(count):
+        title = ' '.join(rng.choice(words) for _ in range(rng.randint(2, 5)))
+
+        if rng.random() < 0.3:
+            title += f' season {rng.randint(1, 6)}'
+
+        titles.append(title.title())
+
+    return titles
+
+
+def percentile(values: list, fraction: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(count: int, queries: int, limit: int, scan_budget: int, min_lists: int, rng: random.Random):
+    titles = make_titles(count, rng)
+
+    started = time.perf_counter()
+    index = TitleIndex()
+
+    for title in titles:
+        index.add(title)
+
+    build = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'titles.idx')
+        started = time.perf_counter()
+        index.save(path)
+        save = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index = TitleIndex.load(path)
+        load = time.perf_counter() - started
+
+    latencies, hits = [], 0
+
+    for _ in range(queries):
+        source = titles[rng.randrange(count)]
+        dropped = rng.randrange(len(source))
+        query = source[:dropped] + source[dropped + 1:]
+
+        started = time.perf_counter()
+        results = index.fuzzy(query, limit, scan_budget=scan_budget, min_lists=min_lists)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        hits += any(normalize(titles[entry_id]) == normalize(source) for _, entry_id, _ in results)
+
+    print(f'{count:>9} titles: build {build:.2f} s, save {save:.2f} s, load {load:.2f} s, '
+          f'query p50 {percentile(latencies, 0.5):.2f} ms, p95 {percentile(latencies, 0.95):.2f} ms, '
+          f'recall@{limit} {hits / queries:.2f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=10, help='results per query')
+    parser.add_argument('--scan-budget', type=int, default=20000, help='postings scanned after the rarest lists')
+    parser.add_argument('--min-lists', type=int, default=4, help='rarest trigram lists always scanned')
+    parser.add_argument('--seed', type=int, default=1)
+    arguments = parser.parse_args()
+
+    for count in arguments.sizes:
+        run(count, arguments.queries, arguments.limit, arguments.scan_budget, arguments.min_lists,
+            random.Random(arguments.seed))
+
+
+if __name__ == '__main__':
+    main()
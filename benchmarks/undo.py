@@ -0,0 +1,122 @@
+"""
+Benchmark of the editor's undo history over a million edits.
+
+Types in runs of 100 keystrokes at random offsets, 10% of them
+backspaces, and replaces 64 KB with a paste every 10,000 edits, pushing
+every edit to an UndoStack. Reports the push cost, the entries kept and
+evicted, the history's memory against its budget and the growth of the
+process's anonymous memory, then times undoing and redoing the newest
+entries, including the document edits:
+
+    python -m benchmarks.undo --edits 1000000 --budget-mb 16
+    python -m benchmarks.undo --file big.log --edits 200000
+"""
+
+import argparse
+import random
+import time
+
+from Delta_Team.Smoke.Defaults.Editors.documents import PieceTable, TextDocument
+from Delta_Team.Smoke.Defaults.Editors.history import UndoStack
+
+RUN_LENGTH = 100
+PASTE_EVERY = 10_000
+PASTE_SIZE = 64 * 1024
+
+
+def anonymous_memory() -> int:
+    """ Returns the process's anonymous resident memory in bytes, 0 where /proc is missing. """
+
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith('RssAnon:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    return 0
+
+
+def edit(document, history: UndoStack, count: int, rng: random.Random) -> float:
+    """ Makes at least `count` edits, returns the seconds spent in push(). """
+
+    paste = rng.randbytes(PASTE_SIZE)
+    pushing = 0.0
+    edits = 0
+
+    while edits < count:
+        cursor = rng.randrange(len(document) + 1)
+
+        for _ in range(RUN_LENGTH):
+            if rng.random() < 0.9:
+                document.insert(cursor, b'x')
+                started = time.perf_counter()
+                history.push(cursor, b'', b'x')
+                pushing += time.perf_counter() - started
+                cursor += 1
+
+            elif cursor:
+                removed = document.delete(cursor - 1, 1)
+                started = time.perf_counter()
+                history.push(cursor - 1, removed, b'')
+                pushing += time.perf_counter() - started
+                cursor -= 1
+
+            edits += 1
+
+        if edits % PASTE_EVERY == 0:
+            offset = rng.randrange(max(1, len(document) - PASTE_SIZE))
+            removed = document.delete(offset, PASTE_SIZE)
+            document.insert(offset, paste)
+            started = time.perf_counter()
+            history.push(offset, removed, paste)
+            pushing += time.perf_counter() - started
+            edits += 1
+
+        # The next run starts somewhere else, as after moving the cursor
+        history.seal()
+
+    return pushing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--file', help='document to edit, an empty in-memory one by default')
+    parser.add_argument('--edits', type=int, default=1_000_000)
+    parser.add_argument('--budget-mb', type=int, default=16, help='undo history budget')
+    parser.add_argument('--undos', type=int, default=2000, help='entries undone and redone')
+    parser.add_argument('--seed', type=int, default=1)
+    arguments = parser.parse_args()
+
+    document = TextDocument(arguments.file) if arguments.file else PieceTable()
+    history = UndoStack(arguments.budget_mb * 1024 * 1024)
+    memory = anonymous_memory()
+
+    started = time.perf_counter()
+    pushing = edit(document, history, arguments.edits, random.Random(arguments.seed))
+    elapsed = time.perf_counter() - started
+
+    print(f'{arguments.edits} edits in {elapsed:.1f} s, push {pushing / arguments.edits * 1e6:.2f} us/edit')
+    print(f'entries {len(history)}, history {history.memory / 2 ** 20:.1f} MB of {arguments.budget_mb} MB, '
+          f'evicted {history.evicted}, RssAnon +{(anonymous_memory() - memory) / 2 ** 20:.0f} MB')
+
+    started, undone = time.perf_counter(), 0
+
+    while undone < arguments.undos and history.undo(document) is not None:
+        undone += 1
+
+    undo_time = time.perf_counter() - started
+    started, redone = time.perf_counter(), 0
+
+    while history.redo(document) is not None:
+        redone += 1
+
+    redo_time = time.perf_counter() - started
+
+    print(f'undo {undone}: {undo_time / max(1, undone) * 1e6:.1f} us each, '
+          f'redo {redone}: {redo_time / max(1, redone) * 1e6:.1f} us each, including the document edits')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Text document tests.
+
+    python -m unittest tests.test_documents
+"""
+
+import os
+import random
+import shutil
+import stat
+import tempfile
+import unittest
+
+from Delta_Team.Smoke.Defaults.Editors import documents
+from Delta_Team.Smoke.Defaults.Editors.documents import PieceTable, TextDocument
+
+
+class PieceTableTest(unittest.TestCase):
+
+    def setUp(self):
+        # Small blocks, so the line index spans many of them
+        original_block_size = documents.BLOCK_SIZE
+        documents.BLOCK_SIZE = 16
+        self.addCleanup(setattr, documents, 'BLOCK_SIZE', original_block_size)
+
+    def check(self, table: PieceTable, model: bytearray, rng: random.Random):
+        text = bytes(model)
+        lines = text.split(b'\n')
+
+        self.assertEqual(table.read(0, len(table)), text)
+        self.assertEqual(table.line_count(), len(lines))
+
+        for _ in range(5):
+            line = rng.randrange(len(lines) + 1)
+            start = table.line_start(line)
+
+            if line < len(lines):
+                self.assertEqual(start, sum(len(previous) + 1 for previous in lines[:line]))
+                self.assertEqual(table.line_of(start), line)
+                self.assertEqual(table.read_lines(line, 3), lines[line:line + 3])
+            else:
+                self.assertIsNone(start)
+
+            offset = rng.randrange(len(text) + 1)
+            found = text.find(b'\n', offset)
+            self.assertEqual(table.find_newline(offset), None if found < 0 else found)
+
+    def test_edits_match_model(self):
+        rng = random.Random(1)
+
+        for _ in range(100):
+            original = bytes(rng.choice(b'ab\n') for _ in range(rng.randrange(200)))
+            table, model = PieceTable(original), bytearray(original)
+            typed = None
+
+            for _ in range(60):
+                if rng.random() < 0.5 or not model:
+                    # Half of the inserts continue typing where the previous one ended
+                    offset = typed if typed is not None and rng.random() < 0.5 else rng.randrange(len(model) + 1)
+                    data = bytes(rng.choice(b'xy\n') for _ in range(rng.randrange(1, 6)))
+                    table.insert(offset, data)
+                    model[offset:offset] = data
+                    typed = offset + len(data)
+                else:
+                    if typed and rng.random() < 0.5:
+                        # Backspace at the end of what was typed
+                        offset, length = typed - 1, 1
+                        typed = offset
+                    else:
+                        offset, length = rng.randrange(len(model)), rng.randrange(1, 8)
+                        typed = None
+
+                    self.assertEqual(table.delete(offset, length), bytes(model[offset:offset + length]))
+                    del model[offset:offset + length]
+
+                self.assertEqual(len(table), len(model))
+
+                if rng.random() < 0.2:
+                    self.check(table, model, rng)
+
+            self.check(table, model, rng)
+
+    def test_estimated_line_count(self):
+        original = b'line\n' * 1000
+        table = PieceTable(original)
+        table.index_step(1000)
+        table.insert(10, b'new\nlines\n')
+        table.delete(100, 50)
+
+        expected = original[:10] + b'new\nlines\n' + original[10:]
+        expected = expected[:100] + expected[150:]
+
+        # Extrapolated while the original is partly indexed, exact once it is indexed
+        self.assertAlmostEqual(table.estimated_line_count(), expected.count(b'\n') + 1, delta=5)
+
+        while not table.index_step(64):
+            pass
+
+        self.assertEqual(table.estimated_line_count(), expected.count(b'\n') + 1)
+        self.assertEqual(table.line_count(), expected.count(b'\n') + 1)
+
+
+class TextDocumentSaveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+        self.path = os.path.join(self.directory, 'notes.txt')
+
+        with open(self.path, 'wb') as file:
+            file.write(b'first\nsecond\n')
+
+    def open(self) -> TextDocument:
+        document = TextDocument(self.path)
+        self.addCleanup(document.close)
+
+        return document
+
+    def test_save_replaces_contents(self):
+        document = self.open()
+        document.insert(6, b'inserted\n')
+        document.save()
+
+        with open(self.path, 'rb') as file:
+            self.assertEqual(file.read(), b'first\ninserted\nsecond\n')
+
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    @unittest.skipIf(os.name == 'nt', 'POSIX permissions')
+    def test_save_keeps_file_mode(self):
+        os.chmod(self.path, 0o600)
+
+        document = self.open()
+        document.insert(0, b'secret ')
+        document.save()
+
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,260 @@
+"""
+Download engine tests against the local HTTP stand-in.
+
+    python -m unittest tests.test_downloads
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from Delta_Team.Smoke.Anime_Earth.Downloads.engine import ConnectionPool, DownloadError, SegmentedDownload, write_all
+from Delta_Team.Smoke.Anime_Earth.Downloads.journal import DownloadJournal
+from Delta_Team.Smoke.Anime_Earth.Downloads.standin import RangeRequestHandler, serve
+
+SIZE = 3 * 1024 * 1024
+
+
+class BadLengthHandler(RangeRequestHandler):
+    """ Answers every request with an unparsable Content-Range. """
+
+    def do_GET(self):
+        self.send_response(206)
+        self.send_header('Content-Range', 'bytes 0-0/lots')
+        self.send_header('Content-Length', '1')
+        self.end_headers()
+        self.wfile.write(b'x')
+
+
+class ShortBodyHandler(RangeRequestHandler):
+    """ Announces the whole file but drops the connection after its first kilobyte. """
+
+    def _send_body(self, file, remaining: int):
+        self.wfile.write(file.read(min(1000, remaining)))
+        self.close_connection = True
+
+
+class ShortWriteFile:
+    """ Raw file taking at most `limit` bytes per write, like a pipe or a full disk buffer. """
+
+    name = 'short'
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.data = bytearray()
+
+    def write(self, data) -> int:
+        written = bytes(data[:self.limit])
+        self.data += written
+
+        return len(written)
+
+
+class DownloadTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+        self.source = os.urandom(SIZE)
+
+        with open(os.path.join(self.directory, 'episode.mkv'), 'wb') as file:
+            file.write(self.source)
+
+        self.destination = os.path.join(self.directory, 'out', 'episode.mkv')
+
+    def serve(self, **kwargs) -> str:
+        server = serve(self.directory, **kwargs)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        return f'http://127.0.0.1:{server.server_address[1]}/episode.mkv'
+
+    def download(self, url: str, **kwargs) -> SegmentedDownload:
+        pool = ConnectionPool()
+        self.addCleanup(pool.close)
+
+        return SegmentedDownload(url, self.destination, pool=pool, **kwargs)
+
+    def pause_after(self, download, byte_count: int) -> threading.Event:
+        """ Pauses the download from its progress callback once byte_count bytes arrived. """
+
+        paused = threading.Event()
+
+        def on_progress(_):
+            if not paused.is_set() and download.received >= byte_count:
+                paused.set()
+                download.pause()
+
+        download.on_progress = on_progress
+
+        return paused
+
+    def assert_downloaded(self, download):
+        self.assertEqual(download.state, 'finished', download.error)
+
+        with open(self.destination, 'rb') as file:
+            self.assertEqual(file.read(), self.source)
+
+
+class SegmentedDownloadTest(DownloadTestCase):
+
+    def test_segments_reassemble_in_place(self):
+        download = self.download(self.serve(), segment_count=4, connections=4)
+        download.start()
+
+        self.assertTrue(download.wait(30))
+        self.assert_downloaded(download)
+        self.assertGreater(len(download.segments), 1)
+
+    def test_pause_and_resume(self):
+        download = self.download(self.serve(rate=4_000_000), segment_count=4, connections=2)
+        self.pause_after(download, SIZE // 3)
+        download.start()
+
+        self.assertTrue(download.wait(30))
+        self.assertEqual(download.state, 'paused')
+        self.assertLess(download.received, SIZE)
+
+        download.resume()
+
+        self.assertTrue(download.wait(30))
+        self.assert_downloaded(download)
+
+    def test_resume_without_range_support_starts_over(self):
+        download = self.download(self.serve(ranges=False, rate=4_000_000))
+        self.pause_after(download, SIZE // 3)
+        download.start()
+
+        self.assertTrue(download.wait(30))
+        self.assertEqual(download.state, 'paused')
+
+        download.on_progress = None
+        download.resume()
+
+        self.assertTrue(download.wait(30))
+        self.assert_downloaded(download)
+        self.assertEqual(download.received, SIZE)
+
+    def test_resume_while_pausing_is_kept(self):
+        download = self.download(self.serve(rate=2_000_000), segment_count=4, connections=2)
+        paused = self.pause_after(download, SIZE // 4)
+        finished = []
+        download.on_finished = finished.append
+
+        download.start()
+        self.assertTrue(paused.wait(30))
+        # The workers are still winding down from the pause
+        download.resume()
+
+        self.assertTrue(download.wait(30))
+        self.assert_downloaded(download)
+        self.assertEqual(finished, [download])
+
+    def test_malformed_headers_fail_the_download(self):
+        server = serve(self.directory, handler=BadLengthHandler)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        finished = []
+        download = self.download(f'http://127.0.0.1:{server.server_address[1]}/episode.mkv', on_finished=finished.append)
+        download.start()
+
+        self.assertTrue(download.wait(10))
+        self.assertEqual(download.state, 'failed')
+        self.assertIsInstance(download.error, ValueError)
+        self.assertEqual(finished, [download])
+
+    def test_body_cut_short_fails_the_download(self):
+        for ranges in (True, False):
+            with self.subTest(ranges=ranges):
+                server = serve(self.directory, ranges=ranges, handler=ShortBodyHandler)
+                self.addCleanup(server.server_close)
+                self.addCleanup(server.shutdown)
+
+                download = self.download(f'http://127.0.0.1:{server.server_address[1]}/episode.mkv')
+                download.start()
+
+                self.assertTrue(download.wait(10))
+                self.assertEqual(download.state, 'failed')
+                self.assertIsInstance(download.error, DownloadError)
+                self.assertFalse(os.path.exists(self.destination))
+
+
+class JournalRestartTest(DownloadTestCase):
+    """ Downloads interrupted by an exit and resumed from the journal, as at the next launch. """
+
+    def setUp(self):
+        super().setUp()
+        self.journal_path = os.path.join(self.directory, 'downloads.journal')
+
+    def interrupt(self, download) -> list:
+        """ Runs the download under a journal until it stopped, returns what the next launch recovers. """
+
+        journal = DownloadJournal(self.journal_path)
+        journal.track(self.destination, download)
+        download.start()
+
+        self.assertTrue(download.wait(30))
+        journal.close()
+
+        return DownloadJournal(self.journal_path).recover()
+
+    def test_ranged_download_continues(self):
+        download = self.download(self.serve(rate=4_000_000), segment_count=4, connections=2)
+        self.pause_after(download, SIZE // 3)
+
+        state, = self.interrupt(download)
+        self.assertEqual(state.size, SIZE)
+        self.assertLess(state.missing, SIZE)
+
+        download = self.download(state.url, segments=state.segments)
+        download.start()
+
+        self.assertTrue(download.wait(30))
+        self.assert_downloaded(download)
+
+    def test_download_without_range_support_starts_over(self):
+        url = self.serve(ranges=False, rate=4_000_000)
+        download = self.download(url)
+        self.pause_after(download, SIZE // 3)
+
+        state, = self.interrupt(download)
+        self.assertEqual(state.segments, [])
+        self.assertEqual(state.missing, SIZE)
+
+        download = self.download(state.url, segments=state.segments)
+        download.start()
+
+        self.assertTrue(download.wait(30))
+        self.assert_downloaded(download)
+
+    def test_failed_download_is_not_resumed(self):
+        server = serve(self.directory, handler=ShortBodyHandler)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        download = self.download(f'http://127.0.0.1:{server.server_address[1]}/episode.mkv')
+
+        self.assertEqual(self.interrupt(download), [])
+        self.assertEqual(download.state, 'failed')
+
+
+class WriteAllTest(unittest.TestCase):
+
+    def test_short_writes_are_continued(self):
+        file = ShortWriteFile(1000)
+        data = os.urandom(64 * 1024)
+        write_all(file, data)
+
+        self.assertEqual(bytes(file.data), data)
+
+    def test_a_stuck_file_raises(self):
+        with self.assertRaises(OSError):
+            write_all(ShortWriteFile(0), b'data')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Undo history tests, replaying random edits against a bytearray model.
+
+    python -m unittest tests.test_history
+"""
+
+import random
+import unittest
+
+from Delta_Team.Smoke.Defaults.Editors.documents import PieceTable
+from Delta_Team.Smoke.Defaults.Editors.history import UndoStack
+
+
+class UndoStackTest(unittest.TestCase):
+
+    def make_history(self, budget: int = 10 ** 9) -> UndoStack:
+        history = UndoStack(budget)
+        # Small thresholds, so compressed entries are undone too
+        history.COMPRESS_AFTER = 4
+        history.COMPRESS_MIN = 10
+
+        return history
+
+    def edit(self, table: PieceTable, history: UndoStack, model: bytearray, cursor: int, rng: random.Random) -> int:
+        """ Applies a keystroke, delete or replacement to the table and the model, returns the cursor after it. """
+
+        choice = rng.random()
+
+        if choice < 0.5 or not model:
+            data = bytes(rng.choice(b'xy\n') for _ in range(rng.choice((1, 1, 1, 3, 30))))
+            offset = cursor if rng.random() < 0.7 else rng.randrange(len(model) + 1)
+            removed = b''
+            cursor = offset + len(data)
+        elif choice < 0.8:
+            if cursor and rng.random() < 0.5:
+                offset, length = cursor - 1, 1
+            else:
+                offset, length = rng.randrange(len(model)), rng.randrange(1, 5)
+
+            data = b''
+            removed = bytes(model[offset:offset + length])
+            cursor = offset
+        else:
+            offset, length = rng.randrange(len(model)), rng.randrange(1, 5)
+            data = b'REPL'
+            removed = bytes(model[offset:offset + length])
+            cursor = offset
+
+        if removed:
+            self.assertEqual(table.delete(offset, len(removed)), removed)
+
+        if data:
+            table.insert(offset, data)
+
+        model[offset:offset + len(removed)] = data
+        history.push(offset, removed, data)
+
+        if rng.random() < 0.1:
+            history.seal()
+
+        return cursor
+
+    def test_round_trip(self):
+        rng = random.Random(5)
+
+        for _ in range(200):
+            original = bytes(rng.choice(b'ab\n') for _ in range(rng.randrange(100)))
+            table, model, history = PieceTable(original), bytearray(original), self.make_history()
+            snapshots = []
+            cursor = 0
+
+            for _ in range(80):
+                cursor = self.edit(table, history, model, cursor, rng)
+                self.assertEqual(table.read(0, len(table)), bytes(model))
+
+            final = bytes(model)
+
+            while history.undo(table) is not None:
+                snapshots.append(table.read(0, len(table)))
+
+            self.assertEqual(snapshots[-1] if snapshots else final, original)
+            self.assertEqual(table.line_count(), original.count(b'\n') + 1)
+
+            # Redoing walks back through the same states
+            for snapshot in reversed(snapshots[:-1]):
+                self.assertIsNotNone(history.redo(table))
+                self.assertEqual(table.read(0, len(table)), snapshot)
+
+            history.redo(table)
+            self.assertEqual(table.read(0, len(table)), final)
+            self.assertFalse(history.can_redo())
+
+    def test_edit_after_undo_drops_redo(self):
+        table, history = PieceTable(b'text'), self.make_history()
+        table.insert(4, b' more')
+        history.push(4, b'', b' more')
+
+        history.undo(table)
+        self.assertTrue(history.can_redo())
+
+        table.insert(0, b'Q')
+        history.push(0, b'', b'Q')
+
+        self.assertFalse(history.can_redo())
+        self.assertEqual(table.read(0, len(table)), b'Qtext')
+
+    def test_keystrokes_merge_until_line_break(self):
+        table, history = PieceTable(), self.make_history()
+
+        for offset, key in enumerate(b'hello\nworld'):
+            table.insert(offset, bytes([key]))
+            history.push(offset, b'', bytes([key]))
+
+        self.assertEqual(len(history), 3)
+
+        history.undo(table)
+        self.assertEqual(table.read(0, len(table)), b'hello\n')
+
+        history.undo(table)
+        self.assertEqual(table.read(0, len(table)), b'hello')
+
+    def test_budget_evicts_oldest(self):
+        rng = random.Random(1)
+        table, model, history = PieceTable(), bytearray(), self.make_history(budget=4096)
+        cursor = 0
+
+        for _ in range(2000):
+            cursor = self.edit(table, history, model, cursor, rng)
+
+        self.assertLessEqual(history.memory, history.budget)
+        self.assertGreater(history.evicted, 0)
+
+        final = bytes(model)
+
+        while history.undo(table) is not None:
+            pass
+
+        while history.redo(table) is not None:
+            pass
+
+        self.assertEqual(table.read(0, len(table)), final)
+
+
+if __name__ == '__main__':
+    unittest.main()
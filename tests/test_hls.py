@@ -0,0 +1,115 @@
+"""
+HLS download tests against the local HTTP stand-in.
+
+    python -m unittest tests.test_hls
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from Delta_Team.Smoke.Anime_Earth.Downloads.engine import ConnectionPool, DownloadError
+from Delta_Team.Smoke.Anime_Earth.Downloads.hls import HlsDownload
+from Delta_Team.Smoke.Anime_Earth.Downloads.standin import RangeRequestHandler, serve, write_hls_fixture
+
+SEGMENT_SIZE = 100_000
+
+
+class ShortSegmentHandler(RangeRequestHandler):
+    """ Serves the playlists whole but drops the connection after the first kilobyte of a media segment. """
+
+    def _send_body(self, file, remaining: int):
+        if not self.path.endswith('.ts'):
+            super()._send_body(file, remaining)
+            return
+
+        self.wfile.write(file.read(min(1000, remaining)))
+        self.close_connection = True
+
+
+class HlsDownloadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+        self.destination = os.path.join(self.directory, 'out', 'episode.ts')
+
+    def serve(self, **kwargs) -> str:
+        server = serve(self.directory, **kwargs)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        return f'http://127.0.0.1:{server.server_address[1]}'
+
+    def download(self, url: str, **kwargs) -> HlsDownload:
+        pool = ConnectionPool()
+        self.addCleanup(pool.close)
+
+        download = HlsDownload(url, self.destination, pool=pool, **kwargs)
+        download.start()
+        self.assertTrue(download.wait(30))
+
+        return download
+
+    def write_byte_range_stream(self) -> bytes:
+        """ Writes one media file split into three segments by #EXT-X-BYTERANGE. """
+
+        media = os.urandom(3 * SEGMENT_SIZE)
+
+        with open(os.path.join(self.directory, 'media.ts'), 'wb') as file:
+            file.write(media)
+
+        lines = ['#EXTM3U', '#EXT-X-VERSION:4', '#EXT-X-TARGETDURATION:4']
+
+        for index in range(3):
+            lines += ['#EXTINF:4.0,', f'#EXT-X-BYTERANGE:{SEGMENT_SIZE}@{index * SEGMENT_SIZE}', 'media.ts']
+
+        with open(os.path.join(self.directory, 'index.m3u8'), 'w') as file:
+            file.write('\n'.join(lines + ['#EXT-X-ENDLIST']) + '\n')
+
+        return media
+
+    def test_segments_are_written_in_order(self):
+        playlist = write_hls_fixture(self.directory, segment_count=12, segment_size=32 * 1024, heights=(720, 360))
+        download = self.download(f'{self.serve()}/{playlist}', quality='720p', connections=3)
+
+        self.assertEqual(download.state, 'finished', download.error)
+
+        with open(self.destination, 'rb') as file:
+            data = file.read()
+
+        self.assertEqual(len(data), 12 * 32 * 1024)
+
+        for index in range(12):
+            self.assertTrue(data[index * 32 * 1024:].startswith(f'720p segment {index:06d}\n'.encode()))
+
+    def test_byte_ranges(self):
+        media = self.write_byte_range_stream()
+        download = self.download(f'{self.serve()}/index.m3u8')
+
+        self.assertEqual(download.state, 'finished', download.error)
+
+        with open(self.destination, 'rb') as file:
+            self.assertEqual(file.read(), media)
+
+    def test_byte_ranges_ignored_by_the_server_fail(self):
+        self.write_byte_range_stream()
+        download = self.download(f'{self.serve(ranges=False)}/index.m3u8')
+
+        self.assertEqual(download.state, 'failed')
+        self.assertIsInstance(download.error, DownloadError)
+        self.assertFalse(os.path.exists(self.destination))
+
+    def test_segments_cut_short_fail(self):
+        playlist = write_hls_fixture(self.directory, segment_count=4, segment_size=32 * 1024, heights=(720,))
+        download = self.download(f'{self.serve(handler=ShortSegmentHandler)}/{playlist}')
+
+        self.assertEqual(download.state, 'failed')
+        self.assertIsInstance(download.error, DownloadError)
+        self.assertFalse(os.path.exists(self.destination))
+
+
+if __name__ == '__main__':
+    unittest.main()
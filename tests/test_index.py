@@ -0,0 +1,102 @@
+"""
+Title index tests.
+
+    python -m unittest tests.test_index
+"""
+
+import asyncio
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from Delta_Team.Smoke.Anime_Earth.Search import index as index_module
+from Delta_Team.Smoke.Anime_Earth.Search.index import TitleIndex, get_index_async
+
+TITLES = (
+    ('Attack on Titan', ('Shingeki no Kyojin',)),
+    ('Attack on Titan Season 3', ()),
+    ('Demon Slayer', ('Kimetsu no Yaiba',)),
+    ('My Hero Academia', ('Boku no Hero Academia',)),
+    ('Sword Art Online', ()),
+)
+
+
+class TitleIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+        self.path = os.path.join(self.directory, 'titles.idx')
+        self.index = TitleIndex()
+
+        for title, alt_names in TITLES:
+            self.index.add(title, alt_names)
+
+    def assertSameLookups(self, index: TitleIndex):
+        self.assertEqual(index.titles, self.index.titles)
+        self.assertEqual(index.exact('kimetsu no yaiba'), [(2, 'Demon Slayer')])
+        self.assertEqual(index.prefix('attack'), self.index.prefix('attack'))
+        self.assertEqual(index.fuzzy('atack on titan'), self.index.fuzzy('atack on titan'))
+        self.assertEqual(index.fuzzy('atack on titan')[0][2], 'Attack on Titan')
+
+    def test_save_and_load(self):
+        self.index.save(self.path)
+
+        self.assertSameLookups(TitleIndex.load(self.path))
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_load_rejects_other_files(self):
+        with open(self.path, 'wb') as file:
+            pickle.dump((2, self.index.__dict__), file)
+
+        self.assertIsNone(TitleIndex.load(self.path))
+        self.assertIsNone(TitleIndex.load(os.path.join(self.directory, 'missing.idx')))
+
+    def test_load_rejects_truncated_file(self):
+        self.index.save(self.path)
+
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) - 4)
+
+        self.assertIsNone(TitleIndex.load(self.path))
+
+
+class GetIndexAsyncTest(unittest.TestCase):
+
+    def test_loading_does_not_block_the_loop(self):
+        loaded = threading.Event()
+
+        def slow_load():
+            time.sleep(0.3)
+            loaded.set()
+            return TitleIndex()
+
+        async def scenario():
+            lookup = asyncio.ensure_future(get_index_async())
+            started = time.perf_counter()
+
+            # The loop keeps running while the index loads
+            await asyncio.sleep(0.05)
+            self.assertLess(time.perf_counter() - started, 0.2)
+
+            lookup.cancel()
+
+            with self.assertRaises(asyncio.CancelledError):
+                await lookup
+
+            self.assertFalse(loaded.is_set())
+
+            return await get_index_async()
+
+        with mock.patch.object(index_module, '_index', None), mock.patch.object(index_module, 'load_index', slow_load):
+            self.assertIsInstance(asyncio.run(scenario()), TitleIndex)
+
+
+if __name__ == '__main__':
+    unittest.main()
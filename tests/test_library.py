@@ -0,0 +1,51 @@
+"""
+Library index tests.
+
+    python -m unittest tests.test_library
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from Delta_Team.Smoke.Anime_Earth.Downloads.library import LibraryIndex
+
+SAMPLE = 64 * 1024
+
+
+class FindDuplicatesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+    def write(self, relative: str, data: bytes):
+        path = os.path.join(self.directory, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, 'wb') as file:
+            file.write(data)
+
+    def test_equal_samples_are_confirmed_whole(self):
+        head, tail = os.urandom(SAMPLE), os.urandom(SAMPLE)
+        episode = head + os.urandom(SAMPLE) + tail
+
+        self.write(os.path.join('Series', 'Episode 1.mkv'), episode)
+        self.write(os.path.join('Copy', 'Episode 1.mkv'), episode)
+        # Same size, beginning and end, only the middle differs
+        self.write(os.path.join('Series', 'Episode 2.mkv'), head + os.urandom(SAMPLE) + tail)
+
+        index = LibraryIndex(self.directory)
+        index.scan()
+
+        groups = index.find_duplicates()
+
+        self.assertEqual([sorted(group) for group in groups],
+                         [sorted([os.path.join('Series', 'Episode 1.mkv'), os.path.join('Copy', 'Episode 1.mkv')])])
+        self.assertEqual(index.digest(os.path.join(self.directory, 'Series', 'Episode 2.mkv')),
+                         index.digest(os.path.join(self.directory, 'Copy', 'Episode 1.mkv')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+"""
+Download scheduler tests with simulated transfers.
+
+    python -m unittest tests.test_scheduler
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from Delta_Team.Smoke.Anime_Earth.Downloads.journal import DownloadJournal
+from Delta_Team.Smoke.Anime_Earth.Downloads.scheduler import DownloadScheduler
+
+
+class SimulatedDownload:
+    """ Transfer taking `steps` ticks, stopping a little while after a pause like a real one. """
+
+    steps = 20
+    tick = 0.005
+    wind_down = 0.05
+
+    def __init__(self, url, destination, segment_count, connections, limiter=None, on_finished=None, **kwargs):
+        self.url = url
+        self.destination = Path(destination)
+        self.part_path = self.destination.with_name(self.destination.name + '.part')
+        self.segments = []
+        self.ranged = False
+        self.size = None
+        self.on_finished = on_finished
+        self.state = 'idle'
+        self.done_steps = 0
+        self.runs = 0
+        self._paused = threading.Event()
+
+    def start(self):
+        self.state = 'running'
+        self.runs += 1
+        self._paused.clear()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def pause(self):
+        self._paused.set()
+
+    def _run(self):
+        while self.done_steps < self.steps:
+            if self._paused.is_set():
+                time.sleep(self.wind_down)
+                self.state = 'paused'
+                self.on_finished(self)
+                return
+
+            time.sleep(self.tick)
+            self.done_steps += 1
+
+        self.state = 'finished'
+        self.on_finished(self)
+
+
+def wait_until(predicate, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+
+        time.sleep(0.005)
+
+    return True
+
+
+class DownloadSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = DownloadScheduler(max_active=2, download_factory=SimulatedDownload)
+
+    def test_jobs_beyond_the_limit_wait(self):
+        jobs = [self.scheduler.submit(f'http://host{index}/episode', f'/tmp/{index}') for index in range(4)]
+
+        self.assertEqual(self.scheduler.active_count(), 2)
+        self.assertTrue(wait_until(lambda: all(job.state == 'finished' for job in jobs)))
+        self.assertEqual(self.scheduler.metrics.finished, 4)
+
+    def test_pause_and_resume(self):
+        job = self.scheduler.submit('http://host/episode', '/tmp/episode')
+        self.scheduler.pause(job.job_id)
+
+        self.assertTrue(wait_until(lambda: job.state == 'paused'))
+
+        self.scheduler.resume(job.job_id)
+
+        self.assertTrue(wait_until(lambda: job.state == 'finished'))
+        self.assertEqual(job.download.runs, 2)
+
+    def test_resume_while_pausing_is_kept(self):
+        job = self.scheduler.submit('http://host/episode', '/tmp/episode')
+        self.scheduler.pause(job.job_id)
+        # The transfer is still winding down
+        self.assertEqual(job.state, 'running')
+        self.scheduler.resume(job.job_id)
+
+        self.assertTrue(wait_until(lambda: job.state == 'finished'))
+        self.assertEqual(job.download.runs, 2)
+
+    def test_pause_after_resume_wins(self):
+        job = self.scheduler.submit('http://host/episode', '/tmp/episode')
+        self.scheduler.pause(job.job_id)
+        self.scheduler.resume(job.job_id)
+        self.scheduler.pause(job.job_id)
+
+        self.assertTrue(wait_until(lambda: job.state == 'paused'))
+        time.sleep(0.1)
+        self.assertEqual(job.state, 'paused')
+
+    def test_resume_all_right_after_pause_all(self):
+        jobs = [self.scheduler.submit(f'http://host{index}/episode', f'/tmp/{index}') for index in range(3)]
+        self.scheduler.pause_all()
+        self.scheduler.resume_all()
+
+        self.assertTrue(wait_until(lambda: all(job.state == 'finished' for job in jobs)))
+
+    def test_cancel_deletes_the_part_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+
+        running = self.scheduler.submit('http://host/running', os.path.join(directory, 'running'))
+        paused = self.scheduler.submit('http://host/paused', os.path.join(directory, 'paused'))
+        self.scheduler.pause(paused.job_id)
+        self.assertTrue(wait_until(lambda: paused.state == 'paused'))
+
+        for job in (running, paused):
+            open(job.download.part_path, 'wb').close()
+            self.scheduler.cancel(job.job_id)
+
+        self.assertFalse(paused.download.part_path.exists())
+        # Deleted once the transfer has stopped
+        self.assertTrue(wait_until(lambda: not running.download.part_path.exists()))
+        self.assertEqual(running.state, 'cancelled')
+
+
+class PlaylistDownload(SimulatedDownload):
+    """ Simulated HLS transfer, which has a quality but no byte segments. """
+
+    def __init__(self, *args, quality=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.quality = quality or '720p'
+
+
+class RestoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+        self.journal_path = os.path.join(self.directory, 'downloads.journal')
+
+    def test_playlist_keeps_its_quality(self):
+        journal = DownloadJournal(self.journal_path)
+        scheduler = DownloadScheduler(download_factory=PlaylistDownload, journal=journal)
+        job = scheduler.submit('http://host/master.m3u8', os.path.join(self.directory, 'episode'), 'Series',
+                               quality='1080p')
+        scheduler.pause(job.job_id)
+        self.assertTrue(wait_until(lambda: job.state == 'paused'))
+        journal.close()
+
+        # As after a restart
+        scheduler = DownloadScheduler(download_factory=PlaylistDownload, journal=DownloadJournal(self.journal_path))
+        restored = scheduler.restore()
+
+        self.assertEqual([(job.url, job.series, job.quality) for job in restored],
+                         [('http://host/master.m3u8', 'Series', '1080p')])
+        self.assertEqual(restored[0].download.quality, '1080p')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Thumbnail service tests, offscreen.
+
+    QT_QPA_PLATFORM=offscreen python -m unittest tests.test_thumbnails
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from PySide6.QtCore import QSize, QTimer
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication
+
+from Delta_Team.Smoke.Anime_Earth.Search.thumbnails import ThumbnailService
+
+
+class ThumbnailServiceTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+        self.source = os.path.join(self.directory, 'cover.png')
+        image = QImage(400, 600, QImage.Format.Format_RGB32)
+        image.fill(QColor('teal'))
+        image.save(self.source)
+
+    def request(self, service: ThumbnailService, count: int = 1) -> list:
+        """ Requests the cover `count` times and waits for the callbacks. """
+
+        pixmaps = []
+
+        for _ in range(count):
+            service.request(self.source, QSize(100, 100), 1.0, pixmaps.append)
+
+        timeout = QTimer()
+        timeout.setSingleShot(True)
+        timeout.start(5000)
+
+        while len(pixmaps) < count and timeout.isActive():
+            self.app.processEvents()
+
+        return pixmaps
+
+    def test_decodes_and_caches_on_disk(self):
+        cache_dir = os.path.join(self.directory, 'cache')
+        pixmaps = self.request(ThumbnailService(cache_dir))
+
+        self.assertEqual(len(pixmaps), 1)
+        # Decoded straight to the size fitting 100x100
+        self.assertEqual(pixmaps[0].height(), 100)
+        self.assertLess(pixmaps[0].width(), 100)
+        self.assertTrue(any(name.endswith('.png') for _, _, names in os.walk(cache_dir) for name in names))
+
+    def test_unwritable_cache_still_delivers(self):
+        # A file where the cache directory should be makes every write fail
+        cache_dir = os.path.join(self.directory, 'cache')
+        open(cache_dir, 'w').close()
+
+        service = ThumbnailService(cache_dir)
+        pixmaps = self.request(service, 2)
+
+        self.assertEqual(len(pixmaps), 2)
+        self.assertFalse(pixmaps[0].isNull())
+
+        # The key is not stuck as pending, a later request is served from memory
+        self.assertIsNotNone(service.request(self.source, QSize(100, 100), 1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()